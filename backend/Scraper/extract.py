@@ -0,0 +1,201 @@
+# Scraper/extract.py
+"""
+Offline field extraction for job detail pages.
+
+extract_job() parses one HTML snapshot (driver.page_source, an HTTP
+response body or an archived file) with lxml and applies the same selector
+fallback chains the scraper used to run as live WebDriver calls. It has no
+browser dependency, so it can be benchmarked and re-run over saved pages:
+
+    python Scraper/extract.py saved/page1.html saved/page2.html
+"""
+import json
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+from lxml import etree, html as lxml_html
+
+
+def css_class(name):
+    """XPath predicate matching an element carrying the CSS class `name`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Selector chains, tried in order; the first non-empty text wins.
+TITLE_SELECTORS = [
+    "//h1",  # common
+    "//h1[contains(@class,'job') or contains(@class,'title')]",
+    f"//h1[{css_class('job-title')}]",
+]
+COMPANY_SELECTORS = [
+    # Many pages link the company to `/actuarial-employers/` — try that
+    "//a[contains(@href,'/actuarial-employers/')]",
+    "//p[contains(@class,'company')]",
+    "//div[contains(@class,'company')]",
+    "//span[contains(@class,'company')]",
+    "//p[contains(@class,'text-gray-600')]",
+]
+LOCATION_SELECTORS = [
+    "//span[contains(@class,'location')]",
+    "//p[contains(@class,'location')]",
+    "//li[contains(@class,'location')]",
+    "//div[contains(@class,'location')]",
+    "//p[contains(text(),'Location')]/following-sibling::*",
+]
+# small text that sometimes shows city/country
+LOCATION_FALLBACK = f"//small | //*[{css_class('muted')}] | //*[{css_class('text-gray-600')}]"
+DATE_CANDIDATES = (
+    "//*[contains(translate(text(),'POSTED','posted'),'posted') or "
+    "contains(translate(text(),'Posted','posted'),'posted') or "
+    "contains(@class,'date') or name()='time']"
+)
+# Job detail links on a listing page (same as the scraper's JOB_LINK_SELECTOR)
+JOB_LINK_XPATH = "//a[contains(@href,'/actuarial-jobs/')]/@href"
+# Elements whose text is code or fallback markup, not page content
+NON_CONTENT_TAGS = ("script", "style", "noscript")
+# "intern"/"interns"/"internship" as a word, not inside "internal" or "international"
+INTERN_WORD = re.compile(r"\bintern(?:s|ships?)?\b")
+TAG_SELECTORS = (
+    "//a[contains(@href,'/tags') or contains(@class,'tag') or contains(@class,'pill') or contains(@class,'badge')]/span"
+    " | //span[contains(@class,'tag') or contains(@class,'badge') or contains(@class,'pill')]"
+)
+
+
+def parse_relative_date(text):
+    """
+    Parse simple 'posted X days ago' or 'X hours ago' strings into a date.
+    If parsing fails, return today's date.
+    """
+    text = (text or "").strip().lower()
+    if not text:
+        return datetime.utcnow().date()
+    # common patterns: "3 days ago", "posted 2 days ago", "2 hours ago"
+    m = re.search(r"(\d+)\s+(day|days|hour|hours|week|weeks|month|months)\b", text)
+    if m:
+        qty = int(m.group(1))
+        unit = m.group(2)
+        if 'hour' in unit:
+            return (datetime.utcnow() - timedelta(hours=qty)).date()
+        if 'day' in unit:
+            return (datetime.utcnow() - timedelta(days=qty)).date()
+        if 'week' in unit:
+            return (datetime.utcnow() - timedelta(weeks=qty)).date()
+        if 'month' in unit:
+            return (datetime.utcnow() - timedelta(days=30*qty)).date()
+    # try to parse ISO-like date
+    try:
+        return datetime.fromisoformat(text.strip()).date()
+    except Exception:
+        return datetime.utcnow().date()
+
+
+def node_text(el):
+    """Whitespace-normalized text of an element, close to WebElement.text."""
+    return " ".join(el.text_content().split())
+
+
+def first_text(tree, selectors):
+    for sel in selectors:
+        for el in tree.xpath(sel):
+            txt = node_text(el)
+            if txt:
+                return txt
+    return ""
+
+
+def infer_job_type(tags, body_text):
+    """Infer job_type from tags, falling back to mentions in the page text."""
+    job_type = ""
+    for t in tags:
+        if "intern" in t.lower():
+            return "Internship"
+        if "part" in t.lower():
+            return "Part-time"
+        if "contract" in t.lower():
+            job_type = "Contract"
+    if job_type:
+        return job_type
+    if "part-time" in body_text:
+        return "Part-time"
+    if "contract" in body_text:
+        return "Contract"
+    if INTERN_WORD.search(body_text):
+        return "Internship"
+    return "Full-time"
+
+
+def extract_job(html, url):
+    """Parse one job detail page into the scraper's job dict. Pure: no I/O."""
+    tree = lxml_html.fromstring(html or "<html></html>")
+
+    # --- Title (fallback: <title> tag content) ---
+    title = first_text(tree, TITLE_SELECTORS) or first_text(tree, ["//title"])
+
+    # --- Company ---
+    company = first_text(tree, COMPANY_SELECTORS)
+
+    # --- Location ---
+    location = first_text(tree, LOCATION_SELECTORS)
+    if not location:
+        for el in tree.xpath(LOCATION_FALLBACK):
+            txt = node_text(el)
+            if "," in txt or txt.lower().strip() in ["remote"]:
+                location = txt
+                break
+
+    # --- Posting date: 'Posted X days ago', 'Posted on YYYY-MM-DD' or a time element ---
+    posting_date = None
+    for el in tree.xpath(DATE_CANDIDATES):
+        txt = node_text(el)
+        if not txt:
+            continue
+        ltxt = txt.lower()
+        if "posted" in ltxt or re.search(r'\d{4}-\d{2}-\d{2}', txt) or any(k in ltxt for k in ["ago", "hours", "days", "weeks", "months"]):
+            posting_date = parse_relative_date(txt)
+            break
+    if posting_date is None:
+        posting_date = datetime.utcnow().date()
+
+    # --- Tags (keywords), deduped in page order ---
+    tags = list(dict.fromkeys(t for t in (node_text(el) for el in tree.xpath(TAG_SELECTORS)) if t))
+
+    # --- job_type from tags or page content ---
+    body = tree.find("body")
+    body = body if body is not None else tree
+    etree.strip_elements(body, *NON_CONTENT_TAGS, with_tail=False)  # scripts mention "contract", "intern"...
+    body_text = body.text_content().lower()
+    job_type = infer_job_type(tags, body_text)
+
+    return {
+        "title": title,
+        "company": company,
+        "location": location,
+        "posting_date": posting_date,
+        "job_type": job_type,
+        "tags": tags,
+        "link": url,
+    }
+
+
+def extract_links(html, base_url, limit=None):
+    """Unique job detail links on a listing page, in page order, made absolute against `base_url`."""
+    tree = lxml_html.fromstring(html or "<html></html>", base_url=base_url)
+    tree.make_links_absolute(base_url)
+    links = list(dict.fromkeys(href for href in tree.xpath(JOB_LINK_XPATH) if href))
+    return links[:limit] if limit is not None else links
+
+
+# ---------- Run: extract saved pages ----------
+if __name__ == "__main__":
+    total = 0.0
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as f:
+            page = f.read()
+        started = time.perf_counter()
+        job = extract_job(page, path)
+        total += time.perf_counter() - started
+        print(json.dumps(job, default=str))
+    if sys.argv[1:]:
+        print(f"Extracted {len(sys.argv) - 1} pages in {total * 1000:.1f} ms", file=sys.stderr)
@@ -2,358 +2,477 @@
 import time
 import sys
 import os
-import re
-from datetime import datetime, timedelta
-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+import json
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
 from sqlalchemy.exc import IntegrityError
 
 # make backend importable (one level up from Scraper -> backend/)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from db import db            # your SQLAlchemy db
+from cache import response_cache  # the API sees these writes via Redis or the change sequence
 from app import create_app   # app factory
 from model.job import Job    # Job model
+from model.archive import JobArchive  # expired postings moved out by archive.py
+from bulk import upsert_jobs  # set-based dedupe/upsert
+from read_model import invalidate_read_model  # in-process list snapshot, caught up on next read
+from Scraper.extract import extract_job, extract_links  # offline HTML field extraction
 
-# ---------- Helpers ----------
-def parse_relative_date(text):
-    """
-    Parse simple 'posted X days ago' or 'X hours ago' strings into a date.
-    If parsing fails, return today's date.
-    """
-    text = (text or "").strip().lower()
-    if not text:
-        return datetime.utcnow().date()
-    # common patterns: "3 days ago", "posted 2 days ago", "2 hours ago"
-    m = re.search(r"(\d+)\s+(day|days|hour|hours|week|weeks|month|months)\b", text)
-    if m:
-        qty = int(m.group(1))
-        unit = m.group(2)
-        if 'hour' in unit:
-            return (datetime.utcnow() - timedelta(hours=qty)).date()
-        if 'day' in unit:
-            return (datetime.utcnow() - timedelta(days=qty)).date()
-        if 'week' in unit:
-            return (datetime.utcnow() - timedelta(weeks=qty)).date()
-        if 'month' in unit:
-            return (datetime.utcnow() - timedelta(days=30*qty)).date()
-    # try to parse ISO-like date
-    try:
-        return datetime.fromisoformat(text.strip()).date()
-    except Exception:
-        return datetime.utcnow().date()
+# ---------- Scraper ----------
+START_URL = "https://www.actuarylist.com/"
+CHECKPOINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".scrape_checkpoint.json")
+JOB_LINK_SELECTOR = "a[href*='/actuarial-jobs/']"
+# "browser" renders pages in Chrome; "static" fetches the raw HTML (http(s):// or file://),
+# for sources that render without JavaScript and for local stand-in pages
+FETCHERS = ("browser", "static")
+USER_AGENT = "Mozilla/5.0 (compatible; jobs-scraper)"
 
-def safe_text(el):
-    try:
-        return el.text.strip()
-    except Exception:
-        return ""
 
-# ---------- Scraper ----------
-def scrape_jobs(limit=100, headless=True, delay=2.0):
-    """
-    Scrape job detail pages from https://www.actuarylist.com/
-    limit: maximum number of job detail pages to fetch
-    headless: whether to run Chrome headlessly
-    delay: seconds to wait after scroll / page load (tweak as necessary)
-    """
+def build_driver(headless=True):
+    # selenium/webdriver_manager are optional: only the "browser" fetcher needs them
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
+    except ImportError as e:
+        raise RuntimeError(
+            f"The browser fetcher requires 'selenium' and 'webdriver-manager' ({e}); "
+            "install them or use the static fetcher."
+        ) from e
     options = Options()
     if headless:
         options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+
+class HostRateLimiter:
+    """
+    Politeness limits shared by all workers: at most `max_concurrent` requests
+    in flight per host, and request starts spaced at least `min_interval`
+    seconds apart per host.
+    """
+
+    def __init__(self, max_concurrent=2, min_interval=0.5):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._hosts = {}  # host -> [semaphore, earliest next start]
+
+    @contextmanager
+    def slot(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            state = self._hosts.setdefault(host, [threading.Semaphore(self.max_concurrent), 0.0])
+        with state[0]:
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, state[1])
+                state[1] = start_at + self.min_interval
+            time.sleep(start_at - now)
+            yield
+
+
+class DriverPool:
+    """One Chrome driver per worker thread, created lazily and replaced if it dies."""
+
+    def __init__(self, headless=True):
+        self.headless = headless
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._drivers = []
+
+    def get(self):
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            driver = build_driver(self.headless)
+            self._local.driver = driver
+            with self._lock:
+                self._drivers.append(driver)
+        return driver
+
+    def discard(self):
+        """Drops the current thread's driver (e.g. after a browser crash)."""
+        driver = getattr(self._local, "driver", None)
+        self._local.driver = None
+        if driver is not None:
+            with self._lock:
+                self._drivers.remove(driver)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def close(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+class ScrapeCheckpoint:
+    """
+    Persists a run's discovered links and the ones already handled, so an
+    interrupted run resumes with the remaining links instead of starting over.
+    The file is written atomically and removed once the run completes.
+    """
+
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        self.links = []
+        self.done = set()
+        self._lock = threading.Lock()
+
+    def pending_links(self):
+        """Links still to process from an unfinished run, or None if there is none."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.links = state.get("links", [])
+        self.done = set(state.get("done", []))
+        return [link for link in self.links if link not in self.done]
+
+    def start(self, links):
+        self.links = list(links)
+        self.done = set()
+        self._write()
+
+    def mark_done(self, links):
+        with self._lock:
+            self.done.update(links)
+            self._write()
+
+    def finish(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _write(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"links": self.links, "done": sorted(self.done)}, f)
+        os.replace(tmp_path, self.path)
+
+
+def checkpoint_path_for(source):
+    """Checkpoint file of the runs started through POST /scrape/ for `source`."""
+    return os.path.join(os.path.dirname(CHECKPOINT_PATH), f".scrape_checkpoint.{source}.json")
+
+
+def known_source_urls(links, chunk_size=500):
+    """
+    Returns the subset of `links` already stored as a job's source_url,
+    archived jobs included so expired postings are not scraped back (needs
+    an app context).
+    """
+    known = set()
+    for start in range(0, len(links), chunk_size):
+        chunk = links[start:start + chunk_size]
+        known.update(url for (url,) in db.session.query(Job.source_url).filter(Job.source_url.in_(chunk)))
+        known.update(url for (url,) in db.session.query(JobArchive.source_url)
+                     .filter(JobArchive.source_url.in_(chunk)))
+    return known
+
+
+def discover_links(driver, limit, delay, start_url=START_URL):
+    """Opens the listing page, scrolls until no new jobs load, and returns unique detail links."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
     wait = WebDriverWait(driver, 20)
+    driver.get(start_url)
+    print(f"Opened {start_url}")
 
+    # Wait for the main jobs-list container to appear
     try:
-        driver.get("https://www.actuarylist.com/")
-        print("Opened https://www.actuarylist.com/")
+        wait.until(EC.presence_of_element_located((By.ID, "jobs-list")))
+        print("jobs-list container visible")
+    except TimeoutException:
+        print("Could not find #jobs-list container — the page may have changed. Continuing anyway.")
 
-        # Wait for the main jobs-list container to appear
-        try:
-            wait.until(EC.presence_of_element_located((By.ID, "jobs-list")))
-            print("jobs-list container visible")
-        except TimeoutException:
-            print("Could not find #jobs-list container — the page may have changed. Continuing anyway.")
-
-        # Scroll a few times to ensure JS loads many items
-        prev_count = 0
-        scrolls = 0
-        MAX_SCROLLS = 10
-        while scrolls < MAX_SCROLLS:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(delay)
-            # count anchors that look like job detail pages (pattern '/actuarial-jobs/')
-            anchors = driver.find_elements(By.CSS_SELECTOR, "a[href*='/actuarial-jobs/']")
-            cur_count = len(anchors)
-            print(f"Scroll #{scrolls+1} — found {cur_count} anchors with '/actuarial-jobs/'")
-            if cur_count == prev_count:
-                # no change -> stop scrolling
-                break
-            prev_count = cur_count
-            scrolls += 1
-
-        # collect unique job detail links in order
-        anchors = driver.find_elements(By.CSS_SELECTOR, "a[href*='/actuarial-jobs/']")
-        links = []
-        seen = set()
-        for a in anchors:
-            href = a.get_attribute("href")
-            if not href:
-                continue
-            # normalize: remove URL fragment/query; only unique by path
-            if href in seen:
-                continue
-            seen.add(href)
-            links.append(href)
-            if len(links) >= limit:
-                break
+    # Scroll a few times to ensure JS loads many items
+    prev_count = 0
+    scrolls = 0
+    MAX_SCROLLS = 10
+    while scrolls < MAX_SCROLLS:
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(delay)
+        # count anchors that look like job detail pages (pattern '/actuarial-jobs/')
+        anchors = driver.find_elements(By.CSS_SELECTOR, JOB_LINK_SELECTOR)
+        cur_count = len(anchors)
+        print(f"Scroll #{scrolls+1} — found {cur_count} anchors with '/actuarial-jobs/'")
+        if cur_count == prev_count:
+            # no change -> stop scrolling
+            break
+        prev_count = cur_count
+        scrolls += 1
+
+    # collect unique job detail links in order
+    anchors = driver.find_elements(By.CSS_SELECTOR, JOB_LINK_SELECTOR)
+    links = []
+    seen = set()
+    for a in anchors:
+        href = a.get_attribute("href")
+        if not href:
+            continue
+        # normalize: remove URL fragment/query; only unique by path
+        if href in seen:
+            continue
+        seen.add(href)
+        links.append(href)
+        if len(links) >= limit:
+            break
+
+    print(f"Collected {len(links)} job detail links (unique, limited to {limit})")
+    return links
+
+
+def fetch_html(url, timeout=20):
+    """Fetches a page without a browser (the "static" fetcher)."""
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or "utf-8"
+        return response.read().decode(charset, errors="replace")
+
+
+def discover_links_static(limit, start_url=START_URL):
+    """discover_links() for the static fetcher: job links present in the listing page's HTML."""
+    links = extract_links(fetch_html(start_url), start_url, limit)
+    print(f"Collected {len(links)} job detail links from {start_url} (limited to {limit})")
+    return links
+
+
+def scrape_job_page(driver, link, delay):
+    """Opens one job detail page in `driver` and extracts its fields."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+
+    driver.get(link)
+    # wait for page main content (many job detail pages have a heading or content area)
+    # We'll wait for either an h1 or any element with role 'main'
+    try:
+        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, "//h1 | //main")))
+    except TimeoutException:
+        # keep going, try to parse anyway
+        pass
+
+    time.sleep(delay)  # give extra time for content to render
 
-        print(f"Collected {len(links)} job detail links (unique, limited to {limit})")
+    # One snapshot of the rendered DOM, parsed offline (no per-field WebDriver calls)
+    return extract_job(driver.page_source, link)
 
-        # For each link, open and extract fields
-        jobs = []
-        for idx, link in enumerate(links, start=1):
-            print(f"[{idx}/{len(links)}] Opening: {link}")
+
+def iter_scraped_jobs(links, pool, limiter, delay=2.0, workers=4, fetcher="browser", run=None):
+    """
+    Scrapes `links` on `workers` threads and yields each job as soon as it is
+    done (completion order, not link order). A failing page is logged and
+    skipped without affecting the other workers. Once `run` is cancelled, pages
+    not yet started are dropped.
+    """
+    def work(link):
+        with limiter.slot(link):
+            if fetcher == "static":
+                return extract_job(fetch_html(link), link)
+            driver = pool.get()  # build_driver() reports a missing selenium install
+            from selenium.common.exceptions import WebDriverException
             try:
-                driver.get(link)
-                # wait for page main content (many job detail pages have a heading or content area)
-                # We'll wait for either an h1 or any element with role 'main'
-                try:
-                    wait.until(EC.presence_of_element_located((By.XPATH, "//h1 | //main")))
-                except TimeoutException:
-                    # keep going, try to parse anyway
-                    pass
-
-                time.sleep(delay)  # give extra time for content to render
-
-                # --- Extract title ---
-                title = ""
-                for sel in [
-                    "//h1",  # common
-                    "//h1[contains(@class,'job') or contains(@class,'title')]",
-                    "css:h1.job-title",
-                ]:
-                    try:
-                        if sel.startswith("css:"):
-                            el = driver.find_element(By.CSS_SELECTOR, sel.split("css:")[1])
-                        else:
-                            el = driver.find_element(By.XPATH, sel)
-                        title = safe_text(el)
-                        if title:
-                            break
-                    except Exception:
-                        title = ""
-                # fallback: try to get <title> tag content
-                if not title:
-                    try:
-                        title = driver.title
-                    except Exception:
-                        title = ""
-
-                # --- Extract company ---
-                company = ""
-                # Many pages link the company to `/actuarial-employers/` — try that
-                try:
-                    company_el = driver.find_element(By.CSS_SELECTOR, "a[href*='/actuarial-employers/']")
-                    company = safe_text(company_el)
-                except Exception:
-                    # fallback: element with text style common to company
-                    for sel in [
-                        "//p[contains(@class,'company')]",
-                        "//div[contains(@class,'company')]",
-                        "//span[contains(@class,'company')]",
-                        "//p[contains(@class,'text-gray-600')]",
-                    ]:
-                        try:
-                            company = safe_text(driver.find_element(By.XPATH, sel))
-                            if company:
-                                break
-                        except Exception:
-                            company = ""
-
-                # --- Extract location ---
-                location = ""
-                # Try some plausible selectors
-                for sel in [
-                    "//span[contains(@class,'location')]",
-                    "//p[contains(@class,'location')]",
-                    "//li[contains(@class,'location')]",
-                    "//div[contains(@class,'location')]",
-                    "//p[contains(text(),'Location')]/following-sibling::*",
-                ]:
-                    try:
-                        el = driver.find_element(By.XPATH, sel)
-                        location = safe_text(el)
-                        if location:
-                            break
-                    except Exception:
-                        location = ""
-                # If still empty try to glean from breadcrumbs or meta
-                if not location:
-                    try:
-                        # sometimes there's a 'meta' or small text showing city/country
-                        smalls = driver.find_elements(By.CSS_SELECTOR, "small, .muted, .text-gray-600")
-                        for s in smalls:
-                            txt = safe_text(s)
-                            if "," in txt or txt.lower().strip() in ["remote"]:
-                                location = txt
-                                break
-                    except Exception:
-                        pass
-
-                # --- Extract posting date ---
-                posting_date = None
-                # look for "Posted" text or date-like text
-                try:
-                    # common patterns: 'Posted X days ago' or 'Posted on YYYY-MM-DD' or a time element
-                    possible = driver.find_elements(By.XPATH,
-                        "//*[contains(translate(text(),'POSTED','posted'),'posted') or contains(translate(text(),'Posted','posted'),'posted') or contains(@class,'date') or name()='time']")
-                    date_text = ""
-                    for p in possible:
-                        txt = safe_text(p)
-                        if not txt:
-                            continue
-                        ltxt = txt.lower()
-                        if "posted" in ltxt or re.search(r'\d{4}-\d{2}-\d{2}', txt) or any(k in ltxt for k in ["ago", "hours", "days", "weeks", "months"]):
-                            date_text = txt
-                            break
-                    if date_text:
-                        posting_date = parse_relative_date(date_text)
-                except Exception:
-                    posting_date = None
-                if posting_date is None:
-                    posting_date = datetime.utcnow().date()
-
-                # --- Extract tags (keywords) ---
-                tags = []
-                try:
-                    # Try to find tag containers (pill-like spans)
-                    tag_els = driver.find_elements(By.XPATH, "//a[contains(@href,'/tags') or contains(@class,'tag') or contains(@class,'pill') or contains(@class,'badge')]/span | //span[contains(@class,'tag') or contains(@class,'badge') or contains(@class,'pill')]")
-                    for t in tag_els:
-                        txt = safe_text(t)
-                        if txt:
-                            tags.append(txt)
-                except Exception:
-                    tags = []
-
-                # dedupe tags
-                tags = list(dict.fromkeys([t for t in tags if t]))
-
-                # --- Infer job_type from tags or page content ---
-                job_type = ""
-                for t in tags:
-                    if "intern" in t.lower():
-                        job_type = "Internship"
-                        break
-                    if "part" in t.lower():
-                        job_type = "Part-time"
-                        break
-                    if "contract" in t.lower():
-                        job_type = "Contract"
-                if not job_type:
-                    # try to find explicit mention
-                    body_text = ""
-                    try:
-                        body_text = driver.find_element(By.TAG_NAME, "body").text.lower()
-                    except Exception:
-                        body_text = ""
-                    if "part-time" in body_text:
-                        job_type = "Part-time"
-                    elif "contract" in body_text:
-                        job_type = "Contract"
-                    elif "intern" in body_text:
-                        job_type = "Internship"
-                    else:
-                        job_type = "Full-time"
-
-                job = {
-                    "title": title,
-                    "company": company,
-                    "location": location,
-                    "posting_date": posting_date,
-                    "job_type": job_type,
-                    "tags": tags,
-                    "link": link,
-                }
-
-                print("----")
-                print(f"Scraped job #{idx}:")
-                print(job)
-                jobs.append(job)
+                return scrape_job_page(driver, link, delay)
+            except WebDriverException:
+                # the browser itself may be gone; give this worker a fresh one
+                pool.discard()
+                raise
 
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as executor:
+        futures = {executor.submit(work, link): link for link in links}
+        for done, future in enumerate(as_completed(futures), start=1):
+            link = futures[future]
+            try:
+                job = future.result()
             except Exception as e:
-                print(f"Error scraping {link}: {e}")
-                continue
+                print(f"[{done}/{len(links)}] Error scraping {link}: {e}")
+                if run:
+                    run.error(f"{link}: {e}")
+            else:
+                print(f"[{done}/{len(links)}] Scraped: {job['title']} at {job['company']}")
+                if run:
+                    run.add(pages_fetched=1)
+                yield job
+            if run and run.cancelled:
+                for pending in futures:
+                    pending.cancel()
+                print(f"Cancelled after {done}/{len(links)} pages")
+                break
 
-            # optional: small sleep to be polite to the site
-            time.sleep(0.5)
 
-        driver.quit()
-        print(f"Done. Collected {len(jobs)} job details.")
-        return jobs
+def scrape_jobs_iter(limit=100, headless=True, delay=2.0, workers=4, per_host=2,
+                     min_interval=0.5, start_url=START_URL, checkpoint=None, skip_known=False,
+                     fetcher="browser", run=None):
+    """
+    Generator form of scrape_jobs(): discovers links, then yields jobs as the
+    worker pool finishes them so they can be saved while scraping continues.
+    workers: number of concurrent browser workers
+    per_host / min_interval: politeness limits per host (see HostRateLimiter)
+    start_url: listing page to crawl (point it at a local copy for testing)
+    checkpoint: ScrapeCheckpoint to resume an interrupted run from / record into
+    skip_known: skip links already stored as a job's source_url (needs an app context)
+    fetcher: "browser" (Chrome via Selenium) or "static" (plain HTTP/file fetch, see FETCHERS)
+    run: ScrapeRun (scrape_runs.py) to report progress to and to check for cancellation
+    """
+    pool = DriverPool(headless=headless)  # drivers start lazily, so "static" never opens Chrome
+    limiter = HostRateLimiter(max_concurrent=per_host, min_interval=min_interval)
+    try:
+        links = checkpoint.pending_links() if checkpoint else None
+        if links is None:
+            if fetcher == "static":
+                links = discover_links_static(limit, start_url=start_url)
+            else:
+                links = discover_links(pool.get(), limit, delay, start_url=start_url)
+                pool.discard()  # workers start their own drivers
+            if checkpoint:
+                checkpoint.start(links)
+        else:
+            print(f"Resuming interrupted run: {len(links)} links left")
+
+        if skip_known and links:
+            known = known_source_urls(links)
+            links = [link for link in links if link not in known]
+            print(f"{len(known)} links already in the database, {len(links)} new")
+            if checkpoint and known:
+                checkpoint.mark_done(known)
+        if run:
+            run.add(links_discovered=len(links))
+            if run.cancelled:
+                return
 
+        yield from iter_scraped_jobs(links, pool, limiter, delay=delay, workers=workers, fetcher=fetcher, run=run)
     finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        pool.close()
+
+
+def scrape_jobs(limit=100, headless=True, delay=2.0, workers=1, per_host=2,
+                min_interval=0.5, start_url=START_URL):
+    """
+    Scrape job detail pages from https://www.actuarylist.com/
+    limit: maximum number of job detail pages to fetch
+    headless: whether to run Chrome headlessly
+    delay: seconds to wait after scroll / page load (tweak as necessary)
+    workers: concurrent browser workers (1 = one page at a time)
+    """
+    jobs = list(scrape_jobs_iter(limit=limit, headless=headless, delay=delay, workers=workers,
+                                 per_host=per_host, min_interval=min_interval, start_url=start_url))
+    print(f"Done. Collected {len(jobs)} job details.")
+    return jobs
+
 
 # ---------- Save to DB ----------
-def save_jobs_to_db(jobs):
+def scraped_job_row(j):
+    """Maps a scraped job dict to (column values, tag names) for upsert_jobs()."""
+    row = {
+        "title": j["title"] or "Untitled",
+        "company": j["company"] or "Unknown",
+        "location": j["location"] or "Unknown",
+        "posting_date": j["posting_date"],
+        "job_type": j["job_type"] or None,
+        "source_url": j.get("link") or None,
+    }
+    return row, j["tags"]
+
+
+def save_jobs_to_db(jobs, batch_size=500, app=None, on_saved=None, run=None):
+    """
+    Upserts scraped jobs in chunks of `batch_size`, one commit per chunk.
+    Postings are matched on their dedupe key (normalized title/company/location),
+    so each chunk costs a few set-based statements instead of a SELECT per job.
+    `jobs` may be a generator (e.g. scrape_jobs_iter) so rows are stored while
+    scraping continues. on_saved(links) is called after each successful commit
+    with the source links handled by it; `run` (a ScrapeRun) gets the same
+    counts per commit. Returns inserted/updated/skipped/near_duplicates counts.
+    """
     print("Saving jobs to DB...")
-    app = create_app()
+    app = app or create_app()
+    counts = {"inserted": 0, "updated": 0, "skipped": 0, "near_duplicates": 0}
     with app.app_context():
-        inserted = 0
-        skipped = 0
+        tag_cache = {}  # slug -> Tag, shared so each tag is looked up once per run
+
+        def save_batch(batch):
+            if not batch:
+                return
+            try:
+                result = upsert_jobs(db.session.connection(), [scraped_job_row(j) for j in batch], tag_cache)
+                db.session.commit()
+            except IntegrityError as e:
+                db.session.rollback()
+                print("DB integrity error:", e)
+                if run:
+                    run.error(f"DB integrity error: {e}")
+                return
+            except Exception as e:
+                db.session.rollback()
+                print("Unexpected DB error:", e)
+                if run:
+                    run.error(f"Unexpected DB error: {e}")
+                return
+            if result["inserted"] or result["updated"]:
+                response_cache.invalidate(result["updated"])
+                invalidate_read_model()
+            for key in counts:
+                counts[key] += len(result[key])
+            if run:
+                run.add(**{key: len(result[key]) for key in counts})
+            print(f"Committed batch: {len(result['inserted'])} new, {len(result['updated'])} updated, "
+                  f"{len(result['skipped'])} unchanged, {len(result['near_duplicates'])} near-duplicates.")
+            if on_saved:
+                on_saved([j["link"] for j in batch if j.get("link")])
+
+        batch = []
         for j in jobs:
-            # simple duplicate check: title + company + location
-            existing = Job.query.filter_by(title=j["title"], company=j["company"], location=j["location"]).first()
-            if existing:
-                print(f"Skipping duplicate: {j['title']} at {j['company']}")
-                skipped += 1
-                continue
-            new_job = Job(
-                title=j["title"] or "Untitled",
-                company=j["company"] or "Unknown",
-                location=j["location"] or "Unknown",
-                posting_date=j["posting_date"],
-                job_type=j["job_type"] or None,
-            )
-            # you said earlier your Job model uses comma-separated tags; adapt:
-            if hasattr(new_job, "set_tags_from_list"):
-                try:
-                    new_job.set_tags_from_list(j["tags"])
-                except Exception:
-                    new_job.tags = ", ".join(j["tags"])
-            else:
-                new_job.tags = ", ".join(j["tags"])
-            db.session.add(new_job)
-            inserted += 1
-        try:
-            db.session.commit()
-            print(f"Inserted {inserted}, skipped {skipped}.")
-        except IntegrityError as e:
-            db.session.rollback()
-            print("DB integrity error:", e)
-        except Exception as e:
-            db.session.rollback()
-            print("Unexpected DB error:", e)
+            batch.append(j)
+            if len(batch) >= batch_size:
+                save_batch(batch)
+                batch = []
+        save_batch(batch)
+        print(f"Inserted {counts['inserted']}, updated {counts['updated']}, skipped {counts['skipped']}, "
+              f"near-duplicates {counts['near_duplicates']}.")
+    return counts
+
+
+def run_incremental_scrape(limit=100, checkpoint_path=CHECKPOINT_PATH, app=None, run=None, **scrape_kwargs):
+    """
+    Scrapes only postings not yet in the database, resuming an interrupted
+    run from its checkpoint. Cost is proportional to the number of new links.
+    A cancelled `run` keeps its checkpoint, so the next run picks up the rest.
+    """
+    app = app or create_app()
+    checkpoint = ScrapeCheckpoint(checkpoint_path)
+    jobs = scrape_jobs_iter(limit=limit, checkpoint=checkpoint, skip_known=True, run=run, **scrape_kwargs)
+    # small batches: scraped pages arrive slowly, and each commit advances the checkpoint
+    counts = save_jobs_to_db(jobs, batch_size=25, app=app, on_saved=checkpoint.mark_done, run=run)
+    if not (run and run.cancelled):
+        checkpoint.finish()
+    return counts
 
 # ---------- Run ----------
 if __name__ == "__main__":
     LIMIT = 100   # change as needed (50, 100). keep modest for demo.
-    scraped = scrape_jobs(limit=LIMIT, headless=False, delay=1.5)  # headless=False helps debugging
-    print(f"\nTotal scraped: {len(scraped)}")
-    if scraped:
-        save_jobs_to_db(scraped)
+    WORKERS = 4   # concurrent browser workers; 1 = one page at a time
+    # headless=False helps debugging; jobs are saved as the workers finish them
+    run_incremental_scrape(limit=LIMIT, headless=False, delay=1.5, workers=WORKERS)
     print("Finished.")
@@ -6,8 +6,20 @@ from routes.job_routes import job_bp  # make sure this exists
 from flask import Flask
 from flask_cors import CORS
 from config import Config
+from archive import archive_scheduler
+from cache import response_cache
+from coalesce import single_flight
+from commands import jobs_cli
 from db import init_db
+from facets import init_facets
+from metrics import init_metrics
+from near_duplicates import init_near_duplicates
+from read_model import init_read_model
+from search import init_search
+from sync import init_sync
 from routes.job_routes import job_bp
+from routes.scrape_routes import scrape_bp
+from scrape_runs import scrape_runner
 
 def create_app():
     app = Flask(__name__)
@@ -15,12 +27,27 @@ def create_app():
 
     # Initialize DB
     init_db(app)
+    init_search(app)
+    init_facets(app)
+    init_sync(app)
+    init_near_duplicates(app)
+    response_cache.init_app(app)
+    single_flight.init_app(app)
+    init_read_model(app)
+    init_metrics(app)
+    scrape_runner.init_app(app)
+    archive_scheduler.init_app(app)
 
     # Enable CORS for all routes
     CORS(app)  # <- This will allow requests from any origin
 
     # Register blueprints
     app.register_blueprint(job_bp)
+    app.register_blueprint(scrape_bp)
+
+    # CLI: flask jobs import / archive / explain-check / reindex-search / rebuild-facets /
+    #      prune-tombstones / reindex-near-duplicates
+    app.cli.add_command(jobs_cli)
 
     return app
 
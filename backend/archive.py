@@ -0,0 +1,152 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import delete, func, insert, select
+from bulk import delete_jobs
+from cache import response_cache
+from db import db
+from facets import subtract_jobs
+from model.archive import JobArchive
+from model.job import Job
+from model.tag import tag_names_column
+from near_duplicates import unindex_jobs
+from read_model import invalidate_read_model
+from search import sync_jobs
+from sync import tombstone_jobs
+
+# Retention for the jobs table.
+#
+# Postings whose posting_date is more than JOBS_RETENTION_DAYS old are moved
+# to jobs_archive, so filters and sorts on the hot table only cover current
+# listings. Each batch of JOBS_ARCHIVE_BATCH_SIZE rows (picked oldest first
+# through the posting_date index) is copied, then deleted like a bulk delete
+# (facet counts, search index, near-duplicate buckets, tombstones for delta
+# sync) and committed on its own, with a pause of JOBS_ARCHIVE_PAUSE_SECONDS
+# between batches, so no transaction holds row locks for long and other
+# writers get a turn.
+#
+# Run it with `flask jobs archive`, or set JOBS_ARCHIVE_INTERVAL_SECONDS to
+# archive in a background thread. The thread runs in every process that
+# creates the app: turn it on for one of them (or use the command from cron).
+# Archived rows are read back with ?include_archived=true.
+
+jobs = Job.__table__
+archive = JobArchive.__table__
+
+# jobs columns copied as they are; tags are added as a name snapshot
+ARCHIVED_COLUMNS = ('id', 'title', 'company', 'location', 'posting_date', 'job_type', 'source_url',
+                    'dedupe_key', 'city', 'region', 'country', 'is_remote', 'updated_at', 'duplicate_of')
+
+
+def retention_cutoff(days, today=None):
+    """Postings dated before this day are expired."""
+    return (today or date.today()) - timedelta(days=days)
+
+
+def count_expired(connection, cutoff):
+    return connection.execute(select(func.count()).select_from(jobs).where(jobs.c.posting_date < cutoff)).scalar()
+
+
+def expired_job_ids(connection, cutoff, limit):
+    """Ids of up to `limit` expired jobs, oldest first (an ix_jobs_posting_date_id range scan)."""
+    return list(connection.execute(
+        select(jobs.c.id).where(jobs.c.posting_date < cutoff).order_by(jobs.c.posting_date, jobs.c.id).limit(limit)
+    ).scalars())
+
+
+def archive_jobs(connection, job_ids):
+    """Copies the given jobs into jobs_archive and deletes them from jobs. Returns the ids moved."""
+    rows = connection.execute(
+        select(*[jobs.c[name] for name in ARCHIVED_COLUMNS], tag_names_column(jobs.c.id))
+        .where(jobs.c.id.in_(job_ids))
+    ).all()
+    ids = [row.id for row in rows]
+    if not ids:
+        return []
+    now = datetime.utcnow()
+    # SQLite may hand a deleted job's id out again; the newest archived copy wins
+    connection.execute(delete(archive).where(archive.c.id.in_(ids)))
+    connection.execute(insert(archive), [dict(row._mapping, archived_at=now) for row in rows])
+
+    subtract_jobs(connection, ids)
+    delete_jobs(connection, ids)
+    sync_jobs(connection, deleted_ids=ids)
+    tombstone_jobs(connection, ids)
+    unindex_jobs(connection, ids)
+    return ids
+
+
+def archive_expired(days, batch_size=500, pause=0.5, max_batches=None, stop=None, progress=None):
+    """
+    Moves jobs older than `days` to jobs_archive, one committed batch at a
+    time (needs an app context). Stops after `max_batches` batches or when
+    the `stop` event is set; progress(archived so far) is called after each
+    batch. Returns the number of jobs archived.
+    """
+    cutoff = retention_cutoff(days)
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        if stop is not None and stop.is_set():
+            break
+        try:
+            connection = db.session.connection()
+            ids = archive_jobs(connection, expired_job_ids(connection, cutoff, batch_size))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        if not ids:
+            break
+        response_cache.invalidate(ids)
+        invalidate_read_model()
+        archived += len(ids)
+        batches += 1
+        if progress:
+            progress(archived)
+        if len(ids) < batch_size:
+            break
+        time.sleep(pause)
+    return archived
+
+
+class ArchiveScheduler:
+    """Runs archive_expired() every JOBS_ARCHIVE_INTERVAL_SECONDS in a daemon thread."""
+
+    def __init__(self):
+        self.app = None
+        self.thread = None
+        self.stop = threading.Event()
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['jobs_archive_scheduler'] = self
+        config = app.config
+        if config.get('JOBS_RETENTION_DAYS', 0) > 0 and config.get('JOBS_ARCHIVE_INTERVAL_SECONDS', 0) > 0:
+            self.start()
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop.clear()
+        self.thread = threading.Thread(target=self._run, name='jobs-archive', daemon=True)
+        self.thread.start()
+
+    def shutdown(self):
+        self.stop.set()
+
+    def _run(self):
+        config = self.app.config
+        while not self.stop.wait(config['JOBS_ARCHIVE_INTERVAL_SECONDS']):
+            try:
+                with self.app.app_context():
+                    archived = archive_expired(
+                        config['JOBS_RETENTION_DAYS'], batch_size=config['JOBS_ARCHIVE_BATCH_SIZE'],
+                        pause=config['JOBS_ARCHIVE_PAUSE_SECONDS'], stop=self.stop,
+                    )
+                if archived:
+                    print(f"✅ Archived {archived} jobs older than {config['JOBS_RETENTION_DAYS']} days")
+            except Exception as e:
+                print(f"❌ Scheduled archival failed: {e}")
+
+
+archive_scheduler = ArchiveScheduler()
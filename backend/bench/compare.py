@@ -0,0 +1,74 @@
+# bench/compare.py
+"""
+Compares a bench/run.py report against a baseline report and exits non-zero
+when any scenario regressed, for use as a CI gate:
+
+    python bench/compare.py baseline.json bench-results.json --threshold 0.2
+
+A scenario regresses when its p95 latency grows by more than `threshold`
+(and by more than --min-delta-ms, to ignore sub-millisecond noise) or its
+rows/s drops by more than `threshold`. Scenarios present in only one report,
+or skipped in either (no requests timed, null percentiles), are listed but do
+not fail the run.
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {(r["size"], r["scenario"]): r for r in report["results"]}
+
+
+def compare(baseline, current, threshold=0.2, min_delta_ms=1.0):
+    """Returns (regressions, improvements) as lists of (key, message)."""
+    regressions, improvements = [], []
+    for key in sorted(baseline.keys() & current.keys(), key=str):
+        before, after = baseline[key], current[key]
+        if not after["requests"] or not before["requests"] or None in (before["p95_ms"], after["p95_ms"]):
+            continue
+        p95_before, p95_after = before["p95_ms"], after["p95_ms"]
+        change = (p95_after - p95_before) / p95_before if p95_before else 0.0
+        message = f"p95 {p95_before:.2f} -> {p95_after:.2f} ms ({change:+.0%})"
+        if change > threshold and p95_after - p95_before > min_delta_ms:
+            regressions.append((key, message))
+        elif change < -threshold and p95_before - p95_after > min_delta_ms:
+            improvements.append((key, message))
+
+        rate_before, rate_after = before.get("rows_per_s"), after.get("rows_per_s")
+        if rate_before and rate_after is not None and rate_after < rate_before * (1 - threshold):
+            regressions.append((key, f"rows/s {rate_before:.0f} -> {rate_after:.0f} "
+                                     f"({(rate_after - rate_before) / rate_before:+.0%})"))
+    return regressions, improvements
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions against a baseline.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown (default 0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    options = parser.parse_args(argv)
+
+    baseline, current = load_results(options.baseline), load_results(options.current)
+    regressions, improvements = compare(baseline, current, options.threshold, options.min_delta_ms)
+
+    for (size, scenario), message in improvements:
+        print(f"✅ [{size}] {scenario}: {message}")
+    for key in sorted(baseline.keys() ^ current.keys(), key=str):
+        where = "baseline" if key in baseline else "current run"
+        print(f"   [{key[0]}] {key[1]}: only in {where}")
+    for size, scenario in sorted(baseline.keys() & current.keys(), key=str):
+        if not baseline[(size, scenario)]["requests"] or not current[(size, scenario)]["requests"]:
+            print(f"   [{size}] {scenario}: skipped in one of the runs")
+    for (size, scenario), message in regressions:
+        print(f"❌ [{size}] {scenario}: {message}")
+    print(f"{len(regressions)} regressions, {len(improvements)} improvements, "
+          f"{len(baseline.keys() & current.keys())} scenarios compared")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# bench/generate.py
+"""
+Deterministic synthetic job catalog for benchmarks.
+
+The same (size, seed) always produces the same rows. Companies, locations
+and tags follow Zipf-like popularity curves (a few very common values and a
+long tail), the way scraped job boards do. Rows are bulk-loaded with Core
+inserts, then facet counts and the search index are rebuilt in one pass:
+
+    python bench/generate.py --size 100000 --database-url sqlite:///bench.db
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+# make backend importable (one level up from bench -> backend/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_SEED = 42
+INSERT_BATCH = 5000
+
+# Postings are spread over the year before this fixed date
+ANCHOR_DATE = date(2024, 6, 30)
+
+SENIORITY = ["", "Junior ", "Senior ", "Lead ", "Principal ", "Associate ", "Assistant ", "Chief "]
+ROLES = [
+    "Actuary", "Actuarial Analyst", "Pricing Actuary", "Reserving Actuary", "Data Scientist",
+    "Data Analyst", "Risk Analyst", "Underwriter", "Catastrophe Modeler", "Quantitative Analyst",
+    "Software Engineer", "Data Engineer", "Product Manager", "Consultant", "Capital Modeler",
+    "Pension Actuary", "Life Actuary", "Health Actuary", "Valuation Actuary", "Statistician",
+]
+JOB_TYPES = [("Full-time", 70), ("Contract", 12), ("Internship", 7), ("Part-time", 6), (None, 5)]
+# Most common first; weights fall off as 1 / rank ** LOCATION_SKEW
+LOCATIONS = [
+    "Remote", "London, UK", "New York, NY", "Chicago, IL", "Hartford, CT", "Toronto, ON",
+    "Boston, MA", "Zurich, Switzerland", "Des Moines, IA", "Philadelphia, PA", "Atlanta, GA",
+    "Dallas, TX", "San Francisco, CA", "Minneapolis, MN", "Columbus, OH", "Omaha, NE",
+    "Charlotte, NC", "Seattle, WA", "Denver, CO", "Milwaukee, WI", "Dublin, Ireland",
+    "Sydney, Australia", "Singapore", "Hong Kong", "Munich, Germany", "Paris, France",
+    "Bermuda", "Edinburgh, UK", "Montreal, QC", "Indianapolis, IN", "Nashville, TN",
+    "Phoenix, AZ", "Kansas City, MO", "St. Louis, MO", "Richmond, VA", "Jacksonville, FL",
+]
+LOCATION_SKEW = 1.1
+TAG_WORDS = [
+    "Python", "SQL", "R", "Excel", "VBA", "SAS", "Pricing", "Reserving", "P&C", "Life", "Health",
+    "Pensions", "IFRS 17", "Solvency II", "Machine Learning", "Statistics", "Tableau", "Power BI",
+    "Prophet", "AXIS", "GGY", "Emblem", "Radar", "Spark", "AWS", "Azure", "Modeling", "Reinsurance",
+    "Catastrophe", "Capital", "ASA", "FSA", "ACAS", "FCAS", "Entry Level", "Remote Friendly",
+]
+TAG_SKEW = 1.0
+TAG_TAIL = 300  # extra rare tags ("Skill 37") behind the named ones
+COMPANY_COUNT = 2000
+COMPANY_SKEW = 0.9
+
+
+def zipf_cum_weights(n, skew):
+    total = 0.0
+    cum = []
+    for rank in range(1, n + 1):
+        total += 1.0 / rank ** skew
+        cum.append(total)
+    return cum
+
+
+class CatalogGenerator:
+    """Yields job dicts for a (size, seed) pair; see iter_jobs()."""
+
+    def __init__(self, seed=DEFAULT_SEED):
+        self.rng = random.Random(seed)
+        self.companies = [f"Company {n:04d}" for n in range(1, COMPANY_COUNT + 1)]
+        self.company_weights = zipf_cum_weights(len(self.companies), COMPANY_SKEW)
+        self.location_weights = zipf_cum_weights(len(LOCATIONS), LOCATION_SKEW)
+        self.tags = TAG_WORDS + [f"Skill {n}" for n in range(1, TAG_TAIL + 1)]
+        self.tag_weights = zipf_cum_weights(len(self.tags), TAG_SKEW)
+        self.job_types = [value for value, _ in JOB_TYPES]
+        self.job_type_weights = [weight for _, weight in JOB_TYPES]
+
+    def job(self, number):
+        rng = self.rng
+        tag_count = rng.choices(range(7), weights=[5, 10, 20, 25, 20, 12, 8])[0]
+        return {
+            "title": rng.choice(SENIORITY) + rng.choice(ROLES),
+            "company": rng.choices(self.companies, cum_weights=self.company_weights)[0],
+            "location": rng.choices(LOCATIONS, cum_weights=self.location_weights)[0],
+            "posting_date": ANCHOR_DATE - timedelta(days=rng.randrange(365)),
+            "job_type": rng.choices(self.job_types, weights=self.job_type_weights)[0],
+            "tags": list(dict.fromkeys(rng.choices(self.tags, cum_weights=self.tag_weights, k=tag_count))),
+            "link": f"https://bench.invalid/jobs/{number}",
+        }
+
+    def iter_jobs(self, size):
+        """Yields `size` jobs with distinct dedupe keys (title/company/location)."""
+        from model.job import make_dedupe_key
+
+        seen = set()
+        number = 0
+        while len(seen) < size:
+            number += 1
+            job = self.job(number)
+            key = make_dedupe_key(job["title"], job["company"], job["location"])
+            if key in seen:
+                continue
+            seen.add(key)
+            job["dedupe_key"] = key
+            yield job
+
+
+def clear_catalog(connection):
+    from model.facet import FacetCount
+    from model.job import Job
+    from model.near_duplicate import JobMinhashBucket
+    from model.tag import Tag, job_tags
+    from search import index_table, dialect_name, SearchUnavailable
+    from sqlalchemy import text
+
+    connection.execute(delete(job_tags))
+    connection.execute(delete(Job.__table__))
+    connection.execute(delete(Tag.__table__))
+    connection.execute(delete(FacetCount.__table__))
+    connection.execute(delete(JobMinhashBucket.__table__))
+    try:
+        table, _ = index_table(dialect_name(connection))
+        connection.execute(text(f"DELETE FROM {table}"))
+    except SearchUnavailable:
+        pass
+
+
+def load_catalog(connection, size, seed=DEFAULT_SEED, progress=None):
+    """
+    Replaces the jobs catalog with `size` generated rows (ids 1..size) and
+    rebuilds facet counts, the search index, the change sequence and the
+    near-duplicate buckets. Returns the elapsed seconds.
+    """
+    from facets import rebuild_facet_counts
+    from locations import location_columns
+    from model.job import Job
+    from model.tag import Tag, job_tags, normalize_tag
+    from near_duplicates import rebuild_near_duplicate_index
+    from search import sync_jobs
+    from sync import reset_sync_state
+
+    started = time.perf_counter()
+    clear_catalog(connection)
+
+    generator = CatalogGenerator(seed)
+    tag_ids = {normalize_tag(name): n for n, name in enumerate(generator.tags, start=1)}
+    connection.execute(insert(Tag.__table__), [
+        {"id": tag_ids[normalize_tag(name)], "name": name, "slug": normalize_tag(name)} for name in generator.tags
+    ])
+
+    jobs, links = [], []
+
+    def flush():
+        connection.execute(insert(Job.__table__), jobs)
+        if links:
+            connection.execute(insert(job_tags), links)
+        jobs.clear()
+        links.clear()
+
+    for job_id, job in enumerate(generator.iter_jobs(size), start=1):
+        jobs.append({
+            "id": job_id, "title": job["title"], "company": job["company"], "location": job["location"],
+            "posting_date": job["posting_date"], "job_type": job["job_type"], "source_url": job["link"],
+            "dedupe_key": job["dedupe_key"], **location_columns(job["location"]),
+        })
+        links.extend({"job_id": job_id, "tag_id": tag_ids[normalize_tag(name)]} for name in job["tags"])
+        if len(jobs) >= INSERT_BATCH:
+            flush()
+            if progress:
+                progress(job_id)
+    if jobs:
+        flush()
+
+    rebuild_facet_counts(connection)
+    reset_sync_state(connection)
+    rebuild_near_duplicate_index(connection)
+    for start in range(1, size + 1, INSERT_BATCH):
+        sync_jobs(connection, changed_ids=range(start, min(start + INSERT_BATCH, size + 1)))
+
+    if connection.dialect.name == "postgresql":
+        # Explicit ids leave the sequence behind; keep later inserts working
+        connection.execute(select(func.setval("jobs_id_seq", size)))
+        connection.execute(select(func.setval("tags_id_seq", len(generator.tags))))
+    return time.perf_counter() - started
+
+
+def catalog_size(connection):
+    from model.job import Job
+
+    return connection.execute(select(func.count()).select_from(Job.__table__)).scalar()
+
+
+# ---------- Run: generate one catalog ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load a synthetic job catalog into DATABASE_URL.")
+    parser.add_argument("--size", type=int, default=SIZES[0])
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///bench.db"))
+    options = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = options.database_url
+    from app import create_app
+    from db import db
+
+    app = create_app()
+    with app.app_context(), db.engine.begin() as connection:
+        elapsed = load_catalog(connection, options.size, options.seed,
+                               progress=lambda n: print(f"  {n} rows...", file=sys.stderr))
+    print(f"✅ Generated {options.size} jobs in {elapsed:.1f}s")
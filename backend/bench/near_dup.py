@@ -0,0 +1,147 @@
+# bench/near_dup.py
+"""
+Near-duplicate detection cost as the catalog grows.
+
+For each catalog size it ingests the same number of postings through
+bulk.upsert_jobs(): half are reworded copies of random catalog rows ("Sr."
+for "Senior", a legal suffix on the company, one tag more or less), half
+are unseen postings. Per-row time should stay roughly flat from 10k to 1M
+rows, since each posting is only compared with the jobs sharing one of its
+LSH buckets. The report gives per-row cost, the stored candidates looked at
+per row and the near-duplicates found:
+
+    python bench/near_dup.py --sizes 10000 100000 1000000
+
+Catalogs are the cached ones of bench/run.py; the ingest runs in a
+transaction that is rolled back, so they stay reusable.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# make backend importable (one level up from bench -> backend/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench.generate import DEFAULT_SEED, SIZES, CatalogGenerator, catalog_size, load_catalog
+from bench.run import create_bench_app, database_url_for
+
+REWORDINGS = [("Senior ", "Sr. "), ("Junior ", "Jr. "), ("Associate ", "Assoc. "), ("Assistant ", "Asst. ")]
+COMPANY_SUFFIXES = [" Inc.", " LLC", " Ltd", " Group"]
+
+
+def reworded(job, rng):
+    """A copy of `job` as another board might list it."""
+    title = job["title"]
+    for old, new in REWORDINGS:
+        if title.startswith(old):
+            title = new + title[len(old):]
+            break
+    tags = list(job["tags"])
+    if tags and rng.random() < 0.5:
+        tags.pop(rng.randrange(len(tags)))
+    elif rng.random() < 0.5:
+        tags.append(rng.choice(["Excel", "SQL", "Python"]))
+    return {**job, "title": title, "company": job["company"] + rng.choice(COMPANY_SUFFIXES), "tags": tags}
+
+
+def sample_postings(connection, size, count, seed):
+    """`count` postings: reworded catalog rows and unseen ones, shuffled."""
+    from sqlalchemy import select
+    from model.job import Job
+    from model.tag import split_tag_names, tag_names_column
+
+    jobs = Job.__table__
+    rng = random.Random(seed)
+    ids = rng.sample(range(1, size + 1), count // 2)
+    rows = connection.execute(
+        select(jobs.c.title, jobs.c.company, jobs.c.location, jobs.c.posting_date, jobs.c.job_type,
+               tag_names_column(jobs.c.id)).where(jobs.c.id.in_(ids))
+    ).all()
+    postings = [
+        reworded({"title": title, "company": company, "location": location, "posting_date": posting_date,
+                  "job_type": job_type, "tags": split_tag_names(tag_names)}, rng)
+        for title, company, location, posting_date, job_type, tag_names in rows
+    ]
+    for n, job in enumerate(CatalogGenerator(seed + 1).iter_jobs(count - len(postings))):
+        postings.append({**job, "title": f"{job['title']} #{n}"})
+    rng.shuffle(postings)
+    return [({"title": job["title"], "company": job["company"], "location": job["location"],
+              "posting_date": job["posting_date"], "job_type": job["job_type"], "source_url": None},
+             job["tags"]) for job in postings]
+
+
+def candidates_per_row(connection, entries):
+    """Mean number of distinct stored jobs sharing a bucket with each posting."""
+    from near_duplicates import bucket_members, buckets, fingerprint
+
+    keys_of = [buckets(fingerprint(row["title"], row["company"], row["location"], tags)) for row, tags in entries]
+    members = bucket_members(connection, [key for keys in keys_of for key in keys])
+    total = sum(len({job_id for key in keys for job_id in members.get(key, ())}) for keys in keys_of)
+    return total / len(entries) if entries else 0.0
+
+
+def run_size(app, size, options):
+    from bulk import upsert_jobs
+    from db import db
+
+    with app.app_context():
+        connection = db.session.connection()  # tags are resolved through the session
+        try:
+            entries = sample_postings(connection, size, options.postings, options.seed)
+            candidates = candidates_per_row(connection, entries)
+            tag_cache = {}
+            found = 0
+            started = time.perf_counter()
+            for start in range(0, len(entries), options.batch):
+                result = upsert_jobs(connection, entries[start:start + options.batch], tag_cache,
+                                     near_duplicate_mode=options.mode)
+                found += len(result["near_duplicates"])
+            elapsed = time.perf_counter() - started
+        finally:
+            db.session.rollback()
+            db.engine.dispose()
+    return {
+        "size": size,
+        "rows": len(entries),
+        "per_row_ms": round(elapsed / len(entries) * 1000, 3),
+        "candidates_per_row": round(candidates, 1),
+        "near_duplicates": found,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time near-duplicate detection at ingest against growing catalogs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES[:2]))
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--database-url", help="target database (default: cached SQLite file per size)")
+    parser.add_argument("--postings", type=int, default=2000, help="postings ingested per size")
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--mode", default="flag", choices=("off", "flag", "merge", "skip"))
+    options = parser.parse_args(argv)
+    options.cache = options.read_model = False
+
+    from db import db
+
+    results = []
+    for size in sorted(options.sizes):
+        app = create_bench_app(database_url_for(size, options), options)
+        with app.app_context(), db.engine.begin() as connection:
+            if catalog_size(connection) != size:
+                print(f"Generating {size} jobs...", file=sys.stderr)
+                print(f"  done in {load_catalog(connection, size, options.seed):.1f}s", file=sys.stderr)
+        results.append(run_size(app, size, options))
+
+    base = results[0]
+    print(f"{'catalog':>10} {'per row':>10} {'vs first':>9} {'candidates':>11} {'near-dups':>10}")
+    for result in results:
+        growth = result["per_row_ms"] / base["per_row_ms"] if base["per_row_ms"] else 0.0
+        print(f"{result['size']:>10} {result['per_row_ms']:>7.3f} ms {growth:>8.2f}x "
+              f"{result['candidates_per_row']:>11.1f} {result['near_duplicates']:>10}")
+    if len(results) > 1:
+        print(f"Catalog grew {results[-1]['size'] / base['size']:.0f}x.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# bench/run.py
+"""
+Benchmark harness for the jobs API.
+
+For each catalog size it loads (or reuses) a generated catalog, then drives
+the Flask app through its test client: GET /jobs/ for every filter x sort x
+page shape, GET /jobs/<id>, GET /jobs/facets and GET /jobs/search, plus
+save_jobs_to_db() ingest. Each scenario reports p50/p95/p99 latency, rows/s
+and the process's peak RSS so far. Results are written as JSON for
+bench/compare.py:
+
+    python bench/run.py --sizes 10000 100000 --output bench-results.json
+    python bench/run.py --database-url postgresql://localhost/jobs_bench
+
+SQLite catalogs are cached under bench/.data/ per (size, seed). On any other
+database the jobs tables are replaced, so point it at a scratch database.
+The response cache is off unless --cache is given, so every request reaches
+the database; --read-model answers list requests from the in-memory read
+model instead.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak RSS is reported as null
+    resource = None
+
+# make backend importable (one level up from bench -> backend/)
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND_DIR)
+
+from bench.generate import DEFAULT_SEED, SIZES, CatalogGenerator, catalog_size, load_catalog
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+PAGE_SIZE = 50
+SEARCH_QUERIES = ["actuary", "senior data", "pricing python", "underwriter"]
+INGEST_URL_PREFIX = "https://bench.invalid/ingest/"
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile_ms(latencies, fraction):
+    """percentile() in milliseconds; None (null in the report) when nothing was timed."""
+    value = percentile(latencies, fraction)
+    return round(value * 1000, 3) if value is not None else None
+
+
+def summarize(name, size, latencies, rows):
+    latencies = sorted(latencies)
+    elapsed = sum(latencies)
+    return {
+        "scenario": name,
+        "size": size,
+        "requests": len(latencies),
+        "rows": rows,
+        "p50_ms": percentile_ms(latencies, 0.50),
+        "p95_ms": percentile_ms(latencies, 0.95),
+        "p99_ms": percentile_ms(latencies, 0.99),
+        "rows_per_s": round(rows / elapsed, 1) if elapsed else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def response_rows(payload):
+    """Number of jobs in a list/search/detail response body."""
+    if isinstance(payload, list):
+        return len(payload)
+    if isinstance(payload, dict) and "jobs" in payload:
+        return len(payload["jobs"])
+    return 1
+
+
+def time_requests(client, urls, warmup=2):
+    """GETs each url (after `warmup` untimed calls); returns (latencies, rows)."""
+    for url in urls[:warmup]:
+        client.get(url)
+    latencies, rows = [], 0
+    for url in urls:
+        started = time.perf_counter()
+        response = client.get(url)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        rows += response_rows(response.get_json())
+    return latencies, rows
+
+
+def list_scenarios(repeat):
+    """(name, urls) for every GET /jobs/ filter x sort x first/next page shape."""
+    from explain_check import query_shapes
+
+    for label, args in query_shapes():
+        args = args.copy()
+        args["limit"] = PAGE_SIZE
+        yield f"list {label}", ["/jobs/?" + urlencode(list(args.items(multi=True)))] * repeat
+
+
+def run_size(app, size, options):
+    from db import db
+
+    rng = random.Random(options.seed)
+    client = app.test_client()
+    results = []
+
+    def record(name, urls):
+        latencies, rows = time_requests(client, urls)
+        result = summarize(name, size, latencies, rows)
+        results.append(result)
+        print(f"  {name:<70} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  "
+              f"{result['rows_per_s'] or 0:>12.0f} rows/s", file=sys.stderr)
+
+    for name, urls in list_scenarios(options.repeat):
+        record(name, urls)
+    if size <= options.unpaged_max:
+        record("list unpaged", ["/jobs/"] * max(3, options.repeat // 4))
+        record("list unpaged fields=id,title,company", ["/jobs/?fields=id,title,company"] * max(3, options.repeat // 4))
+    record("get_job", [f"/jobs/{rng.randint(1, size)}" for _ in range(options.repeat * 5)])
+    record("facets", ["/jobs/facets"] * options.repeat)
+    record("facets location=Remote tag=python",
+           ["/jobs/facets?location=Remote&tag=python"] * options.repeat)
+    record("search", ["/jobs/search?" + urlencode({"q": q, "limit": PAGE_SIZE}) for q in SEARCH_QUERIES]
+           * max(1, options.repeat // 4))
+
+    if options.ingest:
+        with app.app_context():
+            results.append(run_ingest(app, size, options))
+        with app.app_context():
+            remove_ingested(db)
+    return results
+
+
+def run_ingest(app, size, options):
+    """Times save_jobs_to_db() on new postings mixed with re-scraped existing ones."""
+    try:
+        from Scraper.scrape import save_jobs_to_db
+    except ImportError as e:  # selenium/webdriver_manager missing
+        print(f"  skipping ingest: {e}", file=sys.stderr)
+        return summarize("save_jobs_to_db", size, [], 0)
+
+    # Half re-scrapes of catalog rows (same seed -> same postings), half unseen postings
+    existing = CatalogGenerator(options.seed).iter_jobs(options.ingest // 2)
+    fresh = CatalogGenerator(options.seed + 1).iter_jobs(options.ingest - options.ingest // 2)
+    jobs = list(existing)
+    for n, job in enumerate(fresh):
+        job["title"] += f" #{n}"  # keep clear of catalog dedupe keys
+        job["link"] = f"{INGEST_URL_PREFIX}{n}"
+        jobs.append(job)
+    jobs = [{key: job[key] for key in ("title", "company", "location", "posting_date", "job_type", "tags", "link")}
+            for job in jobs]
+
+    started = time.perf_counter()
+    save_jobs_to_db(jobs, batch_size=options.ingest_batch, app=app)
+    elapsed = time.perf_counter() - started
+    return summarize("save_jobs_to_db", size, [elapsed], len(jobs))
+
+
+def remove_ingested(db):
+    """Deletes rows added by the ingest scenario so a cached catalog stays reusable."""
+    from sqlalchemy import select
+    from bulk import bulk_write
+    from model.job import Job
+
+    ids = list(db.session.execute(
+        select(Job.id).where(Job.source_url.like(INGEST_URL_PREFIX + "%"))
+    ).scalars())
+    if ids:
+        bulk_write([], [], ids)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def database_url_for(size, options):
+    if options.database_url:
+        return options.database_url
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return f"sqlite:///{os.path.join(DATA_DIR, f'jobs_{size}_{options.seed}.db')}"
+
+
+def create_bench_app(database_url, options):
+    """App bound to `database_url`; settings are read from the environment at import time."""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["JOBS_CACHE_BACKEND"] = "local" if options.cache else "none"
+    os.environ["JOBS_READ_MODEL"] = "1" if options.read_model else "0"
+    import config
+    from app import create_app
+
+    config.Config.SQLALCHEMY_DATABASE_URI = database_url
+    config.Config.JOBS_CACHE_BACKEND = os.environ["JOBS_CACHE_BACKEND"]
+    config.Config.JOBS_READ_MODEL = options.read_model
+    return create_app()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the jobs API against generated catalogs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES[:2]),
+                        help=f"catalog sizes to run (default: {SIZES[0]} {SIZES[1]}; add {SIZES[2]} for the large run)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--database-url", help="target database (default: cached SQLite file per size)")
+    parser.add_argument("--regenerate", action="store_true", help="reload the catalog even if it looks current")
+    parser.add_argument("--repeat", type=int, default=20, help="timed requests per list scenario")
+    parser.add_argument("--unpaged-max", type=int, default=100_000,
+                        help="largest catalog to time the unpaged GET /jobs/ on")
+    parser.add_argument("--ingest", type=int, default=2000, help="jobs for the save_jobs_to_db scenario (0 = skip)")
+    parser.add_argument("--ingest-batch", type=int, default=500)
+    parser.add_argument("--cache", action="store_true", help="leave the response cache on")
+    parser.add_argument("--read-model", action="store_true", help="serve GET /jobs/ from the in-memory read model")
+    parser.add_argument("--output", default="bench-results.json")
+    options = parser.parse_args(argv)
+
+    from db import db
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": options.seed,
+            "repeat": options.repeat,
+            "cache": options.cache,
+            "read_model": options.read_model,
+            "sizes": options.sizes,
+        },
+        "results": [],
+    }
+    for size in options.sizes:
+        app = create_bench_app(database_url_for(size, options), options)
+        with app.app_context():
+            report["meta"]["dialect"] = db.engine.dialect.name
+            with db.engine.begin() as connection:
+                if options.regenerate or catalog_size(connection) != size:
+                    print(f"Generating {size} jobs...", file=sys.stderr)
+                    print(f"  done in {load_catalog(connection, size, options.seed):.1f}s", file=sys.stderr)
+        print(f"Benchmarking {size} jobs ({report['meta']['dialect']})", file=sys.stderr)
+        report["results"].extend(run_size(app, size, options))
+        with app.app_context():
+            db.engine.dispose()
+
+    with open(options.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Wrote {len(report['results'])} results to {options.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,491 @@
+import io
+from datetime import date, datetime
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from cache import response_cache
+from db import db
+from facets import FACET_COLUMNS, add_jobs, apply_change, row_facet_values, subtract_jobs
+from locations import location_columns
+from model.job import Job, make_dedupe_key
+from model.tag import Tag, job_tags, normalize_tag, split_tag_names, tag_names_column
+from near_duplicates import find_near_duplicates, index_jobs, settings as near_duplicate_settings, unindex_jobs
+from read_model import invalidate_read_model
+from search import sync_jobs
+from sync import next_change_seqs, tombstone_jobs, touch_jobs
+
+# Set-based writes for POST /jobs/bulk.
+#
+# Rows arrive already validated and converted to column values. Each chunk
+# of `chunk_size` rows becomes one executemany/multi-row statement, and a
+# commit is issued every `commit_every` rows (0 = one transaction for the
+# whole request). Core statements bypass the ORM hooks, so the search index,
+# facet counts, change sequence, near-duplicate buckets, response cache and
+# read model are updated explicitly per chunk / per commit.
+#
+# update_job_row()/delete_job_row() serve the single-job endpoints without
+# the ORM: one locked read keyed by id (and by version, for If-Match) tells
+# the caller to answer 404 or 412 and supplies the pre-image for the facet
+# delta, then the row is written once by id. The other bookkeeping above
+# still costs a few statements of its own per job.
+
+jobs = Job.__table__
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def existing_job_ids(connection, job_ids):
+    if not job_ids:
+        return set()
+    return set(connection.execute(select(jobs.c.id).where(jobs.c.id.in_(job_ids))).scalars())
+
+
+UPSERT_COLUMNS = ('title', 'company', 'location', 'posting_date', 'job_type', 'source_url', 'dedupe_key',
+                  'city', 'region', 'country', 'is_remote')
+
+
+def copy_value(value):
+    """A value in PostgreSQL COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def copy_rows(connection, table, rows):
+    """
+    Inserts `rows` (dicts with the same keys) with COPY ... FROM STDIN, much
+    cheaper than multi-row INSERTs for large batches. PostgreSQL only (psycopg2
+    or psycopg 3); returns False without writing anywhere else.
+    """
+    if not rows or connection.dialect.name != 'postgresql':
+        return False
+    cursor = connection.connection.cursor()
+    if not hasattr(cursor, 'copy_expert') and not hasattr(cursor, 'copy'):
+        cursor.close()
+        return False
+    quote = connection.dialect.identifier_preparer.quote
+    columns = list(rows[0])
+    sql = f"COPY {quote(table.name)} ({', '.join(quote(c) for c in columns)}) FROM STDIN"
+    try:
+        if hasattr(cursor, 'copy_expert'):  # psycopg2
+            data = ''.join('\t'.join(copy_value(row[c]) for c in columns) + '\n' for row in rows)
+            cursor.copy_expert(sql, io.StringIO(data))
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row([row[c] for c in columns])
+    finally:
+        cursor.close()
+    return True
+
+
+def upsert_statement(dialect):
+    """
+    INSERT ... ON CONFLICT (dedupe_key) DO UPDATE / ON DUPLICATE KEY UPDATE for
+    the dialect, or None if it has no native upsert. Incoming NULLs never
+    overwrite stored job_type/source_url.
+    """
+    name = dialect.name
+    if name in ('sqlite', 'postgresql'):
+        statement = (sqlite_insert if name == 'sqlite' else postgresql_insert)(jobs)
+        return statement.on_conflict_do_update(
+            index_elements=[jobs.c.dedupe_key],
+            set_={
+                'posting_date': statement.excluded.posting_date,
+                'job_type': func.coalesce(statement.excluded.job_type, jobs.c.job_type),
+                'source_url': func.coalesce(statement.excluded.source_url, jobs.c.source_url),
+            },
+        )
+    if name in ('mysql', 'mariadb'):
+        statement = mysql_insert(jobs)
+        return statement.on_duplicate_key_update(
+            posting_date=statement.inserted.posting_date,
+            job_type=func.coalesce(statement.inserted.job_type, jobs.c.job_type),
+            source_url=func.coalesce(statement.inserted.source_url, jobs.c.source_url),
+        )
+    return None
+
+
+def row_changes_job(row, tags, stored):
+    """True if upserting (row, tags) would modify the stored job."""
+    if row['posting_date'] != stored.posting_date:
+        return True
+    if row['job_type'] is not None and row['job_type'] != stored.job_type:
+        return True
+    if row['source_url'] is not None and row['source_url'] != stored.source_url:
+        return True
+    wanted = {normalize_tag(t) for t in tags or []}
+    return bool(wanted) and wanted != {normalize_tag(t) for t in split_tag_names(stored.tag_names)}
+
+
+def merge_entry(into, entry):
+    """Folds a re-scraped (row, tags) into an earlier one the way the upsert would."""
+    row, tags = into
+    row = {**row, 'posting_date': entry[0]['posting_date'],
+           **{c: entry[0][c] for c in ('job_type', 'source_url') if entry[0][c] is not None}}
+    return row, entry[1] or tags
+
+
+def stored_by(connection, column, values):
+    """{column value: row} of the stored jobs for upsert comparisons."""
+    if not values:
+        return {}
+    rows = connection.execute(
+        select(jobs.c.id, jobs.c.dedupe_key, jobs.c.posting_date, jobs.c.job_type,
+               jobs.c.source_url, tag_names_column(jobs.c.id))
+        .where(column.in_(values))
+    )
+    return {getattr(r, column.key): r for r in rows}
+
+
+def upsert_jobs(connection, entries, tag_cache, near_duplicate_mode=None, copy=False):
+    """
+    Inserts new postings and updates changed ones, matched by dedupe_key.
+    entries: list of (column dict, tag names); a later entry with the same key wins.
+    New postings that nearly duplicate a stored job or an earlier entry are
+    flagged, merged or skipped per JOBS_NEAR_DUP_MODE (or `near_duplicate_mode`).
+    With `copy`, new postings and their tag links are written with COPY where
+    the database supports it (large imports). Returns {'inserted': ids,
+    'updated': ids, 'skipped': ids, 'near_duplicates': ids of the jobs
+    matched}. Costs a fixed handful of statements per call regardless of the
+    number of rows.
+    """
+    by_key = {}
+    for row, tags in entries:
+        row = {column: row.get(column) for column in UPSERT_COLUMNS}
+        row['dedupe_key'] = make_dedupe_key(row['title'], row['company'], row['location'])
+        row.update(location_columns(row['location']))  # cached per distinct location
+        by_key[row['dedupe_key']] = (row, tags)
+    if not by_key:
+        return {'inserted': [], 'updated': [], 'skipped': [], 'near_duplicates': []}
+
+    stored = stored_by(connection, jobs.c.dedupe_key, list(by_key))
+    # A source_url already owned by a different posting is dropped, not moved
+    urls = [row['source_url'] for row, _ in by_key.values() if row['source_url']]
+    if urls:
+        owners = dict(connection.execute(
+            select(jobs.c.source_url, jobs.c.dedupe_key).where(jobs.c.source_url.in_(urls))
+        ).all())
+        for key, (row, _) in by_key.items():
+            if row['source_url'] and owners.get(row['source_url'], key) != key:
+                row['source_url'] = None
+    # ...and one carried by several entries of the batch stays with the first
+    claimed = set()
+    for row, _ in by_key.values():
+        if row['source_url'] in claimed:
+            row['source_url'] = None
+        elif row['source_url']:
+            claimed.add(row['source_url'])
+
+    new_keys = [key for key in by_key if key not in stored]
+    changed_keys = [key for key in by_key if key in stored and row_changes_job(*by_key[key], stored[key])]
+
+    # Near-duplicates among the new postings: ('job', id) or ('entry', earlier key)
+    mode, threshold = near_duplicate_settings(near_duplicate_mode)
+    near = {}
+    if mode != 'off' and new_keys:
+        near = find_near_duplicates(connection, [(key, *by_key[key]) for key in new_keys], threshold)
+    merged = {}  # stored job id -> (row, tags) folded into it
+    if mode in ('merge', 'skip') and near:
+        for key, (kind, target) in near.items():
+            if mode == 'skip':
+                continue
+            if kind == 'entry':
+                by_key[target] = merge_entry(by_key[target], by_key[key])
+            else:
+                merged[target] = merge_entry(merged[target], by_key[key]) if target in merged else by_key[key]
+        new_keys = [key for key in new_keys if key not in near]
+    merge_targets = stored_by(connection, jobs.c.id, list(merged))
+    exact_ids = {stored[key].id for key in changed_keys}
+    merged_changed = [job_id for job_id in merged if job_id in merge_targets and job_id not in exact_ids
+                      and row_changes_job(*merged[job_id], merge_targets[job_id])]
+    rows = [by_key[key][0] for key in new_keys + changed_keys]
+
+    subtract_jobs(connection, [stored[key].id for key in changed_keys] + merged_changed)
+    if rows:
+        statement = upsert_statement(connection.dialect)
+        copied = copy and copy_rows(connection, jobs, [by_key[key][0] for key in new_keys])
+        if statement is not None and not copied:
+            connection.execute(statement, rows)
+        else:
+            if new_keys and not copied:
+                connection.execute(insert(jobs), [by_key[key][0] for key in new_keys])
+            if changed_keys:
+                update_jobs(connection, [
+                    {'id': stored[key].id, **{c: v for c, v in by_key[key][0].items() if v is not None}}
+                    for key in changed_keys
+                ])
+    if merged_changed:
+        update_jobs(connection, [
+            {'id': job_id, 'posting_date': merged[job_id][0]['posting_date'],
+             **{c: merged[job_id][0][c] for c in ('job_type', 'source_url') if merged[job_id][0][c] is not None}}
+            for job_id in merged_changed
+        ])
+
+    new_ids = {}
+    if new_keys:
+        new_ids = dict(connection.execute(
+            select(jobs.c.dedupe_key, jobs.c.id).where(jobs.c.dedupe_key.in_(new_keys))
+        ).all())
+    matched = {key: target if kind == 'job' else new_ids[target] for key, (kind, target) in near.items()}
+    if mode == 'flag' and matched:
+        connection.execute(
+            update(jobs).where(jobs.c.id == bindparam('job_id')).values(duplicate_of=bindparam('original')),
+            [{'job_id': new_ids[key], 'original': original} for key, original in matched.items()],
+        )
+    tags_by_job = {new_ids[key]: by_key[key][1] for key in new_keys if by_key[key][1]}
+    tags_by_job.update({stored[key].id: by_key[key][1] for key in changed_keys if by_key[key][1]})
+    tags_by_job.update({job_id: merged[job_id][1] for job_id in merged_changed if merged[job_id][1]})
+    replace_job_tags(connection, tags_by_job, tag_cache, copy=copy)
+
+    unchanged = [stored[key].id for key in by_key if key in stored and key not in changed_keys]
+    if mode in ('merge', 'skip'):
+        unchanged += [original for original in matched.values() if original not in merged_changed]
+    result = {
+        'inserted': [new_ids[key] for key in new_keys],
+        'updated': [stored[key].id for key in changed_keys] + merged_changed,
+        'skipped': list(dict.fromkeys(unchanged)),
+        'near_duplicates': list(dict.fromkeys(matched.values())),
+    }
+    add_jobs(connection, result['inserted'] + result['updated'])
+    sync_jobs(connection, changed_ids=result['inserted'] + result['updated'])
+    touch_jobs(connection, result['inserted'] + result['updated'])
+    index_jobs(connection, result['inserted'] + result['updated'])
+    return result
+
+
+def refresh_dedupe_keys(connection, job_ids):
+    """Recomputes dedupe_key after title/company/location were changed by a Core update."""
+    rows = connection.execute(
+        select(jobs.c.id, jobs.c.title, jobs.c.company, jobs.c.location).where(jobs.c.id.in_(job_ids))
+    ).all()
+    if rows:
+        connection.execute(
+            update(jobs).where(jobs.c.id == bindparam('job_id')).values(dedupe_key=bindparam('key')),
+            [{'job_id': r.id, 'key': make_dedupe_key(r.title, r.company, r.location)} for r in rows],
+        )
+
+
+def update_jobs(connection, rows):
+    """Applies partial updates; rows sharing the same set of columns go in one executemany."""
+    groups = {}
+    for row in rows:
+        if row.get('location'):
+            row = {**row, **location_columns(row['location'])}
+        groups.setdefault(tuple(sorted(k for k in row if k != 'id')), []).append(row)
+    for columns, group in groups.items():
+        if not columns:
+            continue
+        statement = (
+            update(jobs)
+            .where(jobs.c.id == bindparam('job_id'))
+            .values({column: bindparam(column) for column in columns})
+        )
+        connection.execute(statement, [
+            {'job_id': row['id'], **{column: row[column] for column in columns}} for row in group
+        ])
+        if {'title', 'company', 'location'} & set(columns):
+            refresh_dedupe_keys(connection, [row['id'] for row in group])
+
+
+def replace_job_tags(connection, tags_by_job, tag_cache, copy=False):
+    """Sets the tag list of each job id in `tags_by_job`, creating tags as needed."""
+    if not tags_by_job:
+        return
+    names = [name for tag_names in tags_by_job.values() for name in tag_names]
+    Tag.resolve(names, cache=tag_cache)
+    db.session.flush()  # assign ids to newly created tags
+
+    connection.execute(delete(job_tags).where(job_tags.c.job_id.in_(list(tags_by_job))))
+    links = {
+        (job_id, tag.id)
+        for job_id, tag_names in tags_by_job.items()
+        for tag in Tag.resolve(tag_names, cache=tag_cache)
+    }
+    links = [{'job_id': j, 'tag_id': t} for j, t in sorted(links)]
+    if links and not (copy and copy_rows(connection, job_tags, links)):
+        connection.execute(insert(job_tags), links)
+
+
+def delete_jobs(connection, job_ids):
+    connection.execute(delete(job_tags).where(job_tags.c.job_id.in_(job_ids)))
+    connection.execute(delete(jobs).where(jobs.c.id.in_(job_ids)))
+
+
+def version_criterion(job_id, versions=None):
+    """jobs.id = job_id, and version IN versions unless `versions` is None (unconditional)."""
+    criterion = jobs.c.id == job_id
+    if versions is not None:
+        criterion = criterion & jobs.c.version.in_(versions)
+    return criterion
+
+
+def locked_job_image(connection, job_id, versions=None):
+    """
+    The job's facet columns, identity columns and tag names, read with a
+    row lock (where the dialect has one) so the facet delta computed from it
+    cannot race another writer. None when no job matches `versions`.
+    """
+    return connection.execute(
+        select(*FACET_COLUMNS, jobs.c.title, jobs.c.company, tag_names_column(jobs.c.id))
+        .where(version_criterion(job_id, versions)).with_for_update()
+    ).first()
+
+
+def image_tags(names):
+    """(slug, name) pairs for count_job() from tag names."""
+    return [(normalize_tag(name), name) for name in names]
+
+
+def update_job_row(connection, job_id, row, tags, tag_cache, versions=None):
+    """
+    Applies a partial update (column dict, tag names or None to keep) to one
+    job. Returns (row, tag names), or None when no job matched `job_id` and
+    `versions`: roll the transaction back then.
+
+    The job is read once (locked_job_image(), which also answers 404/412)
+    and written once: UPDATE ... RETURNING sets the new values, dedupe key,
+    change sequence and version together; dialects without UPDATE ...
+    RETURNING read the row back by id. The facet delta comes from those two
+    images. Replaced tags, the search document and the near-duplicate
+    buckets still take their own statements, so a PUT with tags runs about
+    fifteen statements, all keyed by the job id.
+    """
+    before = locked_job_image(connection, job_id, versions)
+    if before is None:
+        return None
+
+    if row.get('location'):
+        row = {**row, **location_columns(row['location'])}
+    if {'title', 'company', 'location'} & set(row):
+        identity = {name: row.get(name, getattr(before, name)) for name in ('title', 'company', 'location')}
+        row = {**row, 'dedupe_key': make_dedupe_key(identity['title'], identity['company'], identity['location'])}
+
+    statement = update(jobs).where(jobs.c.id == job_id).values(
+        **row, change_seq=next_change_seqs(connection, 1)[0], updated_at=datetime.utcnow(),
+        version=jobs.c.version + 1,
+    )
+    location_key = FACET_COLUMNS[2]
+    if connection.dialect.update_returning:
+        stored = connection.execute(statement.returning(*jobs.c, location_key)).first()
+    else:
+        connection.execute(statement)
+        stored = connection.execute(select(jobs, location_key).where(jobs.c.id == job_id)).first()
+
+    if tags is not None:
+        replace_job_tags(connection, {job_id: tags}, tag_cache)
+        # Same order as the relationship (Tag.slug); resolved from the cache, no query
+        tag_names = [tag.name for tag in sorted(Tag.resolve(tags, cache=tag_cache), key=lambda tag: tag.slug)]
+    else:
+        tag_names = split_tag_names(before.tag_names)
+    apply_change(connection, row_facet_values(before, image_tags(split_tag_names(before.tag_names))),
+                 row_facet_values(stored, image_tags(tag_names)))
+    sync_jobs(connection, changed_ids=[job_id])
+    index_jobs(connection, [job_id])
+    return stored, tag_names
+
+
+def delete_job_row(connection, job_id, versions=None):
+    """
+    Deletes one job. Returns False when no job matched `job_id` and
+    `versions`: roll the transaction back then.
+
+    The locked read that answers 404/412 also supplies the facet values to
+    count out; the tag links and the row are then deleted by id, and the
+    search document, tombstone and near-duplicate buckets follow (about ten
+    statements in all).
+    """
+    before = locked_job_image(connection, job_id, versions)
+    if before is None:
+        return False
+    delete_jobs(connection, [job_id])
+    apply_change(connection, row_facet_values(before, image_tags(split_tag_names(before.tag_names))),
+                 row_facet_values(None))
+    sync_jobs(connection, deleted_ids=[job_id])
+    tombstone_jobs(connection, [job_id])
+    unindex_jobs(connection, [job_id])
+    return True
+
+
+def bulk_write(creates, updates, deletes, chunk_size=500, commit_every=0):
+    """
+    Applies creates, updates and deletes (in that order) in chunked statements.
+    Creates are upserts: an item matching an existing posting's dedupe_key
+    updates that posting instead (or is reported unchanged); near-duplicates
+    are handled per JOBS_NEAR_DUP_MODE.
+
+    creates: list of (column dict, tag names)
+    updates: list of (column dict including 'id', tag names or None to keep)
+    deletes: list of job ids
+    Returns {'created', 'updated', 'unchanged', 'deleted', 'missing', 'near_duplicates'} id lists.
+    """
+    result = {'created': [], 'updated': [], 'unchanged': [], 'deleted': [], 'missing': [], 'near_duplicates': []}
+    tag_cache = {}
+    pending_ids = []
+    uncommitted = 0
+
+    def checkpoint(rows_written, force=False):
+        nonlocal uncommitted
+        uncommitted += rows_written
+        if uncommitted and (force or (commit_every and uncommitted >= commit_every)):
+            db.session.commit()
+            response_cache.invalidate(pending_ids)
+            invalidate_read_model()
+            pending_ids.clear()
+            uncommitted = 0
+
+    try:
+        for chunk in chunked(creates, chunk_size):
+            upserted = upsert_jobs(db.session.connection(), chunk, tag_cache)
+            result['created'].extend(upserted['inserted'])
+            result['updated'].extend(upserted['updated'])
+            result['unchanged'].extend(upserted['skipped'])
+            result['near_duplicates'].extend(upserted['near_duplicates'])
+            pending_ids.extend(upserted['updated'])
+            checkpoint(len(chunk))
+
+        for chunk in chunked(updates, chunk_size):
+            connection = db.session.connection()
+            found = existing_job_ids(connection, [row['id'] for row, _ in chunk])
+            result['missing'].extend(row['id'] for row, _ in chunk if row['id'] not in found)
+            chunk = [(row, tags) for row, tags in chunk if row['id'] in found]
+            ids = [row['id'] for row, _ in chunk]
+            subtract_jobs(connection, ids)
+            update_jobs(connection, [row for row, _ in chunk])
+            replace_job_tags(connection, {row['id']: tags for row, tags in chunk if tags is not None}, tag_cache)
+            add_jobs(connection, ids)
+            sync_jobs(connection, changed_ids=ids)
+            touch_jobs(connection, ids)
+            index_jobs(connection, ids)
+            result['updated'].extend(ids)
+            pending_ids.extend(ids)
+            checkpoint(len(chunk))
+
+        for chunk in chunked(deletes, chunk_size):
+            connection = db.session.connection()
+            found = existing_job_ids(connection, chunk)
+            result['missing'].extend(job_id for job_id in chunk if job_id not in found)
+            ids = [job_id for job_id in chunk if job_id in found]
+            if ids:
+                subtract_jobs(connection, ids)
+                delete_jobs(connection, ids)
+                sync_jobs(connection, deleted_ids=ids)
+                tombstone_jobs(connection, ids)
+                unindex_jobs(connection, ids)
+            result['deleted'].extend(ids)
+            pending_ids.extend(ids)
+            checkpoint(len(ids))
+
+        checkpoint(0, force=True)
+    except Exception:
+        db.session.rollback()
+        raise
+    return result
@@ -0,0 +1,271 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from flask import Response, jsonify, request
+
+from coalesce import Overloaded, single_flight
+from compression import CACHED_LEVELS, ENCODINGS, compress, compressible, negotiate, set_encoding_headers
+from db import db
+from sync import current_token
+
+try:
+    import redis
+except ImportError:  # optional, only needed for JOBS_CACHE_BACKEND=redis
+    redis = None
+
+# Read-path response cache for the jobs blueprint.
+#
+# Entries hold the serialized JSON body plus its strong ETag. Single-job
+# entries are keyed by id and dropped when that job changes. List entries
+# are keyed by the normalized query args under a "generation" number; any
+# write bumps the generation, which retires every list page at once (a new
+# or edited job can enter any filtered list). Stale generations simply age
+# out through the backend's LRU/TTL eviction. Compressed variants of a body
+# are cached under "<key>|<encoding>" and retired together with it.
+#
+# A local backend only sees invalidate() calls made in its own process.
+# Writers elsewhere (`flask jobs import`, `flask jobs archive`, a scraper run
+# from the CLI) are noticed through the change sequence in the database
+# (sync.py), which every job write advances: at most once every
+# JOBS_CACHE_MAX_LAG seconds a read compares it with the last value seen and,
+# if it moved, drops every cached entry. The Redis backend is shared, so
+# invalidate() calls from any process reach it directly.
+#
+# Misses go through coalesce.single_flight: identical concurrent requests
+# share one build, and requests past its limits get 429 with Retry-After.
+
+
+class LocalBackend:
+    """In-process LRU cache with per-entry TTL. Thread-safe."""
+
+    shared = False
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def counter(self, key):
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend:
+    """
+    Shared cache on any Redis-protocol server (Redis, Valkey, KeyDB, a local
+    stand-in...). Eviction is left to the server's maxmemory-policy plus TTLs.
+    Shared state also lets the scraper process invalidate the API's cache.
+    """
+
+    shared = True
+
+    def __init__(self, client, ttl=300, prefix='jobs-cache:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        etag, _, body = raw.partition(b'\n')
+        return etag.decode('ascii'), body
+
+    def set(self, key, value):
+        etag, body = value
+        self.client.set(self.prefix + key, etag.encode('ascii') + b'\n' + body, ex=self.ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*[self.prefix + key for key in keys])
+
+    def counter(self, key):
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+
+class ResponseCache:
+    """Caches JSON responses with strong ETags; answers If-None-Match with 304."""
+
+    GENERATION_KEY = 'generation'
+
+    def __init__(self, backend=None, max_lag=1.0):
+        self.backend = backend
+        self.max_lag = max_lag
+        self.token = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app, backend=None):
+        if backend is None:
+            backend = self._backend_from_config(app.config)
+        self.backend = backend
+        self.max_lag = app.config.get('JOBS_CACHE_MAX_LAG', 1.0)
+        self.token = None
+        self.checked_at = 0.0
+        app.extensions['jobs_response_cache'] = self
+
+    @staticmethod
+    def _backend_from_config(config):
+        kind = config.get('JOBS_CACHE_BACKEND', 'local')
+        ttl = config.get('JOBS_CACHE_TTL', 300)
+        if kind == 'none':
+            return None
+        if kind == 'redis':
+            if redis is None:
+                raise RuntimeError("JOBS_CACHE_BACKEND=redis requires the 'redis' package.")
+            return RedisBackend(redis.Redis.from_url(config['JOBS_CACHE_REDIS_URL']), ttl=ttl)
+        return LocalBackend(max_entries=config.get('JOBS_CACHE_MAX_ENTRIES', 1024), ttl=ttl)
+
+    @staticmethod
+    def normalize_args(args):
+        """Stable key for a query string: order of parameters does not matter."""
+        items = args.items(multi=True) if hasattr(args, 'getlist') else args.items()
+        return urlencode(sorted(items))
+
+    def follow_writes(self):
+        """
+        Drops a local backend's entries once the change sequence shows a
+        write from any process since the last check (at most every max_lag
+        seconds). Needs an app context.
+        """
+        if not self.backend or self.backend.shared:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self.checked_at < self.max_lag:
+                return
+            self.checked_at = now
+        token = current_token(db.session.connection())
+        with self._lock:
+            moved = self.token is not None and token != self.token
+            self.token = token
+        if moved:
+            single_flight.bump_epoch()
+            self.backend.clear()
+            self.backend.incr(self.GENERATION_KEY)
+
+    def list_key(self, namespace, args):
+        self.follow_writes()
+        generation = self.backend.counter(self.GENERATION_KEY) if self.backend else 0
+        return f'{namespace}:g{generation}:{self.normalize_args(args)}'
+
+    @staticmethod
+    def job_key(job_id):
+        return f'job:{job_id}'
+
+    @staticmethod
+    def variant_key(key, encoding):
+        return f'{key}|{encoding}'
+
+    def respond(self, key, build):
+        """
+        Returns a conditional response for `key`, calling `build()` on a miss.
+        `build` returns a (Response, status) pair; only 200 responses are cached.
+        Concurrent misses on the same key share one `build()` call.
+        Clients accepting gzip/br get the compressed variant, which is cached
+        next to the body so each body is compressed at most once.
+        """
+        self.follow_writes()
+        cached = self.backend.get(key) if self.backend else None
+        if cached is None:
+            try:
+                status, mimetype, etag, body, stored = single_flight.run(key, lambda: self._build(key, build))
+            except Overloaded as e:
+                response = jsonify({"error": str(e)})
+                response.headers['Retry-After'] = str(e.retry_after)
+                return response, 429
+            if status != 200:
+                return Response(body, mimetype=mimetype), status
+        else:
+            etag, body = cached
+            stored = True
+
+        encoding = negotiate() if compressible(len(body)) else None
+        if encoding:
+            variant = self.backend.get(self.variant_key(key, encoding)) if stored else None
+            if variant is None:
+                level = CACHED_LEVELS[encoding] if stored else None
+                variant = (f'{etag}-{encoding}', compress(body, encoding, level))
+                if stored:
+                    self.backend.set(self.variant_key(key, encoding), variant)
+            etag, body = variant
+
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('Accept-Encoding')
+        if encoding:
+            set_encoding_headers(response, encoding)
+        return response.make_conditional(request)
+
+    def _build(self, key, build):
+        """Runs `build` and caches a 200 body -> (status, mimetype, ETag or None, body, whether it was cached)."""
+        generation = self.backend.counter(self.GENERATION_KEY) if self.backend else None
+        response, status = build()
+        body = response.get_data()
+        if status != 200:
+            return status, response.mimetype, None, body, False
+        # Skip storing if a write landed while we were reading: the body may be stale
+        stored = bool(self.backend) and self.backend.counter(self.GENERATION_KEY) == generation
+        # A strong ETag set by `build` (a job's version) is kept, else the body is hashed
+        etag = response.get_etag()[0] or hashlib.sha256(body).hexdigest()[:32]
+        if stored:
+            self.backend.set(key, (etag, body))
+        return status, response.mimetype, etag, body, stored
+
+    def invalidate(self, job_ids=()):
+        """Drops the entries for the given jobs and retires all cached list pages."""
+        single_flight.bump_epoch()
+        if not self.backend:
+            return
+        self.backend.incr(self.GENERATION_KEY)
+        keys = [self.job_key(job_id) for job_id in job_ids]
+        self.backend.delete(*keys, *[self.variant_key(key, encoding) for key in keys for encoding in ENCODINGS])
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,131 @@
+import copy
+import threading
+
+from metrics import endpoint_label, registry
+
+# Single-flight coalescing for cached reads (ResponseCache.respond).
+#
+# On a cache miss, the first request for a key becomes the flight's leader
+# and runs the query and serialization; identical requests arriving while it
+# runs wait for its result instead of running their own. The result is the
+# finished body, so a burst of GET /jobs/ right after a feed update costs one
+# query and one serialization. Keys carry a local write epoch: a request that
+# starts after a write in this process never joins a flight started before it.
+#
+# Load shedding: at most JOBS_COALESCE_MAX_INFLIGHT distinct keys are built
+# at once and at most JOBS_COALESCE_MAX_WAITING requests wait on flights;
+# past either limit, or after waiting JOBS_COALESCE_TIMEOUT seconds, a
+# request raises Overloaded, answered with 429 and Retry-After. Coalesced and
+# shed requests are counted in /metrics. Flights are per process.
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot start or join a flight; answer with 429."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Flight:
+    """One in-flight build; followers wait on `done`."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def follower_error(error):
+    """
+    A fresh copy of the leader's exception for one follower, so concurrent
+    callers never raise (and append tracebacks to) the same object. Chained
+    to the original with `from`.
+    """
+    try:
+        return copy.copy(error)
+    except Exception:  # constructor signature the copy protocol can't replay
+        return RuntimeError(f"An identical in-flight request failed: {error!r}")
+
+
+class SingleFlight:
+    """Runs one build per key at a time and hands its result to concurrent callers. Thread-safe."""
+
+    def __init__(self, enabled=True, max_inflight=64, max_waiting=256, timeout=10.0, retry_after=1):
+        self.enabled = enabled
+        self.max_inflight = max_inflight
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.epoch = 0
+        self._flights = {}  # key -> Flight
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        config = app.config
+        self.enabled = config.get('JOBS_COALESCE', True)
+        self.max_inflight = config.get('JOBS_COALESCE_MAX_INFLIGHT', 64)
+        self.max_waiting = config.get('JOBS_COALESCE_MAX_WAITING', 256)
+        self.timeout = config.get('JOBS_COALESCE_TIMEOUT', 10.0)
+        self.retry_after = config.get('JOBS_COALESCE_RETRY_AFTER', 1)
+        app.extensions['jobs_single_flight'] = self
+
+    def bump_epoch(self):
+        """Called on every write: later requests start new flights instead of joining older ones."""
+        with self._lock:
+            self.epoch += 1
+
+    def shed(self, message):
+        registry.shed_requests.inc(endpoint_label())
+        return Overloaded(message, self.retry_after)
+
+    def run(self, key, build):
+        """
+        Returns build()'s result, computed by this caller or by a concurrent
+        caller with the same key. An exception raised by the leader's build is
+        raised in every waiting caller too, each getting its own copy. Raises
+        Overloaded when shedding.
+        """
+        if not self.enabled:
+            return build()
+
+        with self._lock:
+            key = f'{key}#e{self.epoch}'
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                if len(self._flights) >= self.max_inflight:
+                    raise self.shed("Too many queries in flight; retry shortly.")
+                flight = self._flights[key] = Flight()
+            else:
+                if self._waiting >= self.max_waiting:
+                    raise self.shed("Too many requests waiting; retry shortly.")
+                self._waiting += 1
+
+        if leader:
+            try:
+                flight.result = build()
+            except Exception as e:
+                flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+            return flight.result
+
+        try:
+            finished = flight.done.wait(self.timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if not finished:
+            raise self.shed("Timed out waiting for an identical request; retry shortly.")
+        registry.coalesced_requests.inc(endpoint_label())
+        if flight.error is not None:
+            raise follower_error(flight.error) from flight.error
+        return flight.result
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,150 @@
+import time
+import click
+from flask.cli import AppGroup
+
+# Maintenance commands, available as `flask jobs <command>` (FLASK_APP=app.py)
+jobs_cli = AppGroup('jobs', help='Job board maintenance commands.')
+
+
+@jobs_cli.command('explain-check')
+@click.option('--verbose', '-v', is_flag=True, help='Print every checked query shape.')
+def explain_check(verbose):
+    """Fails if any list filter/sort combination needs a full scan or a filesort."""
+    from explain_check import run_explain_check
+
+    failures = run_explain_check(verbose=verbose)
+    for label, sql, problems in failures:
+        click.echo(f"❌ {label}", err=True)
+        for problem in problems:
+            click.echo(f"   {problem}", err=True)
+        click.echo(f"   {sql}", err=True)
+    if failures:
+        raise SystemExit(1)
+    click.echo("✅ Every list query shape is index-backed")
+
+
+@jobs_cli.command('reindex-search')
+def reindex_search():
+    """Rebuilds the full-text search index from the jobs table."""
+    from search import rebuild_search_index
+
+    click.echo(f"✅ Search index rebuilt for {rebuild_search_index()} jobs")
+
+
+@jobs_cli.command('rebuild-facets')
+def rebuild_facets():
+    """Recounts the facet_counts aggregates from the jobs table."""
+    from db import db
+    from facets import rebuild_facet_counts
+
+    rows = rebuild_facet_counts(db.session.connection())
+    db.session.commit()
+    click.echo(f"✅ Facet counts rebuilt ({rows} values)")
+
+
+@jobs_cli.command('reindex-near-duplicates')
+def reindex_near_duplicates():
+    """Recomputes the MinHash buckets used to find near-duplicate postings."""
+    from db import db
+    from near_duplicates import rebuild_near_duplicate_index
+
+    total = rebuild_near_duplicate_index(db.session.connection())
+    db.session.commit()
+    click.echo(f"✅ Near-duplicate index rebuilt for {total} jobs")
+
+
+@jobs_cli.command('prune-tombstones')
+@click.option('--days', type=int, default=None, help='Age in days (default JOBS_TOMBSTONE_RETENTION_DAYS).')
+def prune_tombstones_command(days):
+    """Drops old delete markers; sync tokens from before them then get 410 and must refetch."""
+    from flask import current_app
+    from db import db
+    from sync import prune_tombstones
+
+    if days is None:
+        days = current_app.config['JOBS_TOMBSTONE_RETENTION_DAYS']
+    removed = prune_tombstones(db.session.connection(), days)
+    db.session.commit()
+    click.echo(f"✅ Pruned {removed} tombstones older than {days} days")
+
+
+@jobs_cli.command('archive')
+@click.option('--days', type=int, default=None, help='Posting age in days (default JOBS_RETENTION_DAYS).')
+@click.option('--batch-size', type=int, default=None, help='Jobs per commit (default JOBS_ARCHIVE_BATCH_SIZE).')
+@click.option('--pause', type=float, default=None,
+              help='Seconds between batches (default JOBS_ARCHIVE_PAUSE_SECONDS).')
+@click.option('--max-batches', type=int, default=None, help='Stop after this many batches.')
+@click.option('--dry-run', is_flag=True, help='Only count the expired jobs.')
+def archive_command(days, batch_size, pause, max_batches, dry_run):
+    """Moves jobs past the retention period into jobs_archive, in small committed batches."""
+    from flask import current_app
+    from db import db
+    from archive import archive_expired, count_expired, retention_cutoff
+
+    config = current_app.config
+    if days is None:
+        days = config['JOBS_RETENTION_DAYS']
+    if days <= 0:
+        click.echo("❌ No retention period: pass --days or set JOBS_RETENTION_DAYS.", err=True)
+        raise SystemExit(1)
+    if dry_run:
+        expired = count_expired(db.session.connection(), retention_cutoff(days))
+        click.echo(f"{expired} jobs are older than {days} days")
+        return
+
+    started = time.perf_counter()
+    archived = archive_expired(
+        days,
+        batch_size=batch_size or config['JOBS_ARCHIVE_BATCH_SIZE'],
+        pause=config['JOBS_ARCHIVE_PAUSE_SECONDS'] if pause is None else pause,
+        max_batches=max_batches,
+        progress=lambda total: click.echo(f"  {total} jobs archived", err=True),
+    )
+    click.echo(f"✅ Archived {archived} jobs older than {days} days in {time.perf_counter() - started:.1f}s")
+
+
+@jobs_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), default=None,
+              help='Feed format (default: from the file extension; .gz files are decompressed).')
+@click.option('--batch-size', type=int, default=None, help='Records per commit (default JOBS_IMPORT_BATCH_SIZE).')
+@click.option('--near-duplicates', type=click.Choice(['off', 'flag', 'merge', 'skip']), default=None,
+              help='Near-duplicate handling (default JOBS_NEAR_DUP_MODE).')
+@click.option('--restart', is_flag=True, help='Ignore a saved position and import the file from the start.')
+@click.option('--state-file', type=click.Path(dir_okay=False), default=None,
+              help='Where to keep the resume position (default: <path>.import-state).')
+def import_jobs_command(path, fmt, batch_size, near_duplicates, restart, state_file):
+    """Streams a CSV/NDJSON job feed into the database, resuming an interrupted import."""
+    from flask import current_app
+    from importer import ImportStateMismatch, run_import
+
+    def progress(counts, elapsed):
+        click.echo(f"  {counts['records']} records: {counts['inserted']} new, {counts['updated']} updated, "
+                   f"{counts['skipped']} unchanged, {counts['invalid']} invalid "
+                   f"({(counts['records'] - counts['resumed_at']) / elapsed if elapsed else 0:.0f} records/s)",
+                   err=True)
+
+    def errors(number, messages):
+        click.echo(f"  record {number}: {' '.join(messages)}", err=True)
+
+    try:
+        counts = run_import(
+            path, fmt=fmt, batch_size=batch_size or current_app.config['JOBS_IMPORT_BATCH_SIZE'],
+            restart=restart, state_path=state_file, near_duplicate_mode=near_duplicates,
+            progress=progress, errors=errors,
+        )
+    except (ImportStateMismatch, ValueError) as e:
+        click.echo(f"❌ {e}", err=True)
+        raise SystemExit(1)
+    except Exception as e:
+        click.echo(f"❌ Import stopped: {e}. Run the command again to resume after the last committed batch.",
+                   err=True)
+        raise SystemExit(1)
+
+    if counts['resumed_at']:
+        click.echo(f"Resumed after record {counts['resumed_at']}")
+    imported = counts['records'] - counts['resumed_at']
+    click.echo(f"✅ Imported {path}: {counts['records']} records, {counts['inserted']} new, "
+               f"{counts['updated']} updated, {counts['skipped']} unchanged, "
+               f"{counts['near_duplicates']} near-duplicates, {counts['invalid']} invalid "
+               f"in {counts['seconds']:.1f}s ({imported / counts['seconds'] if counts['seconds'] else 0:.0f} records/s)")
@@ -0,0 +1,121 @@
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:  # optional, only needed to serve Content-Encoding: br
+        brotli = None
+
+# Content-Encoding negotiation for the jobs blueprint.
+#
+# negotiate() picks br (when a brotli module is installed) or gzip from the
+# request's Accept-Encoding. Whole bodies are compressed with compress();
+# streamed exports go through compress_stream(), which flushes after every
+# chunk so clients keep receiving rows as they are produced. Cached responses
+# keep their compressed variants next to the plain body (see
+# ResponseCache.respond), so hot pages are compressed once per write.
+
+# Preference order when the client accepts several encodings equally
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# Bodies compressed once and cached can afford a slower, denser setting
+CACHED_LEVELS = {'br': 9, 'gzip': 9}
+STREAM_LEVELS = {'br': 4, 'gzip': 6}
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS  # zlib stream with a gzip header/trailer
+
+
+def parse_accept_encoding(header):
+    """Returns {coding: q} from an Accept-Encoding header value."""
+    accepted = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header=None):
+    """The best encoding both sides support for the current request, or None for identity."""
+    if header is None:
+        header = request.headers.get('Accept-Encoding', '')
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for coding in ENCODINGS:
+        q = accepted.get(coding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compressible(body_size):
+    return current_app.config.get('JOBS_COMPRESSION', True) and body_size >= current_app.config.get('JOBS_COMPRESS_MIN_SIZE', 1024)
+
+
+def compress(body, encoding, level=None):
+    if encoding == 'br':
+        return brotli.compress(body, quality=level if level is not None else STREAM_LEVELS['br'])
+    compressor = zlib.compressobj(level if level is not None else STREAM_LEVELS['gzip'], zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    """Compresses an iterable of str/bytes chunks, flushing after each so output is not held back."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=STREAM_LEVELS['br'])
+        for chunk in chunks:
+            data = compressor.process(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            data += compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(STREAM_LEVELS['gzip'], zlib.DEFLATED, GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        data += compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def set_encoding_headers(response, encoding):
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+
+
+def compress_response(response):
+    """
+    after_request hook: compresses buffered JSON responses the client can
+    decode. Streamed and already-encoded responses are left alone.
+    """
+    if response.is_streamed or 'Content-Encoding' in response.headers or response.status_code in (204, 304):
+        return response
+    if response.mimetype != 'application/json':
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate()
+    body = response.get_data()
+    if encoding is None or not compressible(len(body)):
+        return response
+    response.set_data(compress(body, encoding))
+    set_encoding_headers(response, encoding)
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak=weak)
+    return response
@@ -8,3 +8,90 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey")
 
+    # Apply pending migrations on startup; turn off to run `flask db upgrade` as a deploy step
+    AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "1") == "1"
+
+    # Keyset pagination for GET /jobs/ (?limit=&cursor=)
+    JOBS_PAGE_SIZE = int(os.getenv("JOBS_PAGE_SIZE", "50"))
+    JOBS_MAX_PAGE_SIZE = int(os.getenv("JOBS_MAX_PAGE_SIZE", "500"))
+
+    # GET /jobs/facets: values listed per facet by default (?facet_limit=) and its cap
+    JOBS_FACET_LIMIT = int(os.getenv("JOBS_FACET_LIMIT", "50"))
+    JOBS_MAX_FACET_LIMIT = int(os.getenv("JOBS_MAX_FACET_LIMIT", "1000"))
+
+    # Instrumentation: /metrics, slow-query log threshold, N+1 detection
+    # (a statement repeated more than N times per request; RAISE=1 is for tests)
+    JOBS_METRICS_ENABLED = os.getenv("JOBS_METRICS_ENABLED", "1") == "1"
+    JOBS_SLOW_QUERY_MS = float(os.getenv("JOBS_SLOW_QUERY_MS", "200"))
+    JOBS_N_PLUS_ONE_THRESHOLD = int(os.getenv("JOBS_N_PLUS_ONE_THRESHOLD", "10"))
+    JOBS_N_PLUS_ONE_RAISE = os.getenv("JOBS_N_PLUS_ONE_RAISE", "0") == "1"
+
+    # Encoder for list responses: "auto" (orjson if installed), "orjson" or "json"
+    JOBS_JSON_ENCODER = os.getenv("JOBS_JSON_ENCODER", "auto")
+
+    # gzip/br for clients that accept it; smaller bodies are sent uncompressed
+    JOBS_COMPRESSION = os.getenv("JOBS_COMPRESSION", "1") == "1"
+    JOBS_COMPRESS_MIN_SIZE = int(os.getenv("JOBS_COMPRESS_MIN_SIZE", "1024"))  # bytes
+
+    # Background scrapes started with POST /scrape/: sources as "name=start_url,name=start_url"
+    JOBS_SCRAPE_SOURCES = os.getenv("JOBS_SCRAPE_SOURCES", "actuarylist=https://www.actuarylist.com/")
+    JOBS_SCRAPE_FETCHER = os.getenv("JOBS_SCRAPE_FETCHER", "browser")  # or "static" (no JavaScript)
+    JOBS_SCRAPE_MAX_RUNS = int(os.getenv("JOBS_SCRAPE_MAX_RUNS", "2"))  # runs executing at once
+    JOBS_SCRAPE_KEEP_RUNS = int(os.getenv("JOBS_SCRAPE_KEEP_RUNS", "50"))  # finished runs kept for polling
+    JOBS_SCRAPE_LIMIT = int(os.getenv("JOBS_SCRAPE_LIMIT", "100"))
+    JOBS_SCRAPE_MAX_LIMIT = int(os.getenv("JOBS_SCRAPE_MAX_LIMIT", "1000"))
+    JOBS_SCRAPE_WORKERS = int(os.getenv("JOBS_SCRAPE_WORKERS", "4"))
+    JOBS_SCRAPE_MAX_WORKERS = int(os.getenv("JOBS_SCRAPE_MAX_WORKERS", "8"))
+
+    # Rows fetched per server-side batch by GET /jobs/export
+    JOBS_EXPORT_BATCH_SIZE = int(os.getenv("JOBS_EXPORT_BATCH_SIZE", "1000"))
+    JOBS_IMPORT_BATCH_SIZE = int(os.getenv("JOBS_IMPORT_BATCH_SIZE", "1000"))  # `flask jobs import`, rows per commit
+
+    # Response cache for list/detail reads: "local" (in-process LRU), "redis" or "none"
+    JOBS_CACHE_BACKEND = os.getenv("JOBS_CACHE_BACKEND", "local")
+    JOBS_CACHE_MAX_ENTRIES = int(os.getenv("JOBS_CACHE_MAX_ENTRIES", "1024"))
+    JOBS_CACHE_TTL = int(os.getenv("JOBS_CACHE_TTL", "300"))  # seconds
+    JOBS_CACHE_REDIS_URL = os.getenv("JOBS_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    # "local" only: how often (seconds) to check the database for writes made by other processes
+    JOBS_CACHE_MAX_LAG = float(os.getenv("JOBS_CACHE_MAX_LAG", "1"))
+
+    # Cache misses: identical concurrent requests share one query (coalesce.py). Past
+    # MAX_INFLIGHT distinct queries or MAX_WAITING waiting requests, or after TIMEOUT
+    # seconds of waiting, requests get 429 with Retry-After: RETRY_AFTER seconds
+    JOBS_COALESCE = os.getenv("JOBS_COALESCE", "1") == "1"
+    JOBS_COALESCE_MAX_INFLIGHT = int(os.getenv("JOBS_COALESCE_MAX_INFLIGHT", "64"))
+    JOBS_COALESCE_MAX_WAITING = int(os.getenv("JOBS_COALESCE_MAX_WAITING", "256"))
+    JOBS_COALESCE_TIMEOUT = float(os.getenv("JOBS_COALESCE_TIMEOUT", "10"))
+    JOBS_COALESCE_RETRY_AFTER = int(os.getenv("JOBS_COALESCE_RETRY_AFTER", "1"))
+
+    # POST /jobs/bulk: rows per statement, rows per transaction (0 = one per request), request cap
+    JOBS_BULK_CHUNK_SIZE = int(os.getenv("JOBS_BULK_CHUNK_SIZE", "500"))
+    JOBS_BULK_COMMIT_EVERY = int(os.getenv("JOBS_BULK_COMMIT_EVERY", "0"))
+    JOBS_BULK_MAX_ITEMS = int(os.getenv("JOBS_BULK_MAX_ITEMS", "50000"))
+
+    # Delta sync (GET /jobs/changes, /jobs/changes/stream): SSE poll interval,
+    # connection lifetime before the client reconnects, keep-alive interval, and
+    # tombstone age removed by `flask jobs prune-tombstones`
+    JOBS_SYNC_POLL_SECONDS = float(os.getenv("JOBS_SYNC_POLL_SECONDS", "1"))
+    JOBS_SYNC_STREAM_SECONDS = int(os.getenv("JOBS_SYNC_STREAM_SECONDS", "300"))
+    JOBS_SYNC_HEARTBEAT_SECONDS = int(os.getenv("JOBS_SYNC_HEARTBEAT_SECONDS", "15"))
+    JOBS_TOMBSTONE_RETENTION_DAYS = int(os.getenv("JOBS_TOMBSTONE_RETENTION_DAYS", "30"))
+
+    # Retention (archive.py): postings older than RETENTION_DAYS by posting_date move to
+    # jobs_archive (0 = keep everything), BATCH_SIZE rows per commit with PAUSE seconds
+    # between batches; INTERVAL > 0 also archives every INTERVAL seconds in the background
+    JOBS_RETENTION_DAYS = int(os.getenv("JOBS_RETENTION_DAYS", "0"))
+    JOBS_ARCHIVE_BATCH_SIZE = int(os.getenv("JOBS_ARCHIVE_BATCH_SIZE", "500"))
+    JOBS_ARCHIVE_PAUSE_SECONDS = float(os.getenv("JOBS_ARCHIVE_PAUSE_SECONDS", "0.5"))
+    JOBS_ARCHIVE_INTERVAL_SECONDS = int(os.getenv("JOBS_ARCHIVE_INTERVAL_SECONDS", "0"))
+
+    # Near-duplicate postings at ingest (bulk upserts, scraper): "flag" (insert with
+    # duplicate_of set), "merge" (update the matched job), "skip" or "off"; and the
+    # word-set similarity from which two postings count as the same
+    JOBS_NEAR_DUP_MODE = os.getenv("JOBS_NEAR_DUP_MODE", "flag")
+    JOBS_NEAR_DUP_THRESHOLD = float(os.getenv("JOBS_NEAR_DUP_THRESHOLD", "0.8"))
+
+    # In-memory read model answering GET /jobs/ without a database round-trip
+    # (read_model.py); writes from other processes show up after MAX_LAG seconds
+    JOBS_READ_MODEL = os.getenv("JOBS_READ_MODEL", "0") == "1"
+    JOBS_READ_MODEL_MAX_LAG = float(os.getenv("JOBS_READ_MODEL_MAX_LAG", "1"))
@@ -1,10 +1,15 @@
 import os
 from dotenv import load_dotenv
+from flask_migrate import Migrate, upgrade
 from flask_sqlalchemy import SQLAlchemy
 
 load_dotenv()
 
 db = SQLAlchemy()
+migrate = Migrate()
+
+# Alembic revisions (backend/migrations/versions); `flask db upgrade` applies them
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
 
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///jobs.db")
@@ -14,13 +19,22 @@ class Config:
 
 def init_db(app):
     db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR)
 
     # Import models here, **after db is initialized**
     from model.job import Job
+    from model.archive import JobArchive
+    from model.tag import Tag
+    from model.facet import FacetCount
+    from model.near_duplicate import JobMinhashBucket
+    from model.sync import JobTombstone, SyncCounter
 
+    if not app.config.get('AUTO_MIGRATE', True):
+        return
     with app.app_context():
         try:
-            db.create_all()
-            print("✅ Database tables created (if not exist)")
+            upgrade(directory=MIGRATIONS_DIR)
+            print("✅ Database schema up to date")
         except Exception as e:
-            print(f"❌ Database creation failed: {e}")
+            db.session.rollback()
+            print(f"❌ Database migration failed: {e}")
@@ -0,0 +1,174 @@
+import itertools
+import json
+import re
+from sqlalchemy import select, text
+from werkzeug.datastructures import MultiDict
+from db import db
+from facets import FACETS, facet_count_query
+from routes.job_routes import JOB_FIELDS, SORT_MODES, apply_cursor, apply_filters, apply_sorting, pack_cursor, without_facet_filter
+
+# EXPLAIN-based guard for the GET /jobs/ query shapes.
+#
+# Builds the list query for every combination of supported filters, sort
+# modes and first/next page, asks the database for its plan and reports any
+# plan that reads a whole table or sorts rows outside an index. Run it
+# against a database with representative data (cost-based planners pick
+# sequential scans on near-empty tables); see `flask jobs explain-check`.
+#
+# Tag filters are driven by the job_tags (tag_id, job_id) index, which has no
+# posting_date/title to order by, so those shapes may sort their matches; a
+# full scan is still a failure for them. A ?location= substring cannot seek
+# an index either: it is checked on the rows another index yields, so with
+# tags it may sort too, and a facet count filtered by nothing else may scan
+# (?location_exact= is served by the lower(location) indexes). Filtered GET
+# /jobs/facets counts are otherwise checked for full scans only (grouping
+# the matched rows is expected).
+
+FILTER_ARGS = {
+    'job_type': {'job_type': 'Full-time'},
+    'location': {'location': 'Remote'},
+    'location_exact': {'location_exact': 'Remote'},
+    'country': {'country': 'US'},
+    'city': {'city': 'London'},
+    'remote': {'remote': 'true'},
+}
+TAG_ARGS = [{}, {'tag': 'python'}, {'tag': ['python', 'sql'], 'tag_mode': 'all'}]
+# Sample keyset positions for the "next page" variant of each sort column
+CURSOR_VALUES = {'posting_date': '2024-01-01', 'title': 'M'}
+PAGE_SIZE = 50
+# Filters no index can seek (substring matches)
+UNSEEKABLE_FILTERS = ('location',)
+
+
+def query_shapes():
+    """Yields (label, args) for every filter subset x sort mode x page."""
+    filter_sets = [
+        combo for size in range(len(FILTER_ARGS) + 1)
+        for combo in itertools.combinations(FILTER_ARGS, size)
+    ]
+    for names, tag_args, sort_mode, paged in itertools.product(filter_sets, TAG_ARGS, SORT_MODES, (False, True)):
+        args = MultiDict({'sort': sort_mode, **tag_args})
+        for name in names:
+            args.update(FILTER_ARGS[name])
+        if paged:
+            args['cursor'] = pack_cursor(sort_mode, CURSOR_VALUES[SORT_MODES[sort_mode][0]], 1)
+        label = ' '.join(f'{k}={v}' for k, v in args.items(multi=True) if k != 'cursor') + (' +cursor' if paged else '')
+        yield label, args
+
+
+def facet_shapes():
+    """Yields (label, args, facet) for every filtered facet count GET /jobs/facets can run."""
+    seen = set()
+    for label, args in query_shapes():
+        if args.get('cursor'):
+            continue
+        for facet in FACETS:
+            facet_args = without_facet_filter(args, facet)
+            key = (facet, tuple(sorted((k, v) for k, v in facet_args.items(multi=True) if k != 'sort')))
+            if key in seen or len(key[1]) == 0:
+                continue
+            seen.add(key)
+            yield f"facet={facet} " + ' '.join(f'{k}={v}' for k, v in key[1]), facet_args, facet
+
+
+def list_statement(args):
+    query = apply_sorting(apply_filters(select(*JOB_FIELDS.values()), args), args)
+    if args.get('cursor'):
+        query = apply_cursor(query, args, args['cursor'])
+    return query.limit(PAGE_SIZE)
+
+
+def compile_sql(statement, dialect):
+    return str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True, 'render_postcompile': True}))
+
+
+# --- Per-dialect plan inspection: each returns a list of problems ---
+
+def sqlite_problems(connection, sql):
+    problems = []
+    for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"):
+        detail = row[-1]
+        if re.match(r'SCAN \w+$', detail):  # "SCAN jobs" without "USING ... INDEX"
+            problems.append(f"full scan: {detail}")
+        elif 'TEMP B-TREE FOR' in detail and 'ORDER BY' in detail:
+            problems.append(f"filesort: {detail}")
+    return problems
+
+
+def postgresql_problems(connection, sql):
+    # Make the planner prefer any usable index, so a remaining Seq Scan / Sort means there is none
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    connection.execute(text("SET LOCAL enable_sort = off"))
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    problems = []
+    pending = [plan[0]['Plan']]
+    while pending:
+        node = pending.pop()
+        if node['Node Type'] == 'Seq Scan':
+            problems.append(f"full scan: Seq Scan on {node.get('Relation Name')}")
+        elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+            problems.append(f"filesort: {node['Node Type']} on {', '.join(node.get('Sort Key', []))}")
+        pending.extend(node.get('Plans', []))
+    return problems
+
+
+def mysql_problems(connection, sql):
+    problems = []
+    for row in connection.exec_driver_sql(f"EXPLAIN {sql}").mappings():
+        if row['type'] == 'ALL':
+            problems.append(f"full scan: table {row['table']}")
+        if 'Using filesort' in (row['Extra'] or ''):
+            problems.append(f"filesort: table {row['table']}")
+    return problems
+
+
+PLAN_CHECKS = {
+    'sqlite': sqlite_problems,
+    'postgresql': postgresql_problems,
+    'mysql': mysql_problems,
+    'mariadb': mysql_problems,
+}
+
+
+def run_explain_check(verbose=False):
+    """
+    EXPLAINs every supported list query shape. Returns a list of
+    (label, sql, problems) for the shapes whose plan is not index-backed.
+    Must be called inside an app context.
+    """
+    dialect = db.engine.dialect
+    check = PLAN_CHECKS.get(dialect.name)
+    if check is None:
+        raise RuntimeError(f"EXPLAIN check is not supported on '{dialect.name}'.")
+
+    def seekable(args):
+        return any(args.get(name) for name in FILTER_ARGS if name not in UNSEEKABLE_FILTERS)
+
+    # (label, statement, may sort, may scan)
+    shapes = [
+        (label, list_statement(args), bool(args.get('tag') and not seekable(args)), False)
+        for label, args in query_shapes()
+    ]
+    shapes += [
+        (label, facet_count_query(facet, lambda query, args=args: apply_filters(query, args)), True,
+         not seekable(args) and not args.get('tag'))
+        for label, args, facet in facet_shapes()
+    ]
+
+    failures = []
+    for label, statement, may_sort, may_scan in shapes:
+        sql = compile_sql(statement, dialect)
+        with db.engine.connect() as connection:
+            with connection.begin():
+                problems = check(connection, sql)
+        if may_sort:
+            problems = [p for p in problems if not p.startswith('filesort')]
+        if may_scan:
+            problems = [p for p in problems if not p.startswith('full scan')]
+        if problems:
+            failures.append((label, sql, problems))
+        if verbose:
+            print(f"{'❌' if problems else '✅'} {label}")
+    return failures
@@ -0,0 +1,279 @@
+from collections import Counter
+from sqlalchemy import case, delete, event, func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from db import db
+from model.facet import FacetCount
+from model.job import Job
+from model.tag import Tag, job_tags
+
+# Facet counts (job_type, location, tag, country, city, remote) for GET /jobs/facets.
+#
+# facet_counts holds one running count per facet value. Every write applies
+# a delta instead of recounting: the affected jobs' facet values are
+# subtracted before the change and added back after it, inside the same
+# transaction. ORM writes are covered by the flush hooks below; code that
+# writes jobs through Core statements must call subtract_jobs()/add_jobs()
+# (bulk.py does, and the scraper ingests through it), or apply_change() with
+# pre- and post-images it already read (the single-job writes in bulk.py).
+#
+# country and city count the parsed location columns (ISO code / city name);
+# remote counts is_remote as "true"/"false", the values ?remote= accepts.
+
+FACETS = ('job_type', 'location', 'tag', 'country', 'city', 'remote')
+TOTAL = ('total', '')
+
+jobs = Job.__table__
+facet_counts = FacetCount.__table__
+
+# Rows read per statement when collecting facet values
+BATCH_SIZE = 500
+
+
+# Job columns a facet value is read from; location is counted by its lowercased key
+FACET_COLUMNS = (jobs.c.job_type, jobs.c.location, func.lower(jobs.c.location).label('location_key'),
+                 jobs.c.country, jobs.c.city, jobs.c.is_remote)
+
+
+def count_job(counts, labels, job, tags=()):
+    """Counts one job's facet values into counts/labels: a row with FACET_COLUMNS and its (slug, name) tags."""
+    counts[TOTAL] += 1
+    if job.job_type:
+        counts['job_type', job.job_type] += 1
+        labels.setdefault(('job_type', job.job_type), job.job_type)
+    counts['location', job.location_key] += 1
+    labels.setdefault(('location', job.location_key), job.location)
+    for facet, value in (('country', job.country), ('city', job.city), ('remote', remote_value(job.is_remote))):
+        if value:
+            counts[facet, value] += 1
+            labels[facet, value] = value
+    for slug, name in tags:
+        counts['tag', slug] += 1
+        labels.setdefault(('tag', slug), name)
+
+
+def job_facet_values(connection, job_ids):
+    """Returns (Counter of (facet, value) -> jobs, {(facet, value): label}) for the given jobs."""
+    counts = Counter()
+    labels = {}
+    job_ids = list(job_ids)
+    for start in range(0, len(job_ids), BATCH_SIZE):
+        chunk = job_ids[start:start + BATCH_SIZE]
+        for job in connection.execute(select(*FACET_COLUMNS).where(jobs.c.id.in_(chunk))):
+            count_job(counts, labels, job)
+        tags = connection.execute(
+            select(Tag.slug, Tag.name)
+            .join(job_tags, job_tags.c.tag_id == Tag.id)
+            .where(job_tags.c.job_id.in_(chunk))
+        )
+        for slug, name in tags:
+            counts['tag', slug] += 1
+            labels.setdefault(('tag', slug), name)
+    labels[TOTAL] = ''
+    return counts, labels
+
+
+def row_facet_values(job, tags=()):
+    """job_facet_values() for one job the caller has already read (see count_job()); None counts nothing."""
+    counts = Counter()
+    labels = {TOTAL: ''}
+    if job is not None:
+        count_job(counts, labels, job, tags)
+    return counts, labels
+
+
+def remote_value(is_remote):
+    return 'true' if is_remote else 'false'
+
+
+def remote_value_column():
+    """SQL for remote_value(jobs.is_remote)."""
+    return case((jobs.c.is_remote, 'true'), else_='false')
+
+
+def increment_statement(dialect):
+    """INSERT ... ON CONFLICT DO UPDATE count = count + n for the dialect, or None."""
+    name = dialect.name
+    if name in ('sqlite', 'postgresql'):
+        statement = (sqlite_insert if name == 'sqlite' else postgresql_insert)(facet_counts)
+        return statement.on_conflict_do_update(
+            index_elements=[facet_counts.c.facet, facet_counts.c.value],
+            set_={'count': facet_counts.c.count + statement.excluded['count']},
+        )
+    if name in ('mysql', 'mariadb'):
+        statement = mysql_insert(facet_counts)
+        return statement.on_duplicate_key_update(count=facet_counts.c.count + statement.inserted['count'])
+    return None
+
+
+def apply_delta(connection, counts, labels, sign):
+    """Adds sign * counts to facet_counts and drops values no job carries any more."""
+    rows = [
+        {'facet': facet, 'value': value, 'label': labels[facet, value], 'count': sign * n}
+        for (facet, value), n in sorted(counts.items()) if n
+    ]
+    if not rows:
+        return
+    statement = increment_statement(connection.dialect)
+    if statement is not None:
+        connection.execute(statement, rows)
+    else:
+        for row in rows:
+            updated = connection.execute(
+                update(facet_counts)
+                .where(facet_counts.c.facet == row['facet'], facet_counts.c.value == row['value'])
+                .values(count=facet_counts.c.count + row['count'])
+            )
+            if not updated.rowcount:
+                connection.execute(insert(facet_counts), [row])
+    if sign < 0:
+        connection.execute(delete(facet_counts).where(facet_counts.c.count <= 0))
+
+
+def add_jobs(connection, job_ids):
+    """Counts the given jobs' current facet values in."""
+    apply_delta(connection, *job_facet_values(connection, job_ids), sign=1)
+
+
+def subtract_jobs(connection, job_ids):
+    """Counts the given jobs' current facet values out; call before changing or deleting them."""
+    apply_delta(connection, *job_facet_values(connection, job_ids), sign=-1)
+
+
+def apply_change(connection, before, after):
+    """
+    Applies the net difference between two (counts, labels) pairs, e.g. one
+    job's row_facet_values() before and after a write: a single statement
+    for the values that moved (plus one to drop emptied values), none if
+    the write left every facet value alone.
+    """
+    counts = after[0].copy()
+    counts.subtract(before[0])
+    apply_delta(connection, counts, {**before[1], **after[1]}, sign=1)
+    if any(n < 0 for n in counts.values()):
+        connection.execute(delete(facet_counts).where(facet_counts.c.count <= 0))
+
+
+def rebuild_facet_counts(connection, facets=FACETS):
+    """
+    Recounts facet_counts from scratch with one GROUP BY per facet in `facets`.
+    Returns the number of rows.
+    """
+    connection.execute(delete(facet_counts))
+    location_key = func.lower(jobs.c.location)
+    remote = remote_value_column()
+    queries = {
+        'job_type': select(jobs.c.job_type, jobs.c.job_type, func.count()).where(jobs.c.job_type.isnot(None), jobs.c.job_type != '').group_by(jobs.c.job_type),
+        'location': select(location_key, func.min(jobs.c.location), func.count()).group_by(location_key),
+        'tag': select(Tag.slug, func.min(Tag.name), func.count()).join(job_tags, job_tags.c.tag_id == Tag.id).group_by(Tag.slug),
+        'country': select(jobs.c.country, jobs.c.country, func.count()).where(jobs.c.country.isnot(None)).group_by(jobs.c.country),
+        'city': select(jobs.c.city, jobs.c.city, func.count()).where(jobs.c.city.isnot(None)).group_by(jobs.c.city),
+        'remote': select(remote, remote, func.count()).group_by(jobs.c.is_remote),
+    }
+    total = connection.execute(select(func.count()).select_from(jobs)).scalar()
+    rows = [{'facet': 'total', 'value': '', 'label': '', 'count': total}] if total else []
+    for facet in facets:
+        query = queries[facet]
+        rows.extend(
+            {'facet': facet, 'value': value, 'label': label, 'count': count}
+            for value, label, count in connection.execute(query)
+        )
+    if rows:
+        connection.execute(insert(facet_counts), rows)
+    return len(rows)
+
+
+# --- ORM hooks ---
+
+def _subtract_before_flush(session, flush_context, instances):
+    """Counts out the stored state of jobs this flush will change or delete."""
+    ids = [
+        obj.id for obj in session.dirty
+        if isinstance(obj, Job) and obj.id is not None and session.is_modified(obj)
+    ]
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, Job) and obj.id is not None]
+    session.info['facet_dirty_ids'] = ids
+    if ids or deleted:
+        subtract_jobs(session.connection(), ids + deleted)
+
+
+def _add_after_flush(session, flush_context):
+    """Counts the new state of inserted and changed jobs back in."""
+    ids = session.info.pop('facet_dirty_ids', [])
+    ids += [obj.id for obj in session.new if isinstance(obj, Job)]
+    if ids:
+        add_jobs(session.connection(), ids)
+
+
+def init_facets(app):
+    """Hooks ORM writes into facet_counts (created and filled by migration 0006)."""
+    if not event.contains(db.session, 'before_flush', _subtract_before_flush):
+        event.listen(db.session, 'before_flush', _subtract_before_flush)
+        event.listen(db.session, 'after_flush', _add_after_flush)
+
+
+# --- Querying ---
+
+def stored_counts(facet, limit):
+    """[(label, count)] for `facet` from facet_counts, most common first."""
+    rows = db.session.execute(
+        select(facet_counts.c.label, facet_counts.c.count)
+        .where(facet_counts.c.facet == facet)
+        .order_by(facet_counts.c.count.desc(), facet_counts.c.label)
+        .limit(limit)
+    )
+    return [tuple(row) for row in rows]
+
+
+def stored_total():
+    return db.session.execute(
+        select(facet_counts.c.count).where(facet_counts.c.facet == TOTAL[0], facet_counts.c.value == TOTAL[1])
+    ).scalar() or 0
+
+
+def facet_count_query(facet, apply_filters):
+    """
+    GROUP BY over the jobs that `apply_filters` (a callable narrowing a select
+    on jobs) keeps, yielding (value, count): job_type, lower(location), tag
+    name, country, city or remote_value(). Served by the composite facet and
+    filter indexes and the job_tags primary key.
+    """
+    count = func.count().label('count')
+    if facet == 'tag':
+        return apply_filters(
+            select(Tag.name, count)
+            .select_from(jobs.join(job_tags, job_tags.c.job_id == jobs.c.id).join(Tag, Tag.id == job_tags.c.tag_id))
+            .group_by(Tag.id, Tag.name)
+        )
+    if facet == 'job_type':
+        return apply_filters(
+            select(jobs.c.job_type, count)
+            .where(jobs.c.job_type.isnot(None), jobs.c.job_type != '')
+            .group_by(jobs.c.job_type)
+        )
+    if facet in ('country', 'city'):
+        column = jobs.c[facet]
+        return apply_filters(select(column, count).where(column.isnot(None)).group_by(column))
+    if facet == 'remote':
+        return apply_filters(select(remote_value_column(), count).group_by(jobs.c.is_remote))
+    location_key = func.lower(jobs.c.location)
+    return apply_filters(select(location_key, count).group_by(location_key))
+
+
+def filtered_counts(facet, apply_filters, limit):
+    """[(label, count)] for `facet` over the filtered jobs, most common first."""
+    counts = dict(db.session.execute(facet_count_query(facet, apply_filters)).all())
+    labels = {}
+    if facet == 'location' and counts:
+        # Display labels for lower(location) keys
+        labels = dict(db.session.execute(
+            select(facet_counts.c.value, facet_counts.c.label)
+            .where(facet_counts.c.facet == facet, facet_counts.c.value.in_(list(counts)))
+        ).all())
+    ranked = sorted(((labels.get(value, value), n) for value, n in counts.items()), key=lambda item: (-item[1], item[0]))
+    return ranked[:limit]
+
+
+def filtered_total(apply_filters):
+    return db.session.execute(apply_filters(select(func.count()).select_from(jobs))).scalar()
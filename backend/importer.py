@@ -0,0 +1,230 @@
+import codecs
+import csv
+import gzip
+import json
+import os
+import time
+from cache import response_cache
+from db import db
+from bulk import upsert_jobs
+from read_model import invalidate_read_model
+from routes.job_routes import prepare_job_row, validate_job_data
+
+# Streaming import of job feeds (`flask jobs import FILE`).
+#
+# Records are read one at a time from CSV (header row required; the export's
+# columns work as-is) or NDJSON, optionally gzipped, validated like POST
+# /jobs/ items and written through bulk.upsert_jobs() in batches, one commit
+# per batch, so memory use does not depend on the file size. Postings are
+# matched on their dedupe key: importing a record twice updates or skips it.
+#
+# After each commit the byte offset reached is saved next to the file
+# (<file>.import-state). A later run on the same file resumes from there;
+# the state file is removed once the whole file is imported. If the process
+# dies between a commit and saving the state, that one batch is read again,
+# which the dedupe keys make harmless.
+
+FORMATS = ('csv', 'ndjson')
+IMPORT_FIELDS = ('title', 'company', 'location', 'posting_date', 'job_type', 'tags', 'source_url')
+# SQLite settings for the import's connections: a larger page cache and
+# in-memory temp tables; in WAL mode, also no fsync per commit (still durable
+# up to the last checkpoint and never corrupting)
+SQLITE_PRAGMAS = {'cache_size': -65536, 'temp_store': 'MEMORY'}
+SQLITE_WAL_PRAGMAS = {'synchronous': 'NORMAL'}
+
+
+class ImportStateMismatch(Exception):
+    """Raised when a saved import state does not belong to the file being imported."""
+
+
+def detect_format(path):
+    """'csv' or 'ndjson' from the file name (a .gz suffix is ignored), else None."""
+    name = path[:-3] if path.endswith('.gz') else path
+    extension = os.path.splitext(name)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.ndjson', '.jsonl', '.json'):
+        return 'ndjson'
+    return None
+
+
+def open_feed(path):
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def iter_lines(stream, position):
+    """
+    Yields decoded lines of a binary stream, keeping position[0] at the byte
+    offset just past the last line handed out.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig' if position[0] == 0 else 'utf-8')()
+    for raw in stream:
+        position[0] += len(raw)
+        yield decoder.decode(raw)
+
+
+def iter_records(stream, fmt, offset=0, header=None):
+    """
+    Yields (record dict or None, error message or None, byte offset after
+    the record) from `stream`, starting at `offset`. CSV needs the header
+    row; when resuming, pass the header read at the start of the file.
+    """
+    position = [offset]
+    if offset:
+        stream.seek(offset)
+    lines = iter_lines(stream, position)
+    if fmt == 'ndjson':
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield None, f"Invalid JSON: {e}", position[0]
+                continue
+            if not isinstance(record, dict):
+                yield None, "Record must be a JSON object.", position[0]
+                continue
+            yield record, None, position[0]
+        return
+
+    reader = csv.reader(lines)
+    if header is None:
+        header = [name.strip() for name in next(reader, [])]
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        yield dict(zip(header, values)), None, position[0]
+
+
+def read_csv_header(path):
+    """The header row of a CSV feed and the byte offset just past it."""
+    with open_feed(path) as stream:
+        position = [0]
+        header = next(csv.reader(iter_lines(stream, position)), [])
+        return [name.strip() for name in header], position[0]
+
+
+def import_item(record):
+    """Feed record -> ((column values, tag names), None) or (None, error messages)."""
+    # Empty CSV cells and JSON nulls mean "not given"; other columns (an export's id, city...) are ignored
+    item = {key: record[key] for key in IMPORT_FIELDS if record.get(key) not in (None, '')}
+    messages = [f"Field '{key}' must be a string." for key, value in item.items()
+                if key != 'tags' and not isinstance(value, str)]
+    if messages:
+        return None, messages
+    messages = validate_job_data(item)
+    if messages:
+        return None, messages
+    try:
+        return prepare_job_row(item), None
+    except ValueError as e:
+        return None, [str(e)]
+
+
+# --- Resume state ---
+
+def state_path_for(path):
+    return f'{path}.import-state'
+
+
+def load_state(state_path, path, fmt):
+    """The saved state for `path`, or None. Raises ImportStateMismatch if it is for another file/format."""
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path, encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('source') != os.path.abspath(path) or state.get('format') != fmt:
+        raise ImportStateMismatch(f"{state_path} belongs to another import; use --restart to ignore it.")
+    if not path.endswith('.gz') and state.get('offset', 0) > os.path.getsize(path):
+        raise ImportStateMismatch(f"{path} is shorter than when {state_path} was saved; use --restart.")
+    return state
+
+
+def save_state(state_path, state):
+    temporary = f'{state_path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(temporary, state_path)
+
+
+# --- Import ---
+
+def tune_connection(connection):
+    """Applies SQLITE_PRAGMAS (and the WAL-only ones) to an SQLite connection; a no-op elsewhere."""
+    if connection.dialect.name != 'sqlite':
+        return
+    pragmas = dict(SQLITE_PRAGMAS)
+    if connection.exec_driver_sql('PRAGMA journal_mode').scalar().lower() == 'wal':
+        pragmas.update(SQLITE_WAL_PRAGMAS)
+    for name, value in pragmas.items():
+        connection.exec_driver_sql(f'PRAGMA {name} = {value}')
+
+
+def run_import(path, fmt=None, batch_size=1000, restart=False, state_path=None,
+               near_duplicate_mode=None, progress=None, errors=None):
+    """
+    Imports the feed at `path`; see the module comment. progress(counts,
+    elapsed) is called after every committed batch and errors(record number,
+    messages) for each invalid record. Returns the counts: records read,
+    inserted, updated, skipped, near_duplicates, invalid, plus 'resumed_at'
+    (records already imported by an earlier run) and 'seconds'.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Cannot tell the format of {path}; pass --format {' or '.join(FORMATS)}.")
+    state_path = state_path or state_path_for(path)
+    if restart and os.path.exists(state_path):
+        os.remove(state_path)
+    state = load_state(state_path, path, fmt) or {
+        'source': os.path.abspath(path), 'format': fmt, 'offset': 0, 'records': 0, 'header': None,
+        'counts': {'inserted': 0, 'updated': 0, 'skipped': 0, 'near_duplicates': 0, 'invalid': 0},
+    }
+    if fmt == 'csv' and not state['offset']:
+        state['header'], state['offset'] = read_csv_header(path)
+
+    counts = dict(state['counts'], records=state['records'], resumed_at=state['records'])
+    tag_cache = {}  # slug -> Tag, shared so each tag is looked up once per run
+    started = time.perf_counter()
+
+    def commit(batch, offset):
+        if batch:
+            connection = db.session.connection()
+            tune_connection(connection)
+            try:
+                result = upsert_jobs(connection, batch, tag_cache, near_duplicate_mode=near_duplicate_mode,
+                                     copy=True)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            if result['inserted'] or result['updated']:
+                response_cache.invalidate(result['updated'])
+                invalidate_read_model()
+            for key in ('inserted', 'updated', 'skipped', 'near_duplicates'):
+                counts[key] += len(result[key])
+        state.update(offset=offset, records=counts['records'],
+                     counts={key: counts[key] for key in state['counts']})
+        save_state(state_path, state)
+        if progress and batch:
+            progress(counts, time.perf_counter() - started)
+
+    batch, offset = [], state['offset']
+    with open_feed(path) as stream:
+        for record, error, offset in iter_records(stream, fmt, state['offset'], state['header']):
+            counts['records'] += 1
+            entry, messages = import_item(record) if record is not None else (None, [error])
+            if messages:
+                counts['invalid'] += 1
+                if errors:
+                    errors(counts['records'], messages)
+            else:
+                batch.append(entry)
+            if len(batch) >= batch_size:
+                commit(batch, offset)
+                batch = []
+        commit(batch, offset)
+
+    os.remove(state_path)
+    counts['seconds'] = time.perf_counter() - started
+    return counts
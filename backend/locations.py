@@ -0,0 +1,186 @@
+import csv
+import itertools
+import os
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+# Structured locations for jobs: city, region, country and is_remote.
+#
+# parse_location() turns scraped free text ("London, UK", "Remote - US",
+# "Toronto, ON", "Hartford, CT 06103") into fields using the bundled offline
+# gazetteer in gazetteer/*.csv (ISO 3166 country codes, region codes, and
+# common cities in file order, so the first "London" is the UK one). The
+# comma/dash separated parts are matched against cities, regions and
+# countries, and the most consistent reading wins: "London, ON" is the
+# Canadian London and "Perth, WA" the Australian Perth. An unknown leading
+# part next to a known region or country is kept as the city. Results are
+# cached per input string, so bulk ingest parses each distinct location once.
+
+GAZETTEER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gazetteer')
+PARSE_CACHE_SIZE = 65536
+MAX_PARTS = 4  # trailing parts considered; longer strings are mostly street addresses
+
+ParsedLocation = namedtuple('ParsedLocation', 'city region country is_remote')
+City = namedtuple('City', 'name region country')
+Region = namedtuple('Region', 'code country name')
+
+REMOTE_PATTERN = re.compile(r'\b(remote|work from home|wfh|telecommute|telework|home based|anywhere)\b', re.I)
+# Parts that say nothing about the place
+NOISE = {
+    'hybrid', 'onsite', 'on site', 'in office', 'office', 'first', 'friendly', 'only', 'flexible',
+    'multiple locations', 'various', 'various locations', 'nationwide', 'global', 'worldwide',
+    'unknown', 'n/a', 'na', 'tbd', 'other',
+}
+SEPARATORS = re.compile(r'\s*(?:[,;/|()\[\]]|\s[-–—:]\s|[–—])\s*')
+POSTAL_CODE = re.compile(r'(?:\s+[a-z]*\d[\da-z -]*)+$')  # "ct 06103", "london ec2m 4aa"
+AREA_WORDS = re.compile(r'^(?:greater|metro)\s+|\s+(?:metro(?:politan)?\s+)?area$')
+
+
+def location_key(text):
+    """Lowercased, accent-free, punctuation-light form used for gazetteer lookups."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.lower().replace('.', ' ').replace("'", '')
+    return ' '.join(text.split())
+
+
+class Gazetteer:
+    """Lookup tables built from gazetteer/{countries,regions,cities}.csv."""
+
+    def __init__(self, directory=GAZETTEER_DIR):
+        self.countries = {}  # code -> name
+        self.country_keys = {}  # key -> code
+        self.regions = {}  # key -> [Region]
+        self.cities = {}  # key -> [City], in file order
+
+        for row in self._rows(directory, 'countries.csv'):
+            self.countries[row['code']] = row['name']
+            for key in self._keys(row['code'], row['name'], row['aliases']):
+                self.country_keys.setdefault(key, row['code'])
+        for row in self._rows(directory, 'regions.csv'):
+            region = Region(row['code'], row['country'], row['name'])
+            for key in self._keys(row['code'], row['name'], row['aliases']):
+                self.regions.setdefault(key, []).append(region)
+        for row in self._rows(directory, 'cities.csv'):
+            city = City(row['name'], row['region'] or None, row['country'])
+            for key in self._keys(row['name'], row['aliases']):
+                self.cities.setdefault(key, []).append(city)
+
+    @staticmethod
+    def _rows(directory, name):
+        with open(os.path.join(directory, name), encoding='utf-8', newline='') as f:
+            return list(csv.DictReader(f))
+
+    @staticmethod
+    def _keys(*values):
+        keys = []
+        for value in values:
+            for name in (value or '').split('|'):
+                key = location_key(name)
+                if key and key not in keys:
+                    keys.append(key)
+        return keys
+
+    def options(self, key):
+        """Every reading of one location part, cities first: [('city', City), ('region', Region), ('country', code)]."""
+        options = [('city', city) for city in self.cities.get(key, ())]
+        options += [('region', region) for region in self.regions.get(key, ())]
+        if key in self.country_keys:
+            options.append(('country', self.country_keys[key]))
+        return options
+
+
+@lru_cache(maxsize=1)
+def gazetteer():
+    return Gazetteer()
+
+
+def split_parts(text):
+    """Location text -> (parts with remote markers removed, is_remote)."""
+    is_remote = bool(REMOTE_PATTERN.search(text))
+    parts = []
+    for part in SEPARATORS.split(REMOTE_PATTERN.sub(' ', text)):
+        part = part.strip(' -:*')
+        key = AREA_WORDS.sub('', POSTAL_CODE.sub('', location_key(part)))
+        if key and key not in NOISE and not key.isdigit():
+            parts.append((part, key))
+    return parts[-MAX_PARTS:], is_remote
+
+
+def reading_score(reading):
+    """
+    Scores one assignment of (kind, value) per part, or returns None if it is
+    inconsistent (two cities, a city outside the named region/country, ...).
+    Matching nothing is not a reading. Higher is better: more matched parts,
+    then parts in the usual city, region, country order.
+    """
+    picked = {}
+    order = []
+    for option in reading:
+        if option is None:
+            continue
+        kind, value = option
+        if kind in picked:
+            return None
+        picked[kind] = value
+        order.append(kind)
+
+    if not order:
+        return None
+    city, region, country = picked.get('city'), picked.get('region'), picked.get('country')
+    countries = {c for c in (city and city.country, region and region.country, country) if c}
+    if len(countries) > 1:
+        return None
+    if city and region and city.region != region.code:
+        return None
+    in_order = order == sorted(order, key=('city', 'region', 'country').index)
+    return len(order) * 2 + in_order
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_location(text):
+    """Parses free-text `text` into a ParsedLocation; unknown parts are left as None."""
+    parts, is_remote = split_parts(text or '')
+    if not parts:
+        return ParsedLocation(None, None, None, is_remote)
+
+    places = gazetteer()
+    choices = [[None] + places.options(key) for _, key in parts]
+    best, best_score = None, 0
+    for reading in itertools.product(*choices):
+        score = reading_score(reading)
+        if score is not None and score > best_score:
+            best, best_score = reading, score
+    if best is None:
+        return ParsedLocation(None, None, None, is_remote)
+
+    picked = {kind: value for kind, value in filter(None, best)}
+    city, region, country = picked.get('city'), picked.get('region'), picked.get('country')
+    city_name = city.name if city else None
+    if city is None and best[0] is None:
+        # "Smallville, KS": keep an unknown leading part as the city
+        city_name = parts[0][0]
+    return ParsedLocation(
+        city=city_name,
+        region=region.code if region else (city.region if city else None),
+        country=country or (region.country if region else None) or (city.country if city else None),
+        is_remote=is_remote,
+    )
+
+
+def location_columns(text):
+    """parse_location() as the jobs column values it fills."""
+    return parse_location(text)._asdict()
+
+
+def country_code(value):
+    """ISO code for a country code, name or alias ("uk", "United Kingdom" -> "GB"); None if unknown."""
+    return gazetteer().country_keys.get(location_key(value))
+
+
+def city_name(value):
+    """Gazetteer spelling of a city name or alias ("NYC" -> "New York"), else the stripped input."""
+    cities = gazetteer().cities.get(location_key(value))
+    return cities[0].name if cities else (value or '').strip()
@@ -0,0 +1,317 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+
+from db import db
+
+# Request and SQL instrumentation, exposed in Prometheus text format at /metrics.
+#
+#   http_request_duration_seconds{endpoint,method,status}  histogram per route
+#   db_statement_duration_seconds{operation}               histogram per SQL verb
+#   db_statements_total{endpoint,operation}                 statements run
+#   db_statements_per_request{endpoint}                     histogram per route
+#   db_slow_statements_total{endpoint}                      over JOBS_SLOW_QUERY_MS
+#   db_repeated_statements_total{endpoint}                  suspected N+1 patterns
+#   http_coalesced_requests_total{endpoint}                 served by another request's query
+#   http_shed_requests_total{endpoint}                      answered 429 by load shedding
+#
+# Endpoints are labelled by URL rule (/jobs/<int:job_id>), not by path, to keep
+# label cardinality bounded. Statements run outside a request (scraper, CLI)
+# are labelled endpoint="none". Values are per process: with several worker
+# processes each one serves its own numbers.
+#
+# Slow statements are logged on the 'jobs.sql' logger with their bound
+# parameters and the request's query args. A point-lookup SELECT (at most
+# POINT_LOOKUP_PARAMS bound values) whose text repeats more than
+# JOBS_N_PLUS_ONE_THRESHOLD times in one request or track_queries() block is
+# reported as an N+1 pattern: logged, or raised with JOBS_N_PLUS_ONE_RAISE,
+# which is meant for tests. Chunked set-based statements bind a whole chunk
+# and are not counted.
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+PARAMS_LOG_LIMIT = 500  # characters of bound parameters kept in slow-query logs
+POINT_LOOKUP_PARAMS = 5
+DEFAULT_N_PLUS_ONE_THRESHOLD = 10
+
+logger = logging.getLogger('jobs.sql')
+
+# Statements at least this slow are logged; set from JOBS_SLOW_QUERY_MS by init_metrics
+slow_query_ms = None
+
+
+class NPlusOneError(AssertionError):
+    """Raised (with JOBS_N_PLUS_ONE_RAISE) when one statement repeats like an N+1 loop."""
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{n}="{escape_label(v)}"' for n, v in zip(names, values)) + '}'
+
+
+class CounterMetric:
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self._values = Counter()
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def value(self, *label_values):
+        with self._lock:
+            return self._values[label_values]
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{format_labels(self.labels, label_values)} {value}')
+        return lines
+
+
+class HistogramMetric:
+    def __init__(self, name, help_text, labels=(), buckets=REQUEST_BUCKETS):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            return series[-1] if series else 0
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    labels = format_labels(self.labels + ('le',), label_values + (repr(float(bound)),))
+                    lines.append(f'{self.name}_bucket{labels} {count}')
+                labels = format_labels(self.labels + ('le',), label_values + ('+Inf',))
+                lines.append(f'{self.name}_bucket{labels} {series[-1]}')
+                labels = format_labels(self.labels, label_values)
+                lines.append(f'{self.name}_sum{labels} {series[-2]}')
+                lines.append(f'{self.name}_count{labels} {series[-1]}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.request_duration = HistogramMetric(
+            'http_request_duration_seconds', 'Request latency by route.', ('endpoint', 'method', 'status'))
+        self.statement_duration = HistogramMetric(
+            'db_statement_duration_seconds', 'SQL statement latency by verb.', ('operation',), STATEMENT_BUCKETS)
+        self.statements = CounterMetric(
+            'db_statements_total', 'SQL statements executed.', ('endpoint', 'operation'))
+        self.statements_per_request = HistogramMetric(
+            'db_statements_per_request', 'SQL statements per request.', ('endpoint',), COUNT_BUCKETS)
+        self.slow_statements = CounterMetric(
+            'db_slow_statements_total', 'SQL statements slower than JOBS_SLOW_QUERY_MS.', ('endpoint',))
+        self.repeated_statements = CounterMetric(
+            'db_repeated_statements_total', 'Suspected N+1 statement patterns.', ('endpoint',))
+        self.coalesced_requests = CounterMetric(
+            'http_coalesced_requests_total', "Requests answered by an identical in-flight request's query.",
+            ('endpoint',))
+        self.shed_requests = CounterMetric(
+            'http_shed_requests_total', 'Requests answered 429 by load shedding.', ('endpoint',))
+
+    def metrics(self):
+        return [self.request_duration, self.statement_duration, self.statements,
+                self.statements_per_request, self.slow_statements, self.repeated_statements,
+                self.coalesced_requests, self.shed_requests]
+
+    def render(self):
+        return '\n'.join(line for metric in self.metrics() for line in metric.render()) + '\n'
+
+
+registry = Registry()
+
+
+# --- Per-request / per-block statement tracking ---
+
+class QueryTracker:
+    """Counts statements run while it is active, and point lookups by SQL text."""
+
+    def __init__(self, label, threshold):
+        self.label = label
+        self.threshold = threshold
+        self.count = 0
+        self.duration = 0.0
+        self.by_statement = Counter()
+
+    def record(self, statement, duration, point_lookup):
+        self.count += 1
+        self.duration += duration
+        if point_lookup:
+            self.by_statement[statement] += 1
+
+    def repeated(self):
+        """[(statement, times)] run more than `threshold` times: the N+1 suspects."""
+        return [(s, n) for s, n in self.by_statement.most_common() if n > self.threshold]
+
+
+_local = threading.local()
+
+
+def active_trackers():
+    trackers = list(getattr(_local, 'trackers', ()))
+    if has_request_context() and 'query_tracker' in g:
+        trackers.append(g.query_tracker)
+    return trackers
+
+
+def endpoint_label():
+    if has_request_context():
+        return request.url_rule.rule if request.url_rule else 'unmatched'
+    return 'none'
+
+
+def n_plus_one_threshold():
+    if has_app_context():
+        return current_app.config.get('JOBS_N_PLUS_ONE_THRESHOLD', DEFAULT_N_PLUS_ONE_THRESHOLD)
+    return DEFAULT_N_PLUS_ONE_THRESHOLD
+
+
+def report_repeats(tracker):
+    """Logs (or raises, with JOBS_N_PLUS_ONE_RAISE) the tracker's repeated statements."""
+    repeats = tracker.repeated()
+    if not repeats:
+        return
+    registry.repeated_statements.inc(tracker.label, amount=len(repeats))
+    details = '; '.join(f'{n}x {" ".join(s.split())[:200]}' for s, n in repeats)
+    if has_app_context() and current_app.config.get('JOBS_N_PLUS_ONE_RAISE'):
+        raise NPlusOneError(f'Possible N+1 in {tracker.label}: {details}')
+    logger.warning('Possible N+1 in %s: %s', tracker.label, details)
+
+
+@contextmanager
+def track_queries(label='block', threshold=None):
+    """
+    Tracks the statements run inside the block (in this thread), e.g. in a
+    test around save_jobs_to_db(), and reports N+1 patterns on exit:
+
+        with track_queries('save_jobs_to_db', threshold=5) as tracker:
+            save_jobs_to_db(jobs, app=app)
+        assert tracker.count < 20
+    """
+    if threshold is None:
+        threshold = n_plus_one_threshold()
+    tracker = QueryTracker(label, threshold)
+    trackers = _local.__dict__.setdefault('trackers', [])
+    trackers.append(tracker)
+    try:
+        yield tracker
+    finally:
+        trackers.remove(tracker)
+    report_repeats(tracker)
+
+
+# --- SQLAlchemy engine events ---
+
+def statement_operation(statement):
+    match = re.match(r'\s*(\w+)', statement)
+    verb = match.group(1).upper() if match else ''
+    return verb if verb in ('SELECT', 'INSERT', 'UPDATE', 'DELETE') else 'OTHER'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('metrics_started')
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    operation = statement_operation(statement)
+    endpoint = endpoint_label()
+    registry.statement_duration.observe(duration, operation)
+    registry.statements.inc(endpoint, operation)
+    point_lookup = (operation == 'SELECT' and not executemany
+                    and len(parameters or ()) <= POINT_LOOKUP_PARAMS)
+    for tracker in active_trackers():
+        tracker.record(statement, duration, point_lookup)
+
+    if slow_query_ms is not None and duration * 1000 >= slow_query_ms:
+        registry.slow_statements.inc(endpoint)
+        params = repr(parameters)
+        if len(params) > PARAMS_LOG_LIMIT:
+            params = params[:PARAMS_LOG_LIMIT] + '...'
+        args = dict(request.args.lists()) if has_request_context() else None
+        logger.warning('Slow query (%.1f ms) in %s args=%s: %s params=%s',
+                       duration * 1000, endpoint, args, ' '.join(statement.split()), params)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('metrics_started'):
+        connection.info['metrics_started'].pop()
+
+
+# --- Flask hooks ---
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.query_tracker = QueryTracker(endpoint_label(), n_plus_one_threshold())
+
+
+def _finish_request(response):
+    started = g.pop('request_started', None)
+    tracker = g.pop('query_tracker', None)
+    if started is None:
+        return response
+    endpoint = endpoint_label()
+    registry.request_duration.observe(time.perf_counter() - started, endpoint, request.method, response.status_code)
+    registry.statements_per_request.observe(tracker.count, endpoint)
+    report_repeats(tracker)
+    return response
+
+
+def metrics_view():
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+
+def init_metrics(app):
+    """Installs request timing, SQL statement hooks and the /metrics endpoint."""
+    global slow_query_ms
+    if not app.config.get('JOBS_METRICS_ENABLED', True):
+        return
+    slow_query_ms = app.config.get('JOBS_SLOW_QUERY_MS', 200)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine, 'handle_error', _handle_error)
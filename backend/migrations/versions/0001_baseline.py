@@ -0,0 +1,37 @@
+"""baseline jobs table
+
+Revision ID: 0001_baseline
+Revises: 
+Create Date: 2026-10-16 09:00:00
+
+Databases created by the old db.create_all() startup already have the
+table; in that case this revision only stamps them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('jobs'):
+        return
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(length=120), nullable=False),
+        sa.Column('company', sa.String(length=120), nullable=False),
+        sa.Column('location', sa.String(length=120), nullable=False),
+        sa.Column('posting_date', sa.Date(), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=True),
+        sa.Column('tags', sa.String(length=255), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table('jobs')
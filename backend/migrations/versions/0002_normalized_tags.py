@@ -0,0 +1,80 @@
+"""normalized tags and job_tags, backfilled from jobs.tags
+
+Revision ID: 0002_normalized_tags
+Revises: 0001_baseline
+Create Date: 2026-10-16 09:10:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from model.tag import normalize_tag
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_normalized_tags'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+jobs = sa.table('jobs', sa.column('id', sa.Integer), sa.column('tags', sa.String))
+tags = sa.table('tags', sa.column('id', sa.Integer), sa.column('name', sa.String), sa.column('slug', sa.String))
+job_tags = sa.table('job_tags', sa.column('job_id', sa.Integer), sa.column('tag_id', sa.Integer))
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('tags'):
+        op.create_table(
+            'tags',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('slug', sa.String(length=100), nullable=False),
+        )
+        op.create_index('ix_tags_slug', 'tags', ['slug'], unique=True)
+    if not inspector.has_table('job_tags'):
+        op.create_table(
+            'job_tags',
+            sa.Column('job_id', sa.Integer(), sa.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('tag_id', sa.Integer(), sa.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+        )
+        op.create_index('ix_job_tags_tag_id_job_id', 'job_tags', ['tag_id', 'job_id'])
+    backfill_tags(op.get_bind())
+
+
+def backfill_tags(bind):
+    """Moves comma-joined jobs.tags strings into tags/job_tags, clearing them as it goes."""
+    while True:
+        rows = bind.execute(
+            sa.select(jobs.c.id, jobs.c.tags).where(jobs.c.tags.isnot(None)).order_by(jobs.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        names = {}  # job id -> {slug: display name}
+        for job_id, raw in rows:
+            names[job_id] = {}
+            for name in raw.split(','):
+                if name.strip():
+                    names[job_id].setdefault(normalize_tag(name), name.strip())
+
+        wanted = {slug: name for per_job in names.values() for slug, name in per_job.items()}
+        if wanted:
+            known = dict(bind.execute(sa.select(tags.c.slug, tags.c.id).where(tags.c.slug.in_(list(wanted)))).all())
+            missing = [{'name': name, 'slug': slug} for slug, name in wanted.items() if slug not in known]
+            if missing:
+                bind.execute(tags.insert(), missing)
+                known = dict(bind.execute(sa.select(tags.c.slug, tags.c.id).where(tags.c.slug.in_(list(wanted)))).all())
+            bind.execute(job_tags.delete().where(job_tags.c.job_id.in_(list(names))))
+            links = [{'job_id': job_id, 'tag_id': known[slug]} for job_id, per_job in names.items() for slug in per_job]
+            if links:
+                bind.execute(job_tags.insert(), links)
+        bind.execute(jobs.update().where(jobs.c.id.in_(list(names))).values(tags=None))
+
+
+def downgrade():
+    op.drop_index('ix_job_tags_tag_id_job_id', table_name='job_tags')
+    op.drop_table('job_tags')
+    op.drop_index('ix_tags_slug', table_name='tags')
+    op.drop_table('tags')
@@ -0,0 +1,76 @@
+"""jobs.source_url and jobs.dedupe_key with unique indexes
+
+Revision ID: 0003_source_url_dedupe_key
+Revises: 0002_normalized_tags
+Create Date: 2026-10-16 09:20:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from model.job import make_dedupe_key
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_source_url_dedupe_key'
+down_revision = '0002_normalized_tags'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+jobs = sa.table(
+    'jobs',
+    sa.column('id', sa.Integer), sa.column('title', sa.String), sa.column('company', sa.String),
+    sa.column('location', sa.String), sa.column('dedupe_key', sa.String),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {c['name'] for c in inspector.get_columns('jobs')}
+    indexes = {i['name'] for i in inspector.get_indexes('jobs')}
+    if 'source_url' not in columns:
+        op.add_column('jobs', sa.Column('source_url', sa.String(length=512), nullable=True))
+    if 'ix_jobs_source_url' not in indexes:
+        op.create_index('ix_jobs_source_url', 'jobs', ['source_url'], unique=True)
+    if 'dedupe_key' not in columns:
+        op.add_column('jobs', sa.Column('dedupe_key', sa.String(length=40), nullable=True))
+    if 'ix_jobs_dedupe_key' not in indexes:
+        op.create_index('ix_jobs_dedupe_key', 'jobs', ['dedupe_key'], unique=True)
+    backfill_dedupe_keys(op.get_bind())
+
+
+def backfill_dedupe_keys(bind):
+    """
+    Fills dedupe_key for rows lacking one. When existing rows share a key,
+    the oldest keeps it and the others stay NULL.
+    """
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(jobs.c.id, jobs.c.title, jobs.c.company, jobs.c.location)
+            .where(jobs.c.dedupe_key.is_(None), jobs.c.id > last_id)
+            .order_by(jobs.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        keys = {}
+        for row in rows:
+            keys.setdefault(make_dedupe_key(row.title, row.company, row.location), row.id)
+        taken = set(bind.execute(sa.select(jobs.c.dedupe_key).where(jobs.c.dedupe_key.in_(list(keys)))).scalars())
+        updates = [{'job_id': job_id, 'key': key} for key, job_id in keys.items() if key not in taken]
+        if updates:
+            bind.execute(
+                jobs.update().where(jobs.c.id == sa.bindparam('job_id')).values(dedupe_key=sa.bindparam('key')),
+                updates,
+            )
+
+
+def downgrade():
+    op.drop_index('ix_jobs_dedupe_key', table_name='jobs')
+    op.drop_column('jobs', 'dedupe_key')
+    op.drop_index('ix_jobs_source_url', table_name='jobs')
+    op.drop_column('jobs', 'source_url')
@@ -0,0 +1,42 @@
+"""full-text search index (FTS5 / tsvector + GIN / FULLTEXT)
+
+Revision ID: 0004_search_index
+Revises: 0003_source_url_dedupe_key
+Create Date: 2026-10-16 09:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from search import dialect_name, ensure_search_index, sync_jobs
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_search_index'
+down_revision = '0003_source_url_dedupe_key'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+jobs = sa.table('jobs', sa.column('id', sa.Integer))
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not ensure_search_index(bind):
+        return  # already populated, or no full-text engine for this dialect
+    last_id = 0
+    while True:
+        ids = list(bind.execute(
+            sa.select(jobs.c.id).where(jobs.c.id > last_id).order_by(jobs.c.id).limit(BATCH_SIZE)
+        ).scalars())
+        if not ids:
+            break
+        sync_jobs(bind, changed_ids=ids)
+        last_id = ids[-1]
+
+
+def downgrade():
+    table = 'jobs_fts' if dialect_name(op.get_bind()) == 'sqlite' else 'job_search'
+    op.execute(f"DROP TABLE IF EXISTS {table}")
@@ -0,0 +1,38 @@
+"""composite indexes for every filter and sort path
+
+Revision ID: 0005_filter_sort_indexes
+Revises: 0004_search_index
+Create Date: 2026-10-16 09:40:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_filter_sort_indexes'
+down_revision = '0004_search_index'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'ix_jobs_posting_date_id': ['posting_date', 'id'],
+    'ix_jobs_title_id': ['title', 'id'],
+    'ix_jobs_job_type_posting_date_id': ['job_type', 'posting_date', 'id'],
+    'ix_jobs_job_type_title_id': ['job_type', 'title', 'id'],
+    # functional: case-insensitive location lookups
+    'ix_jobs_location_lower_posting_date_id': [sa.text('lower(location)'), 'posting_date', 'id'],
+    'ix_jobs_location_lower_title_id': [sa.text('lower(location)'), 'title', 'id'],
+}
+
+
+def upgrade():
+    existing = {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('jobs')}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'jobs', columns)
+
+
+def downgrade():
+    for name in INDEXES:
+        op.drop_index(name, table_name='jobs')
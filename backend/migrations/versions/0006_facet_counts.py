@@ -0,0 +1,45 @@
+"""facet_counts aggregate table and covering indexes for filtered facets
+
+Revision ID: 0006_facet_counts
+Revises: 0005_filter_sort_indexes
+Create Date: 2026-10-16 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from facets import rebuild_facet_counts
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_facet_counts'
+down_revision = '0005_filter_sort_indexes'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'ix_jobs_job_type_location_lower': ['job_type', sa.text('lower(location)'), 'location'],
+    'ix_jobs_location_lower_job_type': [sa.text('lower(location)'), 'job_type', 'location'],
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('facet_counts'):
+        op.create_table(
+            'facet_counts',
+            sa.Column('facet', sa.String(length=20), primary_key=True),
+            sa.Column('value', sa.String(length=255), primary_key=True),
+            sa.Column('label', sa.String(length=255), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+        )
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'jobs', columns)
+    # Facets added by later revisions are counted once their columns exist
+    rebuild_facet_counts(bind, facets=('job_type', 'location', 'tag'))
+
+
+def downgrade():
+    for name in INDEXES:
+        op.drop_index(name, table_name='jobs')
+    op.drop_table('facet_counts')
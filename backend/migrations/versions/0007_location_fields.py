@@ -0,0 +1,76 @@
+"""structured location columns (city/region/country/is_remote) with indexes, backfilled
+
+Revision ID: 0007_location_fields
+Revises: 0006_facet_counts
+Create Date: 2026-10-16 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from facets import rebuild_facet_counts
+from locations import location_columns
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_location_fields'
+down_revision = '0006_facet_counts'
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('region', sa.String(length=10), nullable=True),
+    sa.Column('country', sa.String(length=2), nullable=True),
+    sa.Column('is_remote', sa.Boolean(), nullable=False, server_default=sa.false()),
+]
+INDEXES = {
+    'ix_jobs_country_posting_date_id': ['country', 'posting_date', 'id'],
+    'ix_jobs_country_title_id': ['country', 'title', 'id'],
+    'ix_jobs_city_posting_date_id': ['city', 'posting_date', 'id'],
+    'ix_jobs_city_title_id': ['city', 'title', 'id'],
+    'ix_jobs_is_remote_posting_date_id': ['is_remote', 'posting_date', 'id'],
+    'ix_jobs_is_remote_title_id': ['is_remote', 'title', 'id'],
+}
+BATCH_SIZE = 1000
+
+jobs = sa.table(
+    'jobs',
+    sa.column('location', sa.String), sa.column('city', sa.String), sa.column('region', sa.String),
+    sa.column('country', sa.String), sa.column('is_remote', sa.Boolean),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    existing_columns = {c['name'] for c in sa.inspect(bind).get_columns('jobs')}
+    for column in COLUMNS:
+        if column.name not in existing_columns:
+            op.add_column('jobs', column)
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'jobs', columns)
+    backfill_locations(bind)
+    rebuild_facet_counts(bind, facets=('job_type', 'location', 'tag', 'country', 'city', 'remote'))
+
+
+def backfill_locations(bind):
+    """Parses each distinct location once and updates every row carrying it."""
+    locations = list(bind.execute(sa.select(jobs.c.location).distinct()).scalars())
+    statement = (
+        jobs.update()
+        .where(jobs.c.location == sa.bindparam('old_location'))
+        .values(city=sa.bindparam('city'), region=sa.bindparam('region'),
+                country=sa.bindparam('country'), is_remote=sa.bindparam('is_remote'))
+    )
+    for start in range(0, len(locations), BATCH_SIZE):
+        bind.execute(statement, [
+            {'old_location': location, **location_columns(location)}
+            for location in locations[start:start + BATCH_SIZE]
+        ])
+
+
+def downgrade():
+    for name in INDEXES:
+        op.drop_index(name, table_name='jobs')
+    for column in reversed(COLUMNS):
+        op.drop_column('jobs', column.name)
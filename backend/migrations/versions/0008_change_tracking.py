@@ -0,0 +1,59 @@
+"""change tracking for delta sync: jobs.updated_at/change_seq, job_tombstones, sync_counters
+
+Revision ID: 0008_change_tracking
+Revises: 0007_location_fields
+Create Date: 2026-10-16 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from sync import reset_sync_state
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_change_tracking'
+down_revision = '0007_location_fields'
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('change_seq', sa.BigInteger(), nullable=True),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing_columns = {c['name'] for c in inspector.get_columns('jobs')}
+    for column in COLUMNS:
+        if column.name not in existing_columns:
+            op.add_column('jobs', column)
+    op.create_index('ix_jobs_change_seq', 'jobs', ['change_seq'])
+
+    if not inspector.has_table('job_tombstones'):
+        op.create_table(
+            'job_tombstones',
+            sa.Column('job_id', sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column('change_seq', sa.BigInteger(), nullable=False),
+            sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        )
+        op.create_index('ix_job_tombstones_change_seq', 'job_tombstones', ['change_seq'])
+    if not inspector.has_table('sync_counters'):
+        op.create_table(
+            'sync_counters',
+            sa.Column('name', sa.String(length=40), primary_key=True),
+            sa.Column('value', sa.BigInteger(), nullable=False),
+        )
+    # Existing jobs enter the sequence in id order, so ?since=0 replays them all
+    reset_sync_state(bind, expire_tokens=False)
+
+
+def downgrade():
+    op.drop_table('sync_counters')
+    op.drop_index('ix_job_tombstones_change_seq', table_name='job_tombstones')
+    op.drop_table('job_tombstones')
+    op.drop_index('ix_jobs_change_seq', table_name='jobs')
+    for column in reversed(COLUMNS):
+        op.drop_column('jobs', column.name)
@@ -0,0 +1,40 @@
+"""near-duplicate detection: jobs.duplicate_of and job_minhash_buckets, backfilled
+
+Revision ID: 0009_near_duplicates
+Revises: 0008_change_tracking
+Create Date: 2026-10-16 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from near_duplicates import rebuild_near_duplicate_index
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_near_duplicates'
+down_revision = '0008_change_tracking'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'duplicate_of' not in {c['name'] for c in inspector.get_columns('jobs')}:
+        op.add_column('jobs', sa.Column('duplicate_of', sa.Integer(), nullable=True))
+    if not inspector.has_table('job_minhash_buckets'):
+        op.create_table(
+            'job_minhash_buckets',
+            sa.Column('bucket', sa.BigInteger(), primary_key=True, autoincrement=False),
+            sa.Column('job_id', sa.Integer(), primary_key=True, autoincrement=False),
+        )
+        op.create_index('ix_job_minhash_buckets_job_id', 'job_minhash_buckets', ['job_id'])
+    # Existing postings are bucketed but not flagged; only new ones are checked
+    rebuild_near_duplicate_index(bind)
+
+
+def downgrade():
+    op.drop_index('ix_job_minhash_buckets_job_id', table_name='job_minhash_buckets')
+    op.drop_table('job_minhash_buckets')
+    op.drop_column('jobs', 'duplicate_of')
@@ -0,0 +1,51 @@
+"""retention: jobs_archive table for expired postings
+
+Revision ID: 0010_jobs_archive
+Revises: 0009_near_duplicates
+Create Date: 2026-10-16 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_jobs_archive'
+down_revision = '0009_near_duplicates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table('jobs_archive'):
+        return
+    op.create_table(
+        'jobs_archive',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column('title', sa.String(length=120), nullable=False),
+        sa.Column('company', sa.String(length=120), nullable=False),
+        sa.Column('location', sa.String(length=120), nullable=False),
+        sa.Column('posting_date', sa.Date(), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=True),
+        sa.Column('tag_names', sa.Text(), nullable=True),
+        sa.Column('source_url', sa.String(length=512), nullable=True),
+        sa.Column('dedupe_key', sa.String(length=40), nullable=True),
+        sa.Column('city', sa.String(length=100), nullable=True),
+        sa.Column('region', sa.String(length=10), nullable=True),
+        sa.Column('country', sa.String(length=2), nullable=True),
+        sa.Column('is_remote', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('duplicate_of', sa.Integer(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_jobs_archive_source_url', 'jobs_archive', ['source_url'])
+    op.create_index('ix_jobs_archive_posting_date_id', 'jobs_archive', ['posting_date', 'id'])
+    op.create_index('ix_jobs_archive_title_id', 'jobs_archive', ['title', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_archive_title_id', table_name='jobs_archive')
+    op.drop_index('ix_jobs_archive_posting_date_id', table_name='jobs_archive')
+    op.drop_index('ix_jobs_archive_source_url', table_name='jobs_archive')
+    op.drop_table('jobs_archive')
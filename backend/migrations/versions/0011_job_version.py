@@ -0,0 +1,37 @@
+"""optimistic concurrency: jobs.version, and a lower(title) index for delete by name
+
+Revision ID: 0011_job_version
+Revises: 0010_jobs_archive
+Create Date: 2026-10-17 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_job_version'
+down_revision = '0010_jobs_archive'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    # functional: case-insensitive title lookups (DELETE /jobs/delete_by_name)
+    'ix_jobs_title_lower_id': [sa.text('lower(title)'), 'id'],
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'version' not in {c['name'] for c in inspector.get_columns('jobs')}:
+        op.add_column('jobs', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    existing = {i['name'] for i in inspector.get_indexes('jobs')}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'jobs', columns)
+
+
+def downgrade():
+    for name in INDEXES:
+        op.drop_index(name, table_name='jobs')
+    op.drop_column('jobs', 'version')
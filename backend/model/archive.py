@@ -0,0 +1,70 @@
+from sqlalchemy import and_, func, literal, or_
+from db import db
+from model.tag import TAG_NAME_SEPARATOR, normalize_tag, split_tag_names
+
+
+class JobArchive(db.Model):
+    """
+    An expired posting moved out of `jobs` by archive.py. Rows keep their
+    job id and column values as of archival; tags are kept as a snapshot of
+    names joined by TAG_NAME_SEPARATOR (decode with split_tag_names()).
+    """
+    __tablename__ = 'jobs_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(120), nullable=False)
+    company = db.Column(db.String(120), nullable=False)
+    location = db.Column(db.String(120), nullable=False)
+    posting_date = db.Column(db.Date, nullable=False)
+    job_type = db.Column(db.String(50), nullable=True)
+    tag_names = db.Column(db.Text, nullable=True)
+    source_url = db.Column(db.String(512), nullable=True, index=True)
+    dedupe_key = db.Column(db.String(40), nullable=True)
+    city = db.Column(db.String(100), nullable=True)
+    region = db.Column(db.String(10), nullable=True)
+    country = db.Column(db.String(2), nullable=True)
+    is_remote = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    updated_at = db.Column(db.DateTime, nullable=True)
+    duplicate_of = db.Column(db.Integer, nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    # ?include_archived=true lists sort history the same two ways as jobs
+    __table_args__ = (
+        db.Index('ix_jobs_archive_posting_date_id', 'posting_date', 'id'),
+        db.Index('ix_jobs_archive_title_id', 'title', 'id'),
+    )
+
+    def __repr__(self):
+        return f'<JobArchive {self.id}: {self.title} at {self.company}>'
+
+    @classmethod
+    def with_tags(cls, names, match_all=False):
+        """
+        Criterion for archived jobs carrying the given tags (exact,
+        case-insensitive), the counterpart of jobs_with_tags(). Scans the
+        snapshot text: archived rows are only read by rare history queries.
+        """
+        slugs = sorted({normalize_tag(n) for n in names if normalize_tag(n)})
+        padded = func.lower(literal(TAG_NAME_SEPARATOR) + cls.tag_names + literal(TAG_NAME_SEPARATOR))
+        matches = [padded.contains(f'{TAG_NAME_SEPARATOR}{slug}{TAG_NAME_SEPARATOR}', autoescape=True)
+                   for slug in slugs]
+        return and_(*matches) if match_all else or_(*matches)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'company': self.company,
+            'location': self.location,
+            'city': self.city,
+            'region': self.region,
+            'country': self.country,
+            'is_remote': self.is_remote,
+            'posting_date': self.posting_date.isoformat() if self.posting_date else None,
+            'job_type': self.job_type,
+            'tags': split_tag_names(self.tag_names),
+            'source_url': self.source_url,
+            'duplicate_of': self.duplicate_of,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'archived_at': self.archived_at.isoformat(),
+        }
@@ -0,0 +1,21 @@
+from db import db
+
+
+class FacetCount(db.Model):
+    """
+    Running count of jobs per facet value, kept current by facets.py on every
+    write so unfiltered facet counts never need a GROUP BY over jobs.
+
+    facet: 'job_type', 'location', 'tag' or 'total' (value '' = all jobs)
+    value: the key the list filter matches on (job_type, lower(location), tag slug)
+    label: display form of the value, as first seen
+    """
+    __tablename__ = 'facet_counts'
+
+    facet = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.String(255), primary_key=True)
+    label = db.Column(db.String(255), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<FacetCount {self.facet}={self.value}: {self.count}>'
@@ -1,5 +1,16 @@
+import hashlib
 from datetime import datetime
+from sqlalchemy import event, func
 from db import db
+from locations import location_columns
+from model.tag import Tag, job_tags
+
+
+def make_dedupe_key(title, company, location):
+    """Deterministic identity of a posting: hash of normalized title, company and location."""
+    parts = [' '.join((value or '').lower().split()) for value in (title, company, location)]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
 
 class Job(db.Model):
     __tablename__ = 'jobs'
@@ -10,18 +21,102 @@ class Job(db.Model):
     location = db.Column(db.String(120), nullable=False)
     posting_date = db.Column(db.Date, nullable=False, default=datetime.utcnow().date)
     job_type = db.Column(db.String(50), nullable=True)
-    tags = db.Column(db.String(255), nullable=True)
+    # Pre-normalization comma-joined tags; drained by migration 0002_normalized_tags
+    legacy_tags = db.Column('tags', db.String(255), nullable=True)
+
+    # Posting URL the scraper found the job at; lets re-runs skip known postings
+    source_url = db.Column(db.String(512), nullable=True, unique=True, index=True)
+
+    # make_dedupe_key(title, company, location); NULL only for pre-existing duplicates
+    dedupe_key = db.Column(db.String(40), nullable=True, unique=True, index=True)
+
+    # Structured location parsed from `location` by locations.parse_location(),
+    # kept in step on every write; unrecognized parts stay NULL
+    city = db.Column(db.String(100), nullable=True)
+    region = db.Column(db.String(10), nullable=True)  # e.g. CA (US), ON (CA), ENG (GB)
+    country = db.Column(db.String(2), nullable=True)  # ISO 3166-1 alpha-2
+    is_remote = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+
+    # Set by sync.py on every write: when the row last changed, and its place
+    # in the change sequence GET /jobs/changes pages through
+    updated_at = db.Column(db.DateTime, nullable=True)
+    change_seq = db.Column(db.BigInteger, nullable=True, index=True)
+    # Bumped with change_seq on every write; GET /jobs/<id> serves it as the
+    # ETag that PUT/PATCH/DELETE accept in If-Match
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+
+    # Job this posting was found to nearly duplicate at ingest (JOBS_NEAR_DUP_MODE=flag);
+    # may point at a job deleted since
+    duplicate_of = db.Column(db.Integer, nullable=True)
+
+    tags = db.relationship(Tag, secondary=job_tags, lazy='selectin', order_by=Tag.slug)
+
+    # One index per (filter, sort) path of apply_filters/apply_sorting, each
+    # ending in id so keyset pages and the id tie-breaker need no sort step.
+    __table_args__ = (
+        db.Index('ix_jobs_posting_date_id', 'posting_date', 'id'),
+        db.Index('ix_jobs_title_id', 'title', 'id'),
+        db.Index('ix_jobs_job_type_posting_date_id', 'job_type', 'posting_date', 'id'),
+        db.Index('ix_jobs_job_type_title_id', 'job_type', 'title', 'id'),
+        db.Index('ix_jobs_location_lower_posting_date_id', func.lower(location), 'posting_date', 'id'),
+        db.Index('ix_jobs_location_lower_title_id', func.lower(location), 'title', 'id'),
+        db.Index('ix_jobs_country_posting_date_id', 'country', 'posting_date', 'id'),
+        db.Index('ix_jobs_country_title_id', 'country', 'title', 'id'),
+        db.Index('ix_jobs_city_posting_date_id', 'city', 'posting_date', 'id'),
+        db.Index('ix_jobs_city_title_id', 'city', 'title', 'id'),
+        db.Index('ix_jobs_is_remote_posting_date_id', 'is_remote', 'posting_date', 'id'),
+        db.Index('ix_jobs_is_remote_title_id', 'is_remote', 'title', 'id'),
+        # Case-insensitive title lookups of DELETE /jobs/delete_by_name
+        db.Index('ix_jobs_title_lower_id', func.lower(title), 'id'),
+        # Covering indexes for filtered facet counts (GET /jobs/facets); the
+        # trailing raw location lets planners answer lower(location) from the index
+        db.Index('ix_jobs_job_type_location_lower', 'job_type', func.lower(location), 'location'),
+        db.Index('ix_jobs_location_lower_job_type', func.lower(location), 'job_type', 'location'),
+    )
 
     def __repr__(self):
         return f'<Job {self.id}: {self.title} at {self.company}>'
 
+    def set_tags_from_list(self, names, tag_cache=None):
+        """Replaces this job's tags with the given names, creating new tags as needed."""
+        # Keep the same order the relationship loads with (order_by=Tag.slug)
+        self.tags = sorted(Tag.resolve(names or [], cache=tag_cache), key=lambda tag: tag.slug)
+
     def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'company': self.company,
-            'location': self.location,
-            'posting_date': self.posting_date.isoformat() if self.posting_date else None,
-            'job_type': self.job_type,
-            'tags': [t.strip() for t in self.tags.split(',')] if self.tags else []
-        }
+        return job_to_dict(self, [tag.name for tag in self.tags])
+
+
+def job_to_dict(job, tag_names):
+    """API representation of a job from anything with Job's column attributes (an instance or a row)."""
+    return {
+        'id': job.id,
+        'title': job.title,
+        'company': job.company,
+        'location': job.location,
+        'city': job.city,
+        'region': job.region,
+        'country': job.country,
+        'is_remote': job.is_remote,
+        'posting_date': job.posting_date.isoformat() if job.posting_date else None,
+        'job_type': job.job_type,
+        'tags': tag_names,
+        'source_url': job.source_url,
+        'duplicate_of': job.duplicate_of,
+        'updated_at': job.updated_at.isoformat() if job.updated_at else None,
+        'version': job.version,
+    }
+
+
+@event.listens_for(Job, 'before_insert')
+@event.listens_for(Job, 'before_update')
+def set_dedupe_key(mapper, connection, target):
+    """Keeps dedupe_key in step with title/company/location on ORM writes."""
+    target.dedupe_key = make_dedupe_key(target.title, target.company, target.location)
+
+
+@event.listens_for(Job, 'before_insert')
+@event.listens_for(Job, 'before_update')
+def set_location_fields(mapper, connection, target):
+    """Keeps city/region/country/is_remote in step with location on ORM writes."""
+    for column, value in location_columns(target.location).items():
+        setattr(target, column, value)
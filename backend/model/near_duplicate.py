@@ -0,0 +1,16 @@
+from db import db
+
+
+class JobMinhashBucket(db.Model):
+    """
+    One LSH bucket of a job's MinHash signature (near_duplicates.py). Jobs
+    sharing any bucket are near-duplicate candidates; every job has one row
+    per band, recomputed whenever its title, company, location or tags change.
+    """
+    __tablename__ = 'job_minhash_buckets'
+
+    bucket = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    job_id = db.Column(db.Integer, primary_key=True, autoincrement=False, index=True)
+
+    def __repr__(self):
+        return f'<JobMinhashBucket {self.bucket}: {self.job_id}>'
@@ -0,0 +1,29 @@
+from datetime import datetime
+from db import db
+
+
+class SyncCounter(db.Model):
+    """
+    Named monotonic counters for sync.py. 'jobs' is the last change sequence
+    handed out; 'jobs_pruned' the highest sequence whose tombstone has been
+    pruned (sync tokens below it can no longer be served).
+    """
+    __tablename__ = 'sync_counters'
+
+    name = db.Column(db.String(40), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<SyncCounter {self.name}={self.value}>'
+
+
+class JobTombstone(db.Model):
+    """Marker left behind by a deleted job so delta syncs can report the delete."""
+    __tablename__ = 'job_tombstones'
+
+    job_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    change_seq = db.Column(db.BigInteger, nullable=False, index=True)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<JobTombstone {self.job_id} @{self.change_seq}>'
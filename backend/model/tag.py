@@ -0,0 +1,99 @@
+from sqlalchemy import func, select
+from db import db
+
+# Association table between jobs and tags. The composite primary key serves
+# "tags of a job" lookups; the reverse index serves "jobs with a tag" filters.
+job_tags = db.Table(
+    'job_tags',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_job_tags_tag_id_job_id', 'tag_id', 'job_id'),
+)
+
+
+def normalize_tag(name):
+    """Returns the case-insensitive lookup key for a tag name."""
+    return name.strip().lower()
+
+
+class Tag(db.Model):
+    __tablename__ = 'tags'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    slug = db.Column(db.String(100), nullable=False, unique=True, index=True)
+
+    def __repr__(self):
+        return f'<Tag {self.id}: {self.name}>'
+
+    @classmethod
+    def resolve(cls, names, cache=None):
+        """
+        Returns Tag rows for `names`, creating the missing ones in the current session.
+        `cache` (slug -> Tag) can be shared across calls to avoid repeated lookups
+        when tagging many jobs in one transaction.
+        """
+        cache = {} if cache is None else cache
+        wanted = {}
+        for name in names:
+            slug = normalize_tag(name)
+            if slug and slug not in wanted:
+                wanted[slug] = name.strip()
+
+        missing = [slug for slug in wanted if slug not in cache]
+        if missing:
+            with db.session.no_autoflush:
+                for tag in cls.query.filter(cls.slug.in_(missing)):
+                    cache[tag.slug] = tag
+            for slug in missing:
+                if slug not in cache:
+                    tag = cls(name=wanted[slug], slug=slug)
+                    db.session.add(tag)
+                    cache[slug] = tag
+
+        return [cache[slug] for slug in wanted]
+
+
+def jobs_with_tags(names, match_all=False):
+    """
+    Returns a subquery of job ids carrying the given tags (exact, case-insensitive).
+    With match_all=True a job must carry every tag, otherwise any one of them.
+    """
+    slugs = sorted({normalize_tag(n) for n in names if normalize_tag(n)})
+    query = (
+        select(job_tags.c.job_id)
+        .join(Tag, Tag.id == job_tags.c.tag_id)
+        .where(Tag.slug.in_(slugs))
+    )
+    if match_all and len(slugs) > 1:
+        query = query.group_by(job_tags.c.job_id).having(func.count() == len(slugs))
+    return query
+
+
+# Separator for aggregated tag names; cannot appear in a tag entered through the API
+TAG_NAME_SEPARATOR = '\x1f'
+
+
+def tag_names_column(job_id_column):
+    """
+    Correlated scalar subquery yielding a job's tag names joined by
+    TAG_NAME_SEPARATOR, for column-only selects that must not load Tag rows.
+    Decode with split_tag_names().
+    """
+    return (
+        select(func.aggregate_strings(Tag.name, TAG_NAME_SEPARATOR))
+        .select_from(job_tags.join(Tag, Tag.id == job_tags.c.tag_id))
+        .where(job_tags.c.job_id == job_id_column)
+        .scalar_subquery()
+        .label('tag_names')
+    )
+
+
+def split_tag_names(value):
+    """Decodes tag_names_column() output into the list Job.to_dict() would return."""
+    if not value:
+        return []
+    if TAG_NAME_SEPARATOR not in value:
+        return [value]
+    # Stored names are already stripped, so str.lower matches normalize_tag()
+    return sorted(value.split(TAG_NAME_SEPARATOR), key=str.lower)
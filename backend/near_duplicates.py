@@ -0,0 +1,313 @@
+import hashlib
+import random
+import re
+from collections import Counter, namedtuple
+from functools import lru_cache
+from flask import current_app, has_app_context
+from sqlalchemy import delete, event, func, insert, select
+from db import db
+from locations import location_key, parse_location
+from model.job import Job
+from model.near_duplicate import JobMinhashBucket
+from model.tag import normalize_tag, split_tag_names, tag_names_column
+
+# Near-duplicate postings: the same role scraped with a slightly different
+# title or company string ("Sr. Pricing Actuary" at "Acme Insurance Co." vs
+# "Senior Pricing Actuary" at "ACME Insurance Company").
+#
+# Each job gets a MinHash signature over its normalized title words, company
+# words and tags, cut into BANDS bands whose hashes (salted with the job's
+# place, so only postings at the same location can collide) are stored in
+# job_minhash_buckets. An incoming posting is compared only against jobs
+# sharing one of its buckets, so the work per posting depends on how many
+# similar postings exist, not on the size of the catalog. Candidates are then
+# checked exactly: same place, same seniority words, at least half of the
+# company words shared, and a Jaccard similarity of all words of at least
+# JOBS_NEAR_DUP_THRESHOLD.
+#
+# bulk.upsert_jobs() (the bulk endpoint and the scraper) applies
+# JOBS_NEAR_DUP_MODE to new postings with a match: "flag" inserts them with
+# duplicate_of set, "merge" folds them into the matched job like a re-scrape,
+# "skip" drops them, "off" disables the check. Bucket rows follow ORM writes
+# through the flush hook below; Core writers call index_jobs()/unindex_jobs().
+
+MODES = ('off', 'flag', 'merge', 'skip')
+BANDS = 16
+ROWS_PER_BAND = 4  # a pair at similarity s shares a bucket with probability 1 - (1 - s**4)**16
+COMPANY_MIN_SIMILARITY = 0.5
+# Jobs kept per bucket. A bucket shared by more postings than this comes from
+# words common to all of them (one company's boilerplate tags, say) and says
+# little; capping it keeps lookups from growing with the catalog, and real
+# near-duplicates still meet in their other bands.
+MAX_BUCKET_SIZE = 50
+# Candidates verified per posting, those sharing the most buckets first (a
+# pair at similarity 0.8 shares about 6 of the 16 on average)
+MAX_CANDIDATES = 32
+BATCH_SIZE = 500
+
+# Fixed seed: stored buckets must stay comparable across processes and releases
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)
+PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(BANDS * ROWS_PER_BAND)]
+
+ABBREVIATIONS = {
+    'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'jnr': 'junior', 'mgr': 'manager', 'mngr': 'manager',
+    'assoc': 'associate', 'asst': 'assistant', 'dir': 'director', 'vp': 'vice president',
+    'eng': 'engineer', 'engr': 'engineer', 'dev': 'developer', 'admin': 'administrator',
+    'analyt': 'analytics', 'intl': 'international', 'natl': 'national',
+}
+STOPWORDS = {'a', 'an', 'the', 'of', 'and', 'for', 'to', 'in', 'at', 'with', 'on', 'm', 'f', 'd', 'w', 'x'}
+COMPANY_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'llp', 'lp', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+    'plc', 'group', 'holdings', 'gmbh', 'ag', 'sa', 'se', 'nv', 'bv', 'pty', 'the',
+}
+# Words that make otherwise equal titles different roles
+LEVEL_WORDS = {
+    'intern', 'trainee', 'junior', 'associate', 'assistant', 'senior', 'lead', 'principal', 'chief', 'head',
+    'staff', 'director', 'vice', 'i', 'ii', 'iii', 'iv', '1', '2', '3', '4',
+}
+WORD = re.compile(r'[a-z0-9]+')
+
+Fingerprint = namedtuple('Fingerprint', 'place company level shingles')
+Settings = namedtuple('Settings', 'mode threshold')
+
+
+def words(text):
+    """Normalized words of `text`, abbreviations expanded."""
+    result = []
+    for word in WORD.findall(location_key(text)):
+        result.extend(ABBREVIATIONS.get(word, word).split())
+    return [word for word in result if word not in STOPWORDS]
+
+
+@lru_cache(maxsize=65536)
+def place_key(location):
+    """Where a posting is, as parsed city/country (or its normalized text when unparsed)."""
+    parsed = parse_location(location)
+    place = f'{(parsed.city or "").lower()}|{parsed.country or ""}' if parsed.city or parsed.country \
+        else location_key(location)
+    return f'{place}|remote' if parsed.is_remote else place
+
+
+def fingerprint(title, company, location, tag_names):
+    """Fingerprint(place, company words, seniority words, shingles) of one posting."""
+    title_words = frozenset(words(title))
+    company_words = frozenset(w for w in words(company) if w not in COMPANY_SUFFIXES)
+    tags = {normalize_tag(t) for t in tag_names or () if normalize_tag(t)}
+    shingles = {'t:' + w for w in title_words} | {'c:' + w for w in company_words} | {'g:' + t for t in tags}
+    return Fingerprint(
+        place=place_key(location or ''),
+        company=company_words,
+        level=title_words & LEVEL_WORDS,
+        shingles=frozenset(shingles or {''}),
+    )
+
+
+@lru_cache(maxsize=65536)
+def shingle_hashes(shingle):
+    """The shingle's value under each of the BANDS * ROWS_PER_BAND hash permutations."""
+    h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+    return tuple((a * h + b) % _PRIME for a, b in PERMUTATIONS)
+
+
+def signature(fp):
+    """MinHash signature: per permutation, the smallest value over the shingles."""
+    return list(map(min, zip(*[shingle_hashes(s) for s in fp.shingles])))
+
+
+@lru_cache(maxsize=65536)
+def buckets(fp):
+    """The distinct bucket keys (signed 64-bit, as stored) of a fingerprint's BANDS bands."""
+    values = signature(fp)
+    keys = []
+    for band in range(BANDS):
+        rows = values[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        data = f'{fp.place}\x1f{band}\x1f' + ','.join(map(str, rows))
+        keys.append(int.from_bytes(hashlib.blake2b(data.encode('utf-8'), digest_size=8).digest(), 'big', signed=True))
+    return tuple(dict.fromkeys(keys))
+
+
+def jaccard(a, b):
+    common = len(a & b)
+    union = len(a) + len(b) - common
+    return common / union if union else 1.0
+
+
+def similarity(a, b, threshold=0.0):
+    """
+    Jaccard similarity of two fingerprints' words, or 0 if they cannot be
+    the same posting or cannot reach `threshold`.
+    """
+    if a.place != b.place or a.level != b.level:
+        return 0.0
+    small, large = sorted((len(a.shingles), len(b.shingles)))
+    if small < threshold * large:  # Jaccard is at most small / large
+        return 0.0
+    if jaccard(a.company, b.company) < COMPANY_MIN_SIMILARITY:
+        return 0.0
+    return jaccard(a.shingles, b.shingles)
+
+
+def settings(mode=None):
+    """Settings(mode, threshold) from JOBS_NEAR_DUP_MODE / JOBS_NEAR_DUP_THRESHOLD; `mode` overrides."""
+    config = current_app.config if has_app_context() else {}
+    mode = mode or config.get('JOBS_NEAR_DUP_MODE', 'flag')
+    if mode not in MODES:
+        raise ValueError(f"Unknown near-duplicate mode '{mode}'. Use {', '.join(MODES)}.")
+    return Settings(mode, config.get('JOBS_NEAR_DUP_THRESHOLD', 0.8))
+
+
+# --- Stored buckets ---
+
+jobs = Job.__table__
+minhash_buckets = JobMinhashBucket.__table__
+
+
+def stored_fingerprints(connection, job_ids):
+    """{job id: (Fingerprint, duplicate_of)} for the given jobs."""
+    result = {}
+    job_ids = list(job_ids)
+    for start in range(0, len(job_ids), BATCH_SIZE):
+        rows = connection.execute(
+            select(jobs.c.id, jobs.c.title, jobs.c.company, jobs.c.location, tag_names_column(jobs.c.id),
+                   jobs.c.duplicate_of)
+            .where(jobs.c.id.in_(job_ids[start:start + BATCH_SIZE]))
+        )
+        for job_id, title, company, location, tag_names, duplicate_of in rows:
+            result[job_id] = (fingerprint(title, company, location, split_tag_names(tag_names)), duplicate_of)
+    return result
+
+
+def unindex_jobs(connection, job_ids):
+    job_ids = list(job_ids)
+    for start in range(0, len(job_ids), BATCH_SIZE):
+        connection.execute(delete(minhash_buckets).where(minhash_buckets.c.job_id.in_(job_ids[start:start + BATCH_SIZE])))
+
+
+def bucket_sizes(connection, keys):
+    """{bucket: stored jobs} for the given buckets (at most MAX_BUCKET_SIZE each)."""
+    sizes = {}
+    keys = sorted(set(keys))
+    for start in range(0, len(keys), BATCH_SIZE):
+        sizes.update(connection.execute(
+            select(minhash_buckets.c.bucket, func.count())
+            .where(minhash_buckets.c.bucket.in_(keys[start:start + BATCH_SIZE]))
+            .group_by(minhash_buckets.c.bucket)
+        ).all())
+    return sizes
+
+
+def index_jobs(connection, job_ids, replace=True):
+    """
+    (Re)computes the buckets of the given jobs from their stored title,
+    company, location and tags; buckets already full are left out.
+    """
+    job_ids = sorted(set(job_ids))
+    if not job_ids:
+        return
+    if replace:
+        unindex_jobs(connection, job_ids)
+    keys_of = {job_id: buckets(fp) for job_id, (fp, _) in stored_fingerprints(connection, job_ids).items()}
+    sizes = bucket_sizes(connection, [bucket for keys in keys_of.values() for bucket in keys])
+    rows = []
+    for job_id in sorted(keys_of):
+        for bucket in keys_of[job_id]:
+            if sizes.get(bucket, 0) < MAX_BUCKET_SIZE:
+                sizes[bucket] = sizes.get(bucket, 0) + 1
+                rows.append({'bucket': bucket, 'job_id': job_id})
+    for start in range(0, len(rows), BATCH_SIZE * BANDS):
+        connection.execute(insert(minhash_buckets), rows[start:start + BATCH_SIZE * BANDS])
+
+
+def rebuild_near_duplicate_index(connection, batch_size=5000):
+    """Recomputes job_minhash_buckets for every job, in id order. Returns the number of jobs indexed."""
+    connection.execute(delete(minhash_buckets))
+    total, last_id = 0, 0
+    while True:
+        ids = list(connection.execute(
+            select(jobs.c.id).where(jobs.c.id > last_id).order_by(jobs.c.id).limit(batch_size)
+        ).scalars())
+        if not ids:
+            return total
+        index_jobs(connection, ids, replace=False)
+        total += len(ids)
+        last_id = ids[-1]
+
+
+def bucket_members(connection, keys):
+    """{bucket: [job ids]} for the stored jobs in any of the given buckets."""
+    members = {}
+    keys = sorted(set(keys))
+    for start in range(0, len(keys), BATCH_SIZE):
+        rows = connection.execute(
+            select(minhash_buckets.c.bucket, minhash_buckets.c.job_id)
+            .where(minhash_buckets.c.bucket.in_(keys[start:start + BATCH_SIZE]))
+        )
+        for bucket, job_id in rows:
+            members.setdefault(bucket, []).append(job_id)
+    return members
+
+
+def find_near_duplicates(connection, entries, threshold):
+    """
+    Matches new postings against stored jobs and against earlier entries.
+    entries: [(key, column dict, tag names)] in arrival order.
+    Returns {key: ('job', id) | ('entry', key)} for entries with a match at
+    `threshold` or above: the best-scoring one, resolved to the original
+    when the match is itself a flagged or matched duplicate.
+    """
+    prints = {key: fingerprint(row['title'], row['company'], row['location'], tags) for key, row, tags in entries}
+    keys_of = {key: buckets(fp) for key, fp in prints.items()}
+    members = bucket_members(connection, [bucket for keys in keys_of.values() for bucket in keys])
+    # Stored jobs sharing the most buckets with each entry; only those are loaded
+    nearest = {}
+    for key, keys in keys_of.items():
+        shared = Counter(job_id for bucket in keys for job_id in members.get(bucket, ()))
+        nearest[key] = shared.most_common(MAX_CANDIDATES)
+    stored = stored_fingerprints(connection, {job_id for ranked in nearest.values() for job_id, _ in ranked})
+
+    matches, local = {}, {}
+    for key, fp in prints.items():
+        shared = Counter({('job', job_id): count for job_id, count in nearest[key]})
+        shared.update(('entry', other) for bucket in keys_of[key] for other in local.get(bucket, ()))
+        best, best_score = None, threshold
+        for (kind, target), _ in shared.most_common(MAX_CANDIDATES):
+            if kind == 'job':
+                if target not in stored:  # bucket row left behind by a writer that skipped unindex_jobs()
+                    continue
+                other_fp, duplicate_of = stored[target]
+                resolved = ('job', duplicate_of or target)
+            else:
+                other_fp, resolved = prints[target], matches.get(target, (kind, target))
+            score = similarity(fp, other_fp, best_score)
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = resolved, score
+        if best is not None:
+            matches[key] = best
+        for bucket in keys_of[key]:
+            entries_in_bucket = local.setdefault(bucket, [])
+            if len(entries_in_bucket) + len(members.get(bucket, ())) < MAX_BUCKET_SIZE:
+                entries_in_bucket.append(key)
+    return matches
+
+
+# --- ORM hooks ---
+
+def _index_after_flush(session, flush_context):
+    """Re-buckets jobs inserted or changed by this flush and drops deleted ones."""
+    changed = [obj.id for obj in session.new if isinstance(obj, Job)]
+    changed += [obj.id for obj in session.dirty if isinstance(obj, Job) and session.is_modified(obj)]
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, Job) and obj.id is not None]
+    connection = session.connection()
+    if deleted:
+        unindex_jobs(connection, deleted)
+    if changed:
+        index_jobs(connection, changed)
+
+
+def init_near_duplicates(app):
+    """Checks the configured mode and hooks ORM writes into job_minhash_buckets (migration 0009)."""
+    with app.app_context():
+        settings()
+    if not event.contains(db.session, 'after_flush', _index_after_flush):
+        event.listen(db.session, 'after_flush', _index_after_flush)
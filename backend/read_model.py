@@ -0,0 +1,437 @@
+import string
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
+from datetime import date
+from functools import lru_cache
+from flask import current_app, has_app_context
+from sqlalchemy import select
+from model.job import Job
+from model.tag import TAG_NAME_SEPARATOR, Tag, job_tags, normalize_tag
+from sync import TokenExpired, changes_since, current_token
+
+# In-process read model for GET /jobs/ (JOBS_READ_MODEL=1).
+#
+# A column-wise snapshot of the jobs table held in stdlib arrays: strings are
+# dictionary-encoded (one interned copy per distinct value, an int code per
+# row), posting dates are ordinals, and each filterable value (job type,
+# lowercased location, country, city, remote flag, tag slug) keeps the list
+# of row slots carrying it. Filters combine those as bitsets (Python ints,
+# so AND/OR run word-wise in C over the whole catalog), and each sort column
+# has a presorted permutation of the slots, so a page is read off the
+# permutation without sorting. Results are the rows, order and cursors the
+# SQL path in routes/job_routes.py would produce.
+#
+# The snapshot is loaded on first use and brought up to date through the
+# change sequence (sync.py): write paths call invalidate_read_model() after
+# committing, and the next read applies just the jobs changed since the last
+# sync token it saw. Writers in other processes (a scraper run from the CLI)
+# are picked up at most JOBS_READ_MODEL_MAX_LAG seconds later.
+
+# A filter whose rows are fewer than 1 in SPARSE_RATIO of the catalog is
+# answered by sorting its rows; denser ones by walking a presorted permutation
+SPARSE_RATIO = 32
+MASK_CACHE_SIZE = 256
+LOAD_BATCH = 5000
+REFRESH_BATCH = 1000
+
+COLUMNS = (Job.id, Job.title, Job.company, Job.location, Job.city, Job.region, Job.country, Job.job_type,
+           Job.posting_date, Job.is_remote, Job.source_url, Job.duplicate_of, Job.updated_at)
+STRING_COLUMNS = ('title', 'company', 'location', 'city', 'region', 'country', 'job_type')
+SORT_COLUMNS = ('title', 'posting_date')
+# Databases whose string equality is exact (MySQL's default collations ignore case)
+EXACT_DIALECTS = ('sqlite', 'postgresql')
+
+# SQLite's lower() only folds ASCII letters
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def ascii_lower(value):
+    return value.translate(_ASCII_LOWER)
+
+
+@lru_cache(maxsize=4096)
+def iso_date(ordinal):
+    return date.fromordinal(ordinal).isoformat()
+
+
+@lru_cache(maxsize=64)
+def row_type(fields):
+    return namedtuple('ReadModelRow', fields)
+
+
+class StringColumn:
+    """Dictionary-encoded strings: each distinct value stored once, an int code per row (0 = NULL)."""
+
+    def __init__(self):
+        self.values = [None]
+        self.code_of = {None: 0}
+        self.codes = array('l')
+
+    def encode(self, value):
+        code = self.code_of.get(value)
+        if code is None:
+            code = self.code_of[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return code
+
+    def get(self, slot):
+        return self.values[self.codes[slot]]
+
+
+class JobReadModel:
+    """Array-backed snapshot of the jobs table answering list queries; see the module comment."""
+
+    def __init__(self, max_lag=1.0):
+        self.max_lag = max_lag
+        self.lock = threading.RLock()
+        self.writes = 0
+        self.clear()
+
+    def clear(self):
+        self.loaded = False
+        self.token = 0
+        self.seen_writes = None
+        self.checked_at = 0.0
+        self.binary_collation = False
+        self.slot_of = {}       # job id -> slot
+        self.free = []          # slots of deleted jobs, reused first
+        self.ids = array('q')
+        self.strings = {name: StringColumn() for name in STRING_COLUMNS}
+        self.dates = array('l')
+        self.remote = array('b')
+        self.duplicate_of = array('q')
+        self.source_urls = []
+        self.updated_at = []
+        self.tags = []          # per slot: tuple of tag ids
+        self.tag_info = {}      # tag id -> (name, slug)
+        self.postings = {}      # (filter, value) -> array of slots
+        self.masks = OrderedDict()  # (filter, value) -> bitset of slots, most recently used last
+        self.order = {column: array('l') for column in SORT_COLUMNS}
+
+    # --- Keeping up with writes ---
+
+    def invalidate(self):
+        """Called after a write commits; the next read catches up with the change sequence."""
+        self.writes += 1
+
+    def ensure_fresh(self, connection):
+        now = time.monotonic()
+        if self.loaded and self.seen_writes == self.writes and now - self.checked_at < self.max_lag:
+            return
+        writes = self.writes
+        if not self.loaded:
+            self.load(connection)
+        elif current_token(connection) != self.token:
+            try:
+                self.catch_up(connection)
+            except TokenExpired:
+                self.load(connection)
+        self.seen_writes = writes
+        self.checked_at = now
+
+    def load(self, connection):
+        """Replaces the snapshot with the current contents of the jobs table."""
+        self.clear()
+        self.binary_collation = connection.dialect.name == 'sqlite'
+        # Read the token first: changes committed while loading are applied again later, which is harmless
+        self.token = current_token(connection)
+        self.tag_info = {tag_id: (name, slug) for tag_id, name, slug in
+                         connection.execute(select(Tag.id, Tag.name, Tag.slug))}
+        last_id = 0
+        while True:
+            rows = connection.execute(
+                select(*COLUMNS).where(Job.id > last_id).order_by(Job.id).limit(LOAD_BATCH)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            tags = self._tag_ids(connection, [row[0] for row in rows])
+            self._learn_tags(connection, tags)
+            for row in rows:
+                slot = len(self.ids)
+                self.slot_of[row[0]] = slot
+                self._write(slot, row, tags.get(row[0], ()))
+                self._index(slot, sort=False)
+        for column in SORT_COLUMNS:
+            self.order[column] = array('l', sorted(range(len(self.ids)), key=self._sort_key(column)))
+        self.loaded = True
+
+    def catch_up(self, connection):
+        """Applies every change after self.token. Raises TokenExpired if tombstones were pruned."""
+        while True:
+            changes, has_more = changes_since(connection, self.token, REFRESH_BATCH)
+            if not changes:
+                return
+            self._apply(connection, [job_id for job_id, _, deleted in changes if not deleted],
+                        [job_id for job_id, _, deleted in changes if deleted])
+            self.token = changes[-1][1]
+            if not has_more:
+                return
+
+    def _apply(self, connection, changed_ids, deleted_ids):
+        rows = connection.execute(select(*COLUMNS).where(Job.id.in_(changed_ids))).all() if changed_ids else []
+        tags = self._tag_ids(connection, [row[0] for row in rows])
+        self._learn_tags(connection, tags)
+        found = {row[0] for row in rows}
+        # A changed job that is gone by now was deleted after the change was listed
+        for job_id in list(deleted_ids) + [job_id for job_id in changed_ids if job_id not in found]:
+            slot = self.slot_of.pop(job_id, None)
+            if slot is not None:
+                self._unindex(slot)
+                self.free.append(slot)
+        for row in rows:
+            slot = self.slot_of.get(row[0])
+            if slot is not None:
+                self._unindex(slot)
+            else:
+                slot = self.free.pop() if self.free else len(self.ids)
+                self.slot_of[row[0]] = slot
+            self._write(slot, row, tags.get(row[0], ()))
+            self._index(slot)
+
+    @staticmethod
+    def _tag_ids(connection, job_ids):
+        result = {}
+        for start in range(0, len(job_ids), LOAD_BATCH):
+            rows = connection.execute(
+                select(job_tags.c.job_id, job_tags.c.tag_id)
+                .where(job_tags.c.job_id.in_(job_ids[start:start + LOAD_BATCH]))
+                .order_by(job_tags.c.job_id, job_tags.c.tag_id)
+            )
+            for job_id, tag_id in rows:
+                result.setdefault(job_id, []).append(tag_id)
+        return {job_id: tuple(tag_ids) for job_id, tag_ids in result.items()}
+
+    def _learn_tags(self, connection, tags):
+        """Loads names and slugs of tags created since the snapshot was taken."""
+        unknown = {tag_id for tag_ids in tags.values() for tag_id in tag_ids if tag_id not in self.tag_info}
+        if unknown:
+            self.tag_info.update({tag_id: (name, slug) for tag_id, name, slug in
+                                  connection.execute(select(Tag.id, Tag.name, Tag.slug).where(Tag.id.in_(unknown)))})
+
+    # --- Row storage ---
+
+    def _write(self, slot, row, tag_ids):
+        (job_id, title, company, location, city, region, country, job_type,
+         posting_date, is_remote, source_url, duplicate_of, updated_at) = row
+        values = dict(title=title, company=company, location=location, city=city, region=region,
+                      country=country, job_type=job_type)
+        if slot == len(self.ids):
+            self.ids.append(job_id)
+            for name, column in self.strings.items():
+                column.codes.append(column.encode(values[name]))
+            self.dates.append(posting_date.toordinal())
+            self.remote.append(bool(is_remote))
+            self.duplicate_of.append(duplicate_of or 0)
+            self.source_urls.append(source_url)
+            self.updated_at.append(updated_at)
+            self.tags.append(tag_ids)
+            return
+        self.ids[slot] = job_id
+        for name, column in self.strings.items():
+            column.codes[slot] = column.encode(values[name])
+        self.dates[slot] = posting_date.toordinal()
+        self.remote[slot] = bool(is_remote)
+        self.duplicate_of[slot] = duplicate_of or 0
+        self.source_urls[slot] = source_url
+        self.updated_at[slot] = updated_at
+        self.tags[slot] = tag_ids
+
+    def _filter_keys(self, slot):
+        """The (filter, value) postings a row belongs to."""
+        strings = self.strings
+        keys = [('location', ascii_lower(strings['location'].get(slot))), ('remote', bool(self.remote[slot]))]
+        for name in ('job_type', 'country', 'city'):
+            value = strings[name].get(slot)
+            if value is not None:
+                keys.append((name, value))
+        keys.extend(('tag', self.tag_info[tag_id][1]) for tag_id in self.tags[slot])
+        return keys
+
+    def _index(self, slot, sort=True):
+        bit = 1 << slot
+        for key in self._filter_keys(slot):
+            self.postings.setdefault(key, array('l')).append(slot)
+            if key in self.masks:
+                self.masks[key] |= bit
+        if sort:
+            for column, order in self.order.items():
+                order.insert(bisect_left(order, self._sort_key(column)(slot), key=self._sort_key(column)), slot)
+
+    def _unindex(self, slot):
+        bit = 1 << slot
+        for key in self._filter_keys(slot):
+            slots = self.postings[key]
+            slots.remove(slot)
+            if not slots:
+                del self.postings[key]
+                self.masks.pop(key, None)
+            elif key in self.masks:
+                self.masks[key] &= ~bit
+        for column, order in self.order.items():
+            del order[bisect_left(order, self._sort_key(column)(slot), key=self._sort_key(column))]
+
+    def _sort_key(self, column):
+        """(sort value, id) of a slot: the SQL ORDER BY column, id."""
+        ids = self.ids
+        if column == 'title':
+            values, codes = self.strings['title'].values, self.strings['title'].codes
+            return lambda slot: (values[codes[slot]], ids[slot])
+        dates = self.dates
+        return lambda slot: (dates[slot], ids[slot])
+
+    def _mask(self, key):
+        """Bitset of the slots in one posting list, cached for the most used ones."""
+        mask = self.masks.get(key)
+        if mask is not None:
+            self.masks.move_to_end(key)
+            return mask
+        slots = self.postings.get(key)
+        if not slots:
+            return 0
+        bits = bytearray((len(self.ids) >> 3) + 1)
+        for slot in slots:
+            bits[slot >> 3] |= 1 << (slot & 7)
+        mask = self.masks[key] = int.from_bytes(bits, 'little')
+        if len(self.masks) > MASK_CACHE_SIZE:
+            self.masks.popitem(last=False)
+        return mask
+
+    # --- Queries ---
+
+    def _groups(self, criteria):
+        """Filter criteria -> list of posting-key groups; a row must be in some key of every group."""
+        groups = []
+        for name in ('job_type', 'country', 'city', 'remote'):
+            if name in criteria:
+                groups.append([(name, criteria[name])])
+        if 'location' in criteria:
+            # Substring: every distinct stored location containing it
+            needle = ascii_lower(criteria['location'])
+            keys = {ascii_lower(value) for value in self.strings['location'].values if value is not None}
+            groups.append([('location', key) for key in sorted(keys) if needle in key])
+        if 'location_exact' in criteria:
+            groups.append([('location', ascii_lower(criteria['location_exact']))])
+        if 'tags' in criteria:
+            names, match_all = criteria['tags']
+            slugs = sorted({normalize_tag(n) for n in names if normalize_tag(n)})
+            if match_all:
+                groups.extend([('tag', slug)] for slug in slugs)
+            else:
+                groups.append([('tag', slug) for slug in slugs])
+        return groups
+
+    def supports(self, criteria, sort_column):
+        """Whether list_rows() matches SQL here; other requests fall back to the database."""
+        if sort_column == 'title' and not self.binary_collation:
+            return False  # ORDER BY title follows the database's collation
+        # SQL folds ?location= with the database's lower(): ascii_lower() is that
+        # on SQLite, and the same as any lower() for ASCII text
+        locations = [criteria[name] for name in ('location', 'location_exact') if name in criteria]
+        return all(location.isascii() for location in locations) or self.binary_collation
+
+    def list_rows(self, connection, criteria, sort_column, descending, position, limit, fields):
+        """
+        Rows of `fields` for jobs matching `criteria` (routes.job_routes.filter_criteria)
+        in (sort_column, id) order, starting after the (value, id) `position`:
+        all of them, or `limit` + 1 when paged. None when the query has to go
+        to the database (see supports()).
+        """
+        if connection.dialect.name not in EXACT_DIALECTS:
+            return None
+        with self.lock:
+            self.ensure_fresh(connection)
+            if not self.supports(criteria, sort_column):
+                return None
+            slots = self._select(self._groups(criteria), sort_column, descending, position,
+                                 None if limit is None else limit + 1)
+            return self._rows(slots, tuple(fields))
+
+    def _select(self, groups, sort_column, descending, position, count):
+        key = self._sort_key(sort_column)
+        if position is not None:
+            value, last_id = position
+            position = (value.toordinal() if isinstance(value, date) else value, last_id)
+        sizes = [sum(len(self.postings.get(k, ())) for k in group) for group in groups]
+
+        if groups and min(sizes) * SPARSE_RATIO <= len(self.slot_of):
+            # Few matches: take the smallest group's rows, check the rest, sort them
+            smallest = sizes.index(min(sizes))
+            candidates = {slot for k in groups[smallest] for slot in self.postings.get(k, ())}
+            others = [group for n, group in enumerate(groups) if n != smallest]
+            if others:
+                bits = self._group_bits(others)
+                candidates = [slot for slot in candidates if bits[slot >> 3] >> (slot & 7) & 1]
+            if position is not None:
+                candidates = [slot for slot in candidates
+                              if (key(slot) < position if descending else key(slot) > position)]
+            return sorted(candidates, key=key, reverse=descending)[:count]
+
+        # Many matches: walk the presorted permutation from the cursor on
+        order = self.order[sort_column]
+        if descending:
+            end = len(order) if position is None else bisect_left(order, position, key=key)
+            positions = range(end - 1, -1, -1)
+        else:
+            positions = range(0 if position is None else bisect_right(order, position, key=key), len(order))
+        if not groups:
+            return [order[i] for i in positions[:count]]
+        bits = self._group_bits(groups)
+        slots = []
+        for i in positions:
+            slot = order[i]
+            if bits[slot >> 3] >> (slot & 7) & 1:
+                slots.append(slot)
+                if len(slots) == count:
+                    break
+        return slots
+
+    def _group_bits(self, groups):
+        """AND of the groups (each an OR of its posting bitsets), as little-endian bytes."""
+        mask = -1
+        for group in groups:
+            group_mask = 0
+            for k in group:
+                group_mask |= self._mask(k)
+            mask &= group_mask
+        return max(mask, 0).to_bytes((len(self.ids) >> 3) + 1, 'little')
+
+    def _rows(self, slots, fields):
+        strings, ids, tags, tag_info = self.strings, self.ids, self.tags, self.tag_info
+        getters = {
+            'id': ids.__getitem__,
+            'is_remote': lambda slot: bool(self.remote[slot]),
+            'posting_date': lambda slot: iso_date(self.dates[slot]),
+            'tags': lambda slot: TAG_NAME_SEPARATOR.join(tag_info[t][0] for t in tags[slot]) or None,
+            'source_url': self.source_urls.__getitem__,
+            'duplicate_of': lambda slot: self.duplicate_of[slot] or None,
+            'updated_at': self.updated_at.__getitem__,
+        }
+        getters.update({name: column.get for name, column in strings.items()})
+        Row = row_type(fields)
+        columns = [getters[field] for field in fields]
+        return [Row(*[get(slot) for get in columns]) for slot in slots]
+
+
+def init_read_model(app):
+    """Gives the app its own read model when JOBS_READ_MODEL is on; it loads on first use."""
+    if app.config.get('JOBS_READ_MODEL'):
+        app.extensions['jobs_read_model'] = JobReadModel(app.config.get('JOBS_READ_MODEL_MAX_LAG', 1.0))
+    else:
+        app.extensions.pop('jobs_read_model', None)
+
+
+def active_read_model():
+    """The current app's read model, or None when it is off."""
+    return current_app.extensions.get('jobs_read_model') if has_app_context() else None
+
+
+def invalidate_read_model():
+    """Write hook: call after committing job changes."""
+    model = active_read_model()
+    if model is not None:
+        model.invalidate()
@@ -1,14 +1,41 @@
-from flask import Blueprint, request, jsonify
+import base64
+import csv
+import io
+import json
+import time
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from sqlalchemy import String, and_, func, or_, select, type_coerce, union_all
 from sqlalchemy.exc import IntegrityError, OperationalError
+from bulk import bulk_write, delete_job_row, existing_job_ids, update_job_row
+from cache import response_cache
+from compression import ENCODINGS, compress_response, compress_stream, negotiate, set_encoding_headers
 from db import db
-from model.job import Job 
+from facets import FACETS, filtered_counts, filtered_total, stored_counts, stored_total
+from locations import city_name, country_code
+from model.archive import JobArchive
+from model.job import Job, job_to_dict
+from model.tag import jobs_with_tags, split_tag_names, tag_names_column
+from read_model import active_read_model, invalidate_read_model
+from search import SearchUnavailable, ranked_matches
+from serialization import get_encoder, json_response
+from sync import TokenExpired, changes_since, current_token, parse_token
 from datetime import date, datetime
 
 # Create a Blueprint for job routes
 job_bp = Blueprint('jobs', __name__, url_prefix='/jobs')
 
+# gzip/br for buffered JSON responses (cached ones arrive already compressed)
+job_bp.after_request(compress_response)
+
 # --- Helper Functions for Validation and Data Processing ---
 
+def parse_posting_date(value):
+    """Parses a 'YYYY-MM-DD' posting date (unpadded months/days accepted). Raises ValueError."""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except TypeError:
+        raise ValueError("Invalid date format for 'posting_date'. Use 'YYYY-MM-DD'.")
+
 def validate_job_data(data, is_update=False):
     """Validates incoming job data and returns a list of error messages."""
     errors = []
@@ -24,55 +51,345 @@ def validate_job_data(data, is_update=False):
     if 'posting_date' in data and data['posting_date']:
         try:
             # Attempt to parse the date string (expecting 'YYYY-MM-DD')
-            datetime.strptime(data['posting_date'], '%Y-%m-%d').date()
+            parse_posting_date(data['posting_date'])
         except ValueError:
             errors.append("Invalid date format for 'posting_date'. Use 'YYYY-MM-DD'.")
     
     return errors
 
 def parse_tags_for_db(tags_input):
-    """Converts a list of tags or a comma-separated string into a DB-friendly string."""
-    if isinstance(tags_input, list):
-        return ', '.join(tag.strip() for tag in tags_input)
-    elif isinstance(tags_input, str):
+    """Converts a list of tags or a comma-separated string into a clean, de-duplicated tag list."""
+    if isinstance(tags_input, str):
         # Handle cases where client might send a raw string
-        return ', '.join(tag.strip() for tag in tags_input.split(','))
-    return None
-
-def apply_filters(query, args):
-    """Applies filtering from query parameters to the SQLAlchemy query."""
-    if 'job_type' in args:
-        query = query.filter(Job.job_type == args['job_type'])
+        tags_input = tags_input.split(',')
+    if not isinstance(tags_input, list):
+        return []
+    tags = [str(tag).strip() for tag in tags_input]
+    return list(dict.fromkeys(tag for tag in tags if tag))
+
+def prepare_job_row(data, is_update=False):
+    """
+    Converts validated job data into (column values, tag names) for set-based writes.
+    For updates only the fields present are returned, and tags is None when not given.
+    """
+    row = {key: data[key] for key in ('title', 'company', 'location', 'job_type', 'source_url') if key in data}
+    if data.get('posting_date'):
+        # The validator's parser: it also takes unpadded dates such as 2024-1-5
+        row['posting_date'] = parse_posting_date(data['posting_date'])
+    if not is_update:
+        row.setdefault('job_type', None)
+        row.setdefault('source_url', None)
+        row.setdefault('posting_date', date.today()) # Default to today
+    if 'tags' in data:
+        return row, parse_tags_for_db(data['tags'])
+    return row, None if is_update else []
+
+def get_arg_list(args, key):
+    """Returns every non-empty value of a (possibly repeated) query parameter."""
+    values = args.getlist(key) if hasattr(args, 'getlist') else [args.get(key)]
+    return [v for v in values if v and v.strip()]
+
+# Accepted spellings of ?remote=; anything else means "no filter"
+REMOTE_VALUES = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+
+def filter_criteria(args):
+    """
+    Normalized filters from query parameters, shared by apply_filters() and
+    the in-memory read model: {'job_type', 'location' (substring),
+    'location_exact', 'country', 'city', 'remote', 'tags': (names,
+    match_all)}, each present only when requested.
+    """
+    criteria = {}
+    # Blank values (e.g. an unset dropdown in the UI) mean "no filter"
+    if args.get('job_type'):
+        criteria['job_type'] = args['job_type']
+
+    # ?location= matches part of the location (the UI's free-text box);
+    # ?location_exact= the whole of it, e.g. a value from GET /jobs/facets
+    if args.get('location'):
+        criteria['location'] = args['location']
+
+    if args.get('location_exact'):
+        criteria['location_exact'] = args['location_exact']
+
+    # ?country= takes an ISO code, name or alias (GB, UK, United Kingdom);
+    # ?city= a city name or alias as spelled by the gazetteer.
+    if args.get('country'):
+        criteria['country'] = country_code(args['country']) or args['country'].strip().upper()
+
+    if args.get('city'):
+        criteria['city'] = city_name(args['city'])
+
+    remote = REMOTE_VALUES.get((args.get('remote') or '').strip().lower())
+    if remote is not None:
+        criteria['remote'] = remote
+
+    tags = get_arg_list(args, 'tag')
+    if tags:
+        # Repeat ?tag= for several tags; ?tag_mode=all requires every one of them.
+        criteria['tags'] = (tags, args.get('tag_mode', 'any') == 'all')
+    return criteria
+
+def apply_filters(query, args, source=Job):
+    """Applies filtering from query parameters to the SQLAlchemy query (on jobs, or JobArchive as `source`)."""
+    criteria = filter_criteria(args)
+    if 'job_type' in criteria:
+        query = query.filter(source.job_type == criteria['job_type'])
     
-    if 'location' in args:
-        # Use ILIKE for case-insensitive partial matching on location
-        query = query.filter(Job.location.ilike(f"%{args['location']}%"))
-
-    if 'tag' in args:
-        tag = args['tag']
-        # Use LIKE for partial matching on the tags string (case-insensitive for most DBs)
-        # Finds jobs where the tags string contains the requested tag
-        query = query.filter(Job.tags.ilike(f"%{tag}%"))
+    if 'location' in criteria:
+        # Case-insensitive substring match, checked while walking the sort index;
+        # both sides are folded by the database's lower(), as the read model expects
+        query = query.filter(source.location.icontains(criteria['location'], autoescape=True))
+
+    if 'location_exact' in criteria:
+        # Case-insensitive exact match, served by the lower(location) indexes
+        query = query.filter(func.lower(source.location) == func.lower(criteria['location_exact']))
+
+    # Exact matches on the parsed location columns, each with its own indexes
+    if 'country' in criteria:
+        query = query.filter(source.country == criteria['country'])
+
+    if 'city' in criteria:
+        query = query.filter(source.city == criteria['city'])
+
+    if 'remote' in criteria:
+        query = query.filter(source.is_remote == criteria['remote'])
+
+    if 'tags' in criteria:
+        # Exact (case-insensitive) tag match through the job_tags index
+        tags, match_all = criteria['tags']
+        if source is Job:
+            query = query.filter(Job.id.in_(jobs_with_tags(tags, match_all=match_all)))
+        else:
+            query = query.filter(source.with_tags(tags, match_all=match_all))
     
     return query
 
-def apply_sorting(query, args):
+# Maps each supported ?sort= value to (column attribute name, descending?)
+SORT_MODES = {
+    'title_asc': ('title', False),
+    'title_desc': ('title', True),
+    'posting_date_asc': ('posting_date', False),
+    'posting_date_desc': ('posting_date', True),
+}
+DEFAULT_SORT = 'posting_date_desc'
+
+def resolve_sort(args, source=Job):
+    """Returns the (mode, column, descending) triple for the requested sort."""
+    sort_by = args.get('sort', DEFAULT_SORT) # Default to newest first
+    if sort_by not in SORT_MODES:
+        sort_by = DEFAULT_SORT
+    column_name, descending = SORT_MODES[sort_by]
+    return sort_by, getattr(source, column_name), descending
+
+def apply_sorting(query, args, source=Job):
     """Applies sorting from query parameters to the SQLAlchemy query."""
-    sort_by = args.get('sort', 'posting_date_desc') # Default to newest first
-
-    if sort_by == 'title_asc':
-        query = query.order_by(Job.title.asc())
-    elif sort_by == 'title_desc':
-        query = query.order_by(Job.title.desc())
-    elif sort_by == 'posting_date_asc':
-        query = query.order_by(Job.posting_date.asc())
-    # Default and explicit newest-first sorting
-    elif sort_by == 'posting_date_desc': 
-        query = query.order_by(Job.posting_date.desc())
-    # Other sorting options can be added here
-        
-    # Ensure a consistent final sort (e.g., by ID) for stability
-    return query.order_by(Job.id.asc()) 
+    _, column, descending = resolve_sort(args, source)
+
+    # The ID tie-breaker follows the sort direction so that the whole ORDER BY
+    # can be served by a single (column, id) index scan, forwards or backwards.
+    if descending:
+        return query.order_by(column.desc(), source.id.desc())
+    return query.order_by(column.asc(), source.id.asc())
+
+def pack_cursor(mode, value, last_id):
+    """Encodes a keyset position as an opaque, URL-safe token."""
+    payload = json.dumps([mode, value, last_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def unpack_cursor(cursor, mode):
+    """Decodes a token from pack_cursor(). Raises ValueError if it is invalid or for another mode."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_mode, value, last_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError("Malformed cursor.")
+    if cursor_mode != mode:
+        raise ValueError("Cursor was issued for a different sort order.")
+    if not isinstance(last_id, int) or value is None:
+        raise ValueError("Malformed cursor.")
+    return value, last_id
+
+def encode_cursor(sort_mode, job):
+    """Builds the opaque cursor pointing just past `job` for the given sort mode."""
+    column_name, _ = SORT_MODES[sort_mode]
+    value = getattr(job, column_name)
+    if isinstance(value, date):
+        value = value.isoformat()
+    return pack_cursor(sort_mode, value, job.id)
+
+def decode_cursor(cursor, sort_mode):
+    """Decodes a cursor back into (sort value, id). Raises ValueError if it is invalid."""
+    value, last_id = unpack_cursor(cursor, sort_mode)
+    if SORT_MODES[sort_mode][0] == 'posting_date':
+        try:
+            value = datetime.strptime(value, '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            raise ValueError("Malformed cursor.")
+    return value, last_id
+
+def apply_cursor(query, args, cursor, source=Job):
+    """Restricts the query to rows strictly after the cursor position (keyset pagination)."""
+    sort_mode, column, descending = resolve_sort(args, source)
+    value, last_id = decode_cursor(cursor, sort_mode)
+    if descending:
+        return query.filter(or_(column < value, and_(column == value, source.id < last_id)))
+    return query.filter(or_(column > value, and_(column == value, source.id > last_id)))
+
+def parse_page_size(args, paged=False):
+    """Returns the requested page size clamped to the server-side cap, or None if unpaged."""
+    if not paged and 'limit' not in args and 'cursor' not in args:
+        return None
+    limit = args.get('limit', current_app.config['JOBS_PAGE_SIZE'])
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("'limit' must be a positive integer.")
+    if limit < 1:
+        raise ValueError("'limit' must be a positive integer.")
+    return min(limit, current_app.config['JOBS_MAX_PAGE_SIZE'])
+
+# Columns a list response can project (?fields=id,title,...), in default output order.
+# posting_date is read as stored text where the driver allows, skipping date
+# conversion; tags come pre-aggregated by tag_names_column().
+JOB_FIELDS = {
+    'id': Job.id,
+    'title': Job.title,
+    'company': Job.company,
+    'location': Job.location,
+    'city': Job.city,
+    'region': Job.region,
+    'country': Job.country,
+    'is_remote': Job.is_remote,
+    'posting_date': type_coerce(Job.posting_date, String).label('posting_date'),
+    'job_type': Job.job_type,
+    'tags': tag_names_column(Job.id).label('tags'),
+    'source_url': Job.source_url,
+    'duplicate_of': Job.duplicate_of,
+    'updated_at': Job.updated_at,
+}
+
+def parse_fields(args):
+    """Returns the ?fields= sparse fieldset (all fields by default). Raises ValueError on unknown names."""
+    raw = args.get('fields')
+    if not raw:
+        return list(JOB_FIELDS)
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in JOB_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown) or raw}. Use {', '.join(JOB_FIELDS)}.")
+    return fields
+
+# jobs_archive counterparts of JOB_FIELDS, for ?include_archived=true
+ARCHIVE_FIELDS = dict({f: getattr(JobArchive, f) for f in JOB_FIELDS if f != 'tags'}, tags=JobArchive.tag_names)
+
+def include_archived(args):
+    """True for ?include_archived=true: read archived postings along with the live ones."""
+    return (args.get('include_archived') or '').strip().lower() in ('true', '1', 'yes')
+
+def history_source(args, fields):
+    """
+    Filtered jobs and jobs_archive rows as one subquery with `fields` as
+    columns (posting_date as a date, for sorting and cursors), for lists
+    with ?include_archived=true.
+    """
+    live = select(*[(Job.posting_date if f == 'posting_date' else JOB_FIELDS[f]).label(f) for f in fields])
+    archived = select(*[ARCHIVE_FIELDS[f].label(f) for f in fields])
+    return union_all(
+        apply_filters(live, args), apply_filters(archived, args, source=JobArchive),
+    ).subquery('history')
+
+def rows_to_dicts(rows, fields):
+    """Plain dicts for column-only rows; columns selected beyond `fields` are dropped."""
+    jobs = [dict(zip(fields, row)) for row in rows]
+    if 'tags' in fields:
+        for job in jobs:
+            job['tags'] = split_tag_names(job['tags'])
+    return jobs
+
+# Fields (and CSV column order) produced by the export endpoint
+EXPORT_FIELDS = ['id', 'title', 'company', 'location', 'city', 'region', 'country', 'is_remote',
+                 'posting_date', 'job_type', 'tags', 'source_url', 'duplicate_of', 'updated_at']
+
+def iter_export_rows(args, batch_size):
+    """
+    Yields filtered, sorted jobs as plain dicts without building ORM instances.
+    Rows are fetched from a server-side cursor `batch_size` at a time, so
+    memory use does not depend on the size of the result.
+    """
+    query = db.session.query(
+        Job.id, Job.title, Job.company, Job.location, Job.city, Job.region, Job.country, Job.is_remote,
+        Job.posting_date, Job.job_type, tag_names_column(Job.id), Job.source_url, Job.duplicate_of, Job.updated_at,
+    )
+    query = apply_sorting(apply_filters(query, args), args)
+
+    for (job_id, title, company, location, city, region, country, is_remote,
+         posting_date, job_type, tag_names, source_url, duplicate_of, updated_at) in query.yield_per(batch_size):
+        yield {
+            'id': job_id,
+            'title': title,
+            'company': company,
+            'location': location,
+            'city': city,
+            'region': region,
+            'country': country,
+            'is_remote': is_remote,
+            'posting_date': posting_date.isoformat() if posting_date else None,
+            'job_type': job_type,
+            'tags': split_tag_names(tag_names),
+            'source_url': source_url,
+            'duplicate_of': duplicate_of,
+            'updated_at': updated_at.isoformat() if updated_at else None,
+        }
+
+def generate_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row) + '\n'
+
+def generate_csv(rows, flush_every=500):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([', '.join(row[f]) if f == 'tags' else row[f] for f in EXPORT_FIELDS])
+        if count % flush_every == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+EXPORT_FORMATS = {
+    'ndjson': (generate_ndjson, 'application/x-ndjson'),
+    'csv': (generate_csv, 'text/csv'),
+}
+
+def version_etag(version):
+    """ETag of a live job's representation: its version, bumped by every write."""
+    return f'v{version}'
+
+def if_match_versions():
+    """
+    Job versions the request's If-Match accepts (compressed variants'
+    "-gzip"/"-br" suffixes ignored), or None when it has no If-Match or "*".
+    Tags that are not version ETags can never match.
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    versions = []
+    for etag in if_match.as_set():
+        for encoding in ENCODINGS:
+            if etag.endswith(f'-{encoding}'):
+                etag = etag[:-len(encoding) - 1]
+        if etag.startswith('v') and etag[1:].isdigit():
+            versions.append(int(etag[1:]))
+    return versions
+
+def missing_job_response(job_id, versions):
+    """404, or 412 when the job exists but If-Match named another version."""
+    if versions is not None and existing_job_ids(db.session.connection(), [job_id]):
+        return jsonify({"error": f"Job with ID {job_id} was modified; fetch it again and retry."}), 412
+    return jsonify({"error": f"Job with ID {job_id} not found."}), 404
 
 # --- CRUD Endpoints ---
 
@@ -90,12 +407,12 @@ def create_job():
 
     try:
         # Process tags and date
-        tags_db_format = parse_tags_for_db(data.get('tags'))
+        tags = parse_tags_for_db(data.get('tags'))
         
         # Determine posting_date
         posting_date = data.get('posting_date')
         if posting_date:
-            posting_date = datetime.strptime(posting_date, '%Y-%m-%d').date()
+            posting_date = parse_posting_date(posting_date)
         else:
             posting_date = date.today() # Default to today
 
@@ -106,10 +423,13 @@ def create_job():
             location=data['location'],
             posting_date=posting_date,
             job_type=data.get('job_type'),
-            tags=tags_db_format
+            source_url=data.get('source_url'),
         )
+        new_job.set_tags_from_list(tags)
         db.session.add(new_job)
         db.session.commit()
+        response_cache.invalidate([new_job.id])
+        invalidate_read_model()
 
         # 3. Success Response
         return jsonify(new_job.to_dict()), 201
@@ -123,25 +443,141 @@ def create_job():
         return jsonify({"error": "An unexpected error occurred during creation.", "details": str(e)}), 500
 
 
+@job_bp.route('/bulk', methods=['POST'])
+def bulk_jobs():
+    """Endpoint to create, update and delete many job listings in one request (BULK)."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "No input data provided"}), 400
+
+    upserts = data.get('upsert', [])
+    deletes = data.get('delete', [])
+    if not isinstance(upserts, list) or not isinstance(deletes, list):
+        return jsonify({"error": "'upsert' and 'delete' must be lists."}), 400
+    max_items = current_app.config['JOBS_BULK_MAX_ITEMS']
+    if len(upserts) + len(deletes) > max_items:
+        return jsonify({"error": f"A bulk request may contain at most {max_items} items."}), 413
+
+    # 1. Validation, per item. Invalid items are reported and skipped.
+    errors = []
+    creates, updates = [], []
+    for index, item in enumerate(upserts):
+        if not isinstance(item, dict):
+            errors.append({"op": "upsert", "index": index, "messages": ["Item must be an object."]})
+            continue
+        is_update = 'id' in item
+        messages = validate_job_data(item, is_update=is_update)
+        if is_update and (not isinstance(item['id'], int) or isinstance(item['id'], bool)):
+            messages.append("Field 'id' must be an integer.")
+        if messages:
+            errors.append({"op": "upsert", "index": index, "messages": messages})
+            continue
+        try:
+            row, tags = prepare_job_row(item, is_update=is_update)
+        except ValueError as e:
+            errors.append({"op": "upsert", "index": index, "messages": [str(e)]})
+            continue
+        if is_update:
+            row['id'] = item['id']
+            updates.append((row, tags))
+        else:
+            creates.append((row, tags))
+
+    delete_ids = []
+    for index, job_id in enumerate(deletes):
+        if not isinstance(job_id, int) or isinstance(job_id, bool):
+            errors.append({"op": "delete", "index": index, "messages": ["Job ID must be an integer."]})
+        else:
+            delete_ids.append(job_id)
+
+    # 2. Chunked, set-based writes
+    try:
+        result = bulk_write(
+            creates, updates, delete_ids,
+            chunk_size=current_app.config['JOBS_BULK_CHUNK_SIZE'],
+            commit_every=current_app.config['JOBS_BULK_COMMIT_EVERY'],
+        )
+    except IntegrityError as e:
+        return jsonify({"error": "Database integrity error during bulk write.", "details": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "An unexpected error occurred during bulk write.", "details": str(e)}), 500
+
+    for job_id in result['missing']:
+        errors.append({"op": "update/delete", "id": job_id, "messages": [f"Job with ID {job_id} not found."]})
+
+    # 3. Success Response
+    return jsonify({
+        "created": result['created'],
+        "updated": result['updated'],
+        "unchanged": result['unchanged'],
+        "deleted": result['deleted'],
+        "near_duplicates": result['near_duplicates'],
+        "errors": errors,
+    }), 200
+
+
 @job_bp.route('/', methods=['GET'])
 def list_jobs():
     """Endpoint to retrieve a list of job listings with filtering/sorting (READ list)."""
     args = request.args
+    return response_cache.respond(response_cache.list_key('list', args), lambda: build_list_response(args))
+
+
+def build_list_response(args):
+    """Runs the list query for `args` and returns a (response, status) pair."""
+    # 1. Initial Query: plain columns for the requested fields, no ORM instances.
+    #    id and the sort column are always selected for the keyset cursor.
+    try:
+        fields = parse_fields(args)
+    except ValueError as e:
+        return jsonify({"error": "Invalid fields parameter.", "details": str(e)}), 400
+    sort_mode = resolve_sort(args)[0]
+    selected = fields + [f for f in ('id', SORT_MODES[sort_mode][0]) if f not in fields]
     
-    # 1. Initial Query
-    query = Job.query
-    
-    # 2. Filtering
-    query = apply_filters(query, args)
+    # 2. Filtering (archived postings too for ?include_archived=true, from a union of both tables)
+    history = include_archived(args)
+    if history:
+        source = history_source(args, selected).c
+        query = select(*[type_coerce(source.posting_date, String).label(f) if f == 'posting_date' else source[f]
+                         for f in selected])
+    else:
+        source = Job
+        query = apply_filters(select(*[JOB_FIELDS[f] for f in selected]), args)
     
     # 3. Sorting
-    query = apply_sorting(query, args)
+    query = apply_sorting(query, args, source)
 
-    # 4. Execute Query
+    # 4. Pagination (opt-in via ?limit= / ?cursor=)
     try:
-        jobs = query.all()
-        # 5. Success Response
-        return jsonify([job.to_dict() for job in jobs]), 200
+        page_size = parse_page_size(args)
+        position = decode_cursor(args['cursor'], sort_mode) if args.get('cursor') else None
+        if position:
+            query = apply_cursor(query, args, args['cursor'], source)
+    except ValueError as e:
+        return jsonify({"error": "Invalid pagination parameters.", "details": str(e)}), 400
+
+    # 5. Execute Query: from the in-memory read model when it is on and can
+    #    answer (read_model.py), otherwise in the database
+    try:
+        rows = None
+        model = None if history else active_read_model()
+        if model is not None:
+            column_name, descending = SORT_MODES[sort_mode]
+            rows = model.list_rows(db.session.connection(), filter_criteria(args), column_name, descending,
+                                   position, page_size, selected)
+        if rows is None:
+            rows = db.session.execute(query if page_size is None else query.limit(page_size + 1)).all()
+
+        # 6. Success Response
+        if page_size is None:
+            return json_response(rows_to_dicts(rows, fields))
+
+        # One extra row was fetched to learn whether another page exists
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(sort_mode, rows[-1])
+        return json_response({"jobs": rows_to_dicts(rows, fields), "next_cursor": next_cursor})
     except OperationalError as e:
         # Handle database operation errors (e.g., bad filter/sort column)
         return jsonify({"error": "Database query error.", "details": str(e)}), 500
@@ -149,53 +585,280 @@ def list_jobs():
         return jsonify({"error": "An unexpected error occurred during retrieval.", "details": str(e)}), 500
 
 
+# Query parameters that filter on each facet; a facet's own filter is left out
+# of its counts so the UI can still offer the alternatives. Tags in
+# tag_mode=all narrow each other, so the tag facet keeps its filter there.
+FACET_FILTER_ARGS = {
+    'job_type': ('job_type',),
+    'location': ('location', 'location_exact'),
+    'tag': ('tag', 'tag_mode'),
+    'country': ('country',),
+    'city': ('city',),
+    'remote': ('remote',),
+}
+
+def has_filters(args):
+    return bool(
+        any(args.get(key) for key in ('job_type', 'location', 'location_exact', 'country', 'city'))
+        or (args.get('remote') or '').strip().lower() in REMOTE_VALUES
+        or get_arg_list(args, 'tag')
+    )
+
+def without_facet_filter(args, facet):
+    if facet == 'tag' and args.get('tag_mode') == 'all':
+        return args
+    args = args.copy()
+    for key in FACET_FILTER_ARGS[facet]:
+        args.poplist(key)
+    return args
+
+def parse_facet_limit(args):
+    """Returns the number of values to list per facet. Raises ValueError if invalid."""
+    limit = args.get('facet_limit')
+    if limit is None:
+        return current_app.config['JOBS_FACET_LIMIT']
+    limit = int(limit)
+    if limit < 1:
+        raise ValueError("'facet_limit' must be a positive integer.")
+    return min(limit, current_app.config['JOBS_MAX_FACET_LIMIT'])
+
+
+@job_bp.route('/facets', methods=['GET'])
+def job_facets():
+    """Endpoint returning per-value job counts for job_type, location, tag, country, city and remote (READ facets)."""
+    args = request.args
+    return response_cache.respond(response_cache.list_key('facets', args), lambda: build_facets_response(args))
+
+
+def build_facets_response(args):
+    """Counts facet values for the filter set in `args`; returns a (response, status) pair."""
+    try:
+        limit = parse_facet_limit(args)
+    except ValueError as e:
+        return jsonify({"error": "Invalid facet parameters.", "details": str(e)}), 400
+
+    try:
+        # 1. Unfiltered counts come straight from the maintained aggregates
+        if has_filters(args):
+            total = filtered_total(lambda query: apply_filters(query, args))
+        else:
+            total = stored_total()
+
+        # 2. Each facet, narrowed by the other facets' filters
+        facets = {}
+        for facet in FACETS:
+            facet_args = without_facet_filter(args, facet)
+            if has_filters(facet_args):
+                counts = filtered_counts(facet, lambda query: apply_filters(query, facet_args), limit)
+            else:
+                counts = stored_counts(facet, limit)
+            facets[facet] = [{"value": value, "count": count} for value, count in counts]
+
+        return jsonify({"total": total, "facets": facets}), 200
+    except OperationalError as e:
+        return jsonify({"error": "Database query error.", "details": str(e)}), 500
+    except Exception as e:
+        return jsonify({"error": "An unexpected error occurred while counting facets.", "details": str(e)}), 500
+
+
+@job_bp.route('/export', methods=['GET'])
+def export_jobs():
+    """Endpoint to stream every filtered job as NDJSON or CSV (READ export)."""
+    args = request.args
+    export_format = args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unsupported export format '{export_format}'. Use 'ndjson' or 'csv'."}), 400
+
+    generate, mimetype = EXPORT_FORMATS[export_format]
+    rows = iter_export_rows(args, current_app.config['JOBS_EXPORT_BATCH_SIZE'])
+    chunks = generate(rows)
+
+    # Compress on the fly, flushing per chunk so the download still streams
+    encoding = negotiate() if current_app.config.get('JOBS_COMPRESSION', True) else None
+    if encoding:
+        chunks = compress_stream(chunks, encoding)
+    response = Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=jobs.{export_format}"},
+    )
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        set_encoding_headers(response, encoding)
+    return response
+
+
+def load_changes(args, since, fields, limit):
+    """
+    Jobs changed after sync token `since` as a delta payload. Changed jobs
+    that fail the filters in `args` are listed under "removed" together with
+    deleted ones, so a client can keep a filtered copy of the list in step.
+    Raises TokenExpired.
+    """
+    connection = db.session.connection()
+    changes, has_more = changes_since(connection, since, limit)
+    live_ids = [job_id for job_id, _, deleted in changes if not deleted]
+    jobs = {}
+    if live_ids:
+        selected = fields + (['id'] if 'id' not in fields else [])
+        query = apply_filters(select(*[JOB_FIELDS[f] for f in selected]).where(Job.id.in_(live_ids)), args)
+        rows = db.session.execute(query).all()
+        jobs = {job_id: job for job_id, job in zip((row.id for row in rows), rows_to_dicts(rows, fields))}
+    return {
+        "jobs": [jobs[job_id] for job_id in live_ids if job_id in jobs],
+        "removed": [job_id for job_id, _, deleted in changes if deleted or job_id not in jobs],
+        "next_token": str(changes[-1][1] if changes else since),
+        "has_more": has_more,
+    }
+
+
+def parse_sync_args(args, token):
+    """Returns (since, fields, limit); since is the current token when none is given. Raises ValueError."""
+    since = parse_token(token) if token else current_token(db.session.connection())
+    return since, parse_fields(args), parse_page_size(args, paged=True)
+
+
+@job_bp.route('/changes', methods=['GET'])
+def job_changes():
+    """Endpoint returning the jobs created, changed or deleted since ?since=<token> (READ delta)."""
+    # 1. Without ?since= only the current token is returned; take it before
+    #    fetching the list so no change in between is missed
+    args = request.args
+    try:
+        since, fields, limit = parse_sync_args(args, args.get('since'))
+    except ValueError as e:
+        return jsonify({"error": "Invalid sync parameters.", "details": str(e)}), 400
+    if not args.get('since'):
+        return json_response({"jobs": [], "removed": [], "next_token": str(since), "has_more": False})
+
+    # 2. One page of changes, oldest first; repeat with next_token while has_more
+    try:
+        return json_response(load_changes(args, since, fields, limit))
+    except TokenExpired as e:
+        return jsonify({"error": str(e)}), 410
+    except OperationalError as e:
+        return jsonify({"error": "Database query error.", "details": str(e)}), 500
+
+
+def sse_event(event, payload, event_id=None):
+    dumps = get_encoder(current_app.config.get('JOBS_JSON_ENCODER', 'auto'))
+    head = f"id: {event_id}\n" if event_id is not None else ''
+    return f"{head}event: {event}\ndata: {dumps(payload).decode('utf-8')}\n\n"
+
+
+def generate_change_events(args, since, fields, limit):
+    """
+    Polls for changes after `since` and yields each page as a "changes"
+    event whose id is its next_token. Ends after JOBS_SYNC_STREAM_SECONDS;
+    EventSource then reconnects with Last-Event-ID and resumes from there.
+    """
+    config = current_app.config
+    poll_seconds = config['JOBS_SYNC_POLL_SECONDS']
+    deadline = time.monotonic() + config['JOBS_SYNC_STREAM_SECONDS']
+    quiet_since = time.monotonic()
+    yield f"retry: {int(poll_seconds * 1000)}\n\n"
+    while True:
+        try:
+            payload = load_changes(args, since, fields, limit)
+        except TokenExpired as e:
+            yield sse_event('expired', {"error": str(e)})
+            return
+        finally:
+            db.session.rollback()  # end the read transaction so the next poll sees new commits
+        if payload['jobs'] or payload['removed']:
+            yield sse_event('changes', payload, event_id=payload['next_token'])
+            since = int(payload['next_token'])
+            quiet_since = time.monotonic()
+            if payload['has_more']:
+                continue
+        if time.monotonic() >= deadline:
+            return
+        if time.monotonic() - quiet_since >= config['JOBS_SYNC_HEARTBEAT_SECONDS']:
+            yield ": keep-alive\n\n"  # comment line; keeps proxies from timing the stream out
+            quiet_since = time.monotonic()
+        time.sleep(poll_seconds)
+
+
+@job_bp.route('/changes/stream', methods=['GET'])
+def stream_job_changes():
+    """Endpoint pushing the same deltas as /jobs/changes as Server-Sent Events (READ delta, live)."""
+    # 1. Resume point: Last-Event-ID on reconnect, else ?since=, else "from now"
+    args = request.args
+    try:
+        since, fields, limit = parse_sync_args(args, request.headers.get('Last-Event-ID') or args.get('since'))
+    except ValueError as e:
+        return jsonify({"error": "Invalid sync parameters.", "details": str(e)}), 400
+
+    # 2. Stream until the connection time limit; sent uncompressed so each event flushes
+    return Response(
+        stream_with_context(generate_change_events(args, since, fields, limit)),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @job_bp.route('/<int:job_id>', methods=['GET'])
 def get_job(job_id):
     """Endpoint to retrieve a single job listing by ID (READ single)."""
+    if include_archived(request.args):
+        # Keyed like a list page, so archiving (any write) retires it
+        key = response_cache.list_key('job-history', {'id': job_id})
+        return response_cache.respond(key, lambda: build_job_response(job_id, archived=True))
+    return response_cache.respond(response_cache.job_key(job_id), lambda: build_job_response(job_id))
+
+
+def build_job_response(job_id, archived=False):
+    """Loads one job (falling back to jobs_archive with `archived`) and returns a (response, status) pair."""
     # 1. Retrieve Job
-    job = Job.query.get(job_id)
+    job = db.session.get(Job, job_id)
+    if job is None and archived:
+        job = db.session.get(JobArchive, job_id)
 
     # 2. Not Found Handling
     if not job:
         return jsonify({"error": f"Job with ID {job_id} not found."}), 404
 
-    # 3. Success Response
-    return jsonify(job.to_dict()), 200
+    # 3. Success Response (live jobs are tagged with their version, for If-Match)
+    response = jsonify(job.to_dict())
+    if isinstance(job, Job):
+        response.set_etag(version_etag(job.version))
+    return response, 200
 
 
 @job_bp.route('/<int:job_id>', methods=['PUT', 'PATCH'])
 def update_job(job_id):
     """Endpoint to update an existing job listing (UPDATE)."""
     data = request.get_json()
-    print(data)
     if not data:
         return jsonify({"error": "No input data provided"}), 400
 
-    # 1. Retrieve Job (Not Found Handling)
-    job = Job.query.get(job_id)
-    if not job:
-        return jsonify({"error": f"Job with ID {job_id} not found."}), 404
-
-    # 2. Validation (Use is_update=True)
+    # 1. Validation (Use is_update=True); a missing job still answers 404 first
     errors = validate_job_data(data, is_update=True)
     if errors:
+        if not existing_job_ids(db.session.connection(), [job_id]):
+            return jsonify({"error": f"Job with ID {job_id} not found."}), 404
         return jsonify({"error": "Validation failed", "messages": errors}), 400
 
     try:
-        # 3. Update fields dynamically
-        for key, value in data.items():
-            if key in ['title', 'company', 'location', 'job_type']:
-                setattr(job, key, value)
-            elif key == 'tags':
-                job.tags = parse_tags_for_db(value)
-            elif key == 'posting_date' and value:
-                 # Ensure date is parsed correctly on update
-                 job.posting_date = datetime.strptime(value, '%Y-%m-%d').date()
-        
+        # 2. One locked read by id (and version, with If-Match), one UPDATE ... RETURNING; no ORM load
+        versions = if_match_versions()
+        row, tags = prepare_job_row(data, is_update=True)
+        updated = update_job_row(db.session.connection(), job_id, row, tags, {}, versions=versions)
+
+        # 3. Not Found / Precondition Failed Handling
+        if updated is None:
+            db.session.rollback()
+            return missing_job_response(job_id, versions)
+
         db.session.commit()
+        response_cache.invalidate([job_id])
+        invalidate_read_model()
 
         # 4. Success Response
-        return jsonify(job.to_dict()), 200
+        stored, tag_names = updated
+        response = jsonify(job_to_dict(stored, tag_names))
+        response.set_etag(version_etag(stored.version))
+        return response, 200
 
     # 5. Error Handling
     except IntegrityError:
@@ -212,20 +875,23 @@ def update_job(job_id):
 @job_bp.route('/<int:job_id>', methods=['DELETE'])
 def delete_job(job_id):
     """Endpoint to delete an existing job listing (DELETE)."""
-    # 1. Retrieve Job (Not Found Handling)
-    job = Job.query.get(job_id)
-    if not job:
-        return jsonify({"error": f"Job with ID {job_id} not found."}), 404
-
     try:
-        # 2. Delete and Commit
-        db.session.delete(job)
+        # 1. One locked read by id (and version, with If-Match), then deletes by id; no ORM load
+        versions = if_match_versions()
+        if not delete_job_row(db.session.connection(), job_id, versions=versions):
+            # 2. Not Found / Precondition Failed Handling
+            db.session.rollback()
+            return missing_job_response(job_id, versions)
+
+        # 3. Commit
         db.session.commit()
+        response_cache.invalidate([job_id])
+        invalidate_read_model()
 
-        # 3. Success Response (204 No Content is RESTful for successful deletion)
+        # 4. Success Response (204 No Content is RESTful for successful deletion)
         return '', 204
     
-    # 4. Error Handling
+    # 5. Error Handling
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": "An unexpected error occurred during deletion.", "details": str(e)}), 500
@@ -242,19 +908,64 @@ def delete_job_by_name():
     if not title:
         return jsonify({"error": "Title must be provided to delete a job"}), 400
 
-    # Use case-insensitive search for safety
-    query = Job.query.filter(Job.title.ilike(title))
-    if company:
-        query = query.filter(Job.company.ilike(company))
-
-    job = query.first()
-    if not job:
-        return jsonify({"error": "Job not found"}), 404
-
     try:
-        db.session.delete(job)
+        # Case-insensitive exact match: an id-only lookup on ix_jobs_title_lower_id, oldest match first
+        criteria = [func.lower(Job.title) == func.lower(title)]
+        if company:
+            criteria.append(func.lower(Job.company) == func.lower(company))
+        job_id = db.session.execute(select(Job.id).where(*criteria).order_by(Job.id).limit(1)).scalar()
+        if job_id is None or not delete_job_row(db.session.connection(), job_id):
+            db.session.rollback()
+            return jsonify({"error": "Job not found"}), 404
+
         db.session.commit()
+        response_cache.invalidate([job_id])
+        invalidate_read_model()
         return '', 204
     except Exception as e:
         db.session.rollback()
-        return jsonify({"error": "An unexpected error occurred.", "details": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": "An unexpected error occurred.", "details": str(e)}), 500
+
+
+@job_bp.route('/search', methods=['GET'])
+def search_jobs():
+    """Endpoint to full-text search title, company and tags, best matches first (READ search)."""
+    args = request.args
+    q = args.get('q', '')
+
+    try:
+        # 1. Ranked matches from the full-text index, narrowed by the usual filters;
+        #    plain columns for the requested fields, as in GET /jobs/ (id is kept for the cursor)
+        fields = parse_fields(args)
+        selected = fields + (['id'] if 'id' not in fields else [])
+        matches = ranked_matches(q)
+        query = (select(*[JOB_FIELDS[f] for f in selected], matches.c.score)
+                 .join(matches, matches.c.job_id == Job.id))
+        query = apply_filters(query, args)
+
+        # 2. Keyset pagination over (score, id); results are always paged
+        page_size = parse_page_size(args, paged=True)
+        if args.get('cursor'):
+            score, last_id = unpack_cursor(args['cursor'], 'relevance')
+            query = query.filter(or_(
+                matches.c.score > score,
+                and_(matches.c.score == score, Job.id > last_id),
+            ))
+    except SearchUnavailable as e:
+        return jsonify({"error": str(e)}), 501
+    except ValueError as e:
+        return jsonify({"error": "Invalid search parameters.", "details": str(e)}), 400
+
+    # 3. Execute Query
+    try:
+        query = query.order_by(matches.c.score.asc(), Job.id.asc()).limit(page_size + 1)
+        rows = db.session.execute(query).all()
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = pack_cursor('relevance', rows[-1].score, rows[-1].id)
+        return json_response({"jobs": rows_to_dicts(rows, fields), "next_cursor": next_cursor})
+    except OperationalError as e:
+        return jsonify({"error": "Database query error.", "details": str(e)}), 500
+    except Exception as e:
+        return jsonify({"error": "An unexpected error occurred during search.", "details": str(e)}), 500
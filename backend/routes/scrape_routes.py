@@ -0,0 +1,89 @@
+from flask import Blueprint, current_app, jsonify, request, url_for
+from scrape_runs import ScrapeRunConflict, parse_sources, scrape_runner
+
+# Create a Blueprint for background scrape runs
+scrape_bp = Blueprint('scrape', __name__, url_prefix='/scrape')
+
+# --- Helper Functions for Validation ---
+
+def parse_bounded_int(data, name, default, maximum):
+    """Reads a positive integer option capped at `maximum`. Raises ValueError if invalid."""
+    value = data.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"'{name}' must be a positive integer.")
+    return min(value, maximum)
+
+
+def parse_scrape_options(data, config):
+    """Validates a POST /scrape/ body into (source, options). Raises ValueError if invalid."""
+    sources = parse_sources(config['JOBS_SCRAPE_SOURCES'])
+    source = data.get('source') or next(iter(sources), None)
+    if source not in sources:
+        raise ValueError(f"Unknown source '{source}'. Use one of: {', '.join(sources) or 'none configured'}.")
+
+    from Scraper.scrape import FETCHERS  # imported here: Scraper.scrape imports the app factory
+
+    fetcher = data.get('fetcher', config['JOBS_SCRAPE_FETCHER'])
+    if fetcher not in FETCHERS:
+        raise ValueError(f"Unknown fetcher '{fetcher}'. Use {' or '.join(FETCHERS)}.")
+    delay = data.get('delay', 1.5)
+    if isinstance(delay, bool) or not isinstance(delay, (int, float)) or not 0 <= delay <= 30:
+        raise ValueError("'delay' must be a number of seconds between 0 and 30.")
+
+    options = {
+        "limit": parse_bounded_int(data, 'limit', config['JOBS_SCRAPE_LIMIT'], config['JOBS_SCRAPE_MAX_LIMIT']),
+        "workers": parse_bounded_int(data, 'workers', config['JOBS_SCRAPE_WORKERS'], config['JOBS_SCRAPE_MAX_WORKERS']),
+        "delay": delay,
+        "fetcher": fetcher,
+    }
+    return source, sources[source], options
+
+
+# --- API Endpoints ---
+
+@scrape_bp.route('/', methods=['POST'])
+def start_scrape():
+    """Endpoint to start a background scrape run (202 + run; 409 if the source is busy)."""
+    # 1. Validation
+    data = request.get_json(silent=True) or {}
+    try:
+        source, start_url, options = parse_scrape_options(data, current_app.config)
+    except ValueError as e:
+        return jsonify({"error": "Invalid scrape options.", "details": str(e)}), 400
+
+    # 2. Queue the run, one per source
+    try:
+        run = scrape_runner.start(source, start_url, options)
+    except ScrapeRunConflict as e:
+        return jsonify({"error": str(e), "run": e.run.to_dict()}), 409
+
+    response = jsonify(run.to_dict())
+    response.headers['Location'] = url_for('scrape.get_scrape', run_id=run.id)
+    return response, 202
+
+
+@scrape_bp.route('/', methods=['GET'])
+def list_scrapes():
+    """Endpoint to list recent scrape runs, newest first."""
+    return jsonify([run.to_dict() for run in scrape_runner.recent()]), 200
+
+
+@scrape_bp.route('/<run_id>', methods=['GET'])
+def get_scrape(run_id):
+    """Endpoint to poll a scrape run's status and progress counters."""
+    run = scrape_runner.get(run_id)
+    if not run:
+        return jsonify({"error": f"Scrape run {run_id} not found."}), 404
+    return jsonify(run.to_dict()), 200
+
+
+@scrape_bp.route('/<run_id>/cancel', methods=['POST'])
+def cancel_scrape(run_id):
+    """Endpoint to cancel a scrape run; pages already fetched are still saved."""
+    run = scrape_runner.get(run_id)
+    if not run:
+        return jsonify({"error": f"Scrape run {run_id} not found."}), 404
+    if not run.active:
+        return jsonify({"error": f"Scrape run {run_id} already {run.status}.", "run": run.to_dict()}), 409
+    run.cancel()
+    return jsonify(run.to_dict()), 202
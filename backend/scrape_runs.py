@@ -0,0 +1,184 @@
+import threading
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+# Background scrape runs, started and monitored through /scrape.
+#
+# A run executes Scraper.scrape.run_incremental_scrape() on a small thread
+# pool outside the request thread. The pages themselves are fetched by the
+# scraper's own worker threads (and Chrome processes with the "browser"
+# fetcher), so a thread per run is enough and its progress can be shared
+# with request threads in memory. At most one run per source is queued or
+# running at a time. Cancelling a run stops it from starting new pages;
+# pages already fetched are still saved and the source's checkpoint is kept,
+# so the next run resumes with the remaining links.
+#
+# Runs live in the process that started them: with several worker
+# processes, poll the one that accepted the POST (or run a single one).
+
+STATUSES = ('queued', 'running', 'cancelling', 'completed', 'cancelled', 'failed')
+ACTIVE_STATUSES = ('queued', 'running', 'cancelling')
+ERROR_SAMPLES = 20  # most recent error messages kept per run
+
+
+class ScrapeRunConflict(Exception):
+    """Raised when a source already has an active run."""
+
+    def __init__(self, run):
+        super().__init__(f"Source '{run.source}' already has an active run ({run.id}).")
+        self.run = run
+
+
+def parse_sources(value):
+    """{name: start_url} from JOBS_SCRAPE_SOURCES ("name=url,name=url")."""
+    sources = {}
+    for item in (value or '').split(','):
+        name, _, url = item.strip().partition('=')
+        if name.strip() and url.strip():
+            sources[name.strip()] = url.strip()
+    return sources
+
+
+def utcnow():
+    return datetime.now(timezone.utc)
+
+
+class ScrapeRun:
+    """One scrape of one source; counters are updated by the scraper's threads."""
+
+    COUNTERS = ('links_discovered', 'pages_fetched', 'inserted', 'updated', 'skipped', 'near_duplicates', 'errors')
+
+    def __init__(self, source, start_url, options):
+        self.id = uuid.uuid4().hex
+        self.source = source
+        self.start_url = start_url
+        self.options = dict(options)
+        self.status = 'queued'
+        self.created_at = utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+        self.recent_errors = deque(maxlen=ERROR_SAMPLES)
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def active(self):
+        return self.status in ACTIVE_STATUSES
+
+    def add(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self.counts[name] += amount
+
+    def error(self, message):
+        with self._lock:
+            self.counts['errors'] += 1
+            self.recent_errors.append(message)
+
+    def cancel(self):
+        self._cancel.set()
+        with self._lock:
+            if self.status in ('queued', 'running'):
+                self.status = 'cancelling'
+
+    def set_status(self, status):
+        with self._lock:
+            if status == 'running' and self.cancelled:
+                return  # cancelled while queued; stays 'cancelling'
+            self.status = status
+            if status == 'running':
+                self.started_at = utcnow()
+            elif status not in ACTIVE_STATUSES:
+                self.finished_at = utcnow()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "id": self.id,
+                "source": self.source,
+                "start_url": self.start_url,
+                "status": self.status,
+                "options": self.options,
+                "created_at": self.created_at.isoformat(timespec='seconds'),
+                "started_at": self.started_at.isoformat(timespec='seconds') if self.started_at else None,
+                "finished_at": self.finished_at.isoformat(timespec='seconds') if self.finished_at else None,
+                **self.counts,
+                "recent_errors": list(self.recent_errors),
+            }
+
+
+class ScrapeRunner:
+    """Starts runs on a thread pool and keeps the latest ones for polling."""
+
+    def __init__(self):
+        self.app = None
+        self.executor = None
+        self.keep_runs = 50
+        self._runs = OrderedDict()  # id -> ScrapeRun, oldest first
+        self._active = {}  # source -> ScrapeRun
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.keep_runs = app.config.get('JOBS_SCRAPE_KEEP_RUNS', 50)
+        self.executor = ThreadPoolExecutor(max_workers=app.config.get('JOBS_SCRAPE_MAX_RUNS', 2),
+                                           thread_name_prefix='scrape-run')
+        app.extensions['jobs_scrape_runner'] = self
+
+    def start(self, source, start_url, options):
+        """Queues a run of `source`. Raises ScrapeRunConflict if one is already active."""
+        with self._lock:
+            current = self._active.get(source)
+            if current is not None:
+                raise ScrapeRunConflict(current)
+            run = ScrapeRun(source, start_url, options)
+            self._active[source] = run
+            self._runs[run.id] = run
+            self._prune()
+        self.executor.submit(self._execute, run)
+        return run
+
+    def get(self, run_id):
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def recent(self):
+        with self._lock:
+            return list(reversed(self._runs.values()))
+
+    def _execute(self, run):
+        from Scraper.scrape import checkpoint_path_for, run_incremental_scrape
+
+        try:
+            if run.cancelled:
+                return
+            run.set_status('running')
+            run_incremental_scrape(app=self.app, run=run, start_url=run.start_url,
+                                   checkpoint_path=checkpoint_path_for(run.source), headless=True,
+                                   **run.options)
+        except Exception as e:
+            run.error(f"Run failed: {e}")
+            run.set_status('failed')
+            print(f"❌ Scrape run {run.id} ({run.source}) failed: {e}")
+        finally:
+            if run.active:
+                run.set_status('cancelled' if run.cancelled else 'completed')
+            with self._lock:
+                if self._active.get(run.source) is run:
+                    del self._active[run.source]
+
+    def _prune(self):
+        """Drops the oldest finished runs beyond `keep_runs`."""
+        finished = [run_id for run_id, run in self._runs.items() if not run.active]
+        for run_id in finished[:max(0, len(self._runs) - self.keep_runs)]:
+            del self._runs[run_id]
+
+
+scrape_runner = ScrapeRunner()
@@ -0,0 +1,221 @@
+import re
+from sqlalchemy import bindparam, event, select, text
+from db import db
+
+# Full-text search over job title, company and tags.
+#
+# Each dialect keeps its own inverted index, fed from the same per-job
+# documents (id, title, company, tags):
+#   - SQLite:     FTS5 virtual table `jobs_fts` (rowid = job id), ranked by bm25
+#   - PostgreSQL: `job_search` table with a weighted tsvector + GIN index
+#   - MySQL:      `job_search` table with a FULLTEXT index
+# ORM writes are synced automatically by an after_flush hook; code that writes
+# jobs through Core statements must call sync_jobs().
+
+# Relative weight of each field when ranking (title > company > tags)
+FIELD_WEIGHTS = (10.0, 5.0, 2.0)
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts "
+    "USING fts5(title, company, tags, tokenize='porter unicode61')",
+]
+
+POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS job_search (
+        job_id INTEGER PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE,
+        title TEXT,
+        company TEXT,
+        tags TEXT,
+        document TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(company, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(tags, '')), 'C')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_job_search_document ON job_search USING gin (document)",
+]
+
+MYSQL_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS job_search (
+        job_id INT PRIMARY KEY,
+        title VARCHAR(120),
+        company VARCHAR(120),
+        tags TEXT,
+        FULLTEXT KEY ft_job_search (title, company, tags)
+    ) ENGINE=InnoDB
+    """,
+]
+
+
+class SearchUnavailable(Exception):
+    """Raised when the configured database has no supported full-text engine."""
+
+
+def dialect_name(bind=None):
+    name = (bind or db.engine).dialect.name
+    return 'mysql' if name == 'mariadb' else name
+
+
+def index_table(dialect):
+    if dialect == 'sqlite':
+        return 'jobs_fts', 'rowid'
+    if dialect in ('postgresql', 'mysql'):
+        return 'job_search', 'job_id'
+    raise SearchUnavailable(f"Full-text search is not supported on '{dialect}'.")
+
+
+def tokenize_query(q):
+    """Splits free text into safe search terms (no operators reach the engine)."""
+    return re.findall(r'\w+', (q or '').lower())
+
+
+def job_document(job):
+    """Builds the (id, title, company, tags) search document for a Job instance."""
+    return (job.id, job.title, job.company, ' '.join(tag.name for tag in job.tags))
+
+
+# --- Index maintenance ---
+
+def ensure_search_index(connection):
+    """Creates the dialect's index structures. Returns True if the index is empty."""
+    dialect = dialect_name(connection)
+    ddl = {'sqlite': SQLITE_DDL, 'postgresql': POSTGRES_DDL, 'mysql': MYSQL_DDL}.get(dialect)
+    if ddl is None:
+        return False
+    for statement in ddl:
+        connection.execute(text(statement))
+    table, _ = index_table(dialect)
+    return connection.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).first() is None
+
+
+def remove_documents(connection, job_ids):
+    """Drops the given job ids from the search index."""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return
+    table, key = index_table(dialect_name(connection))
+    statement = text(f"DELETE FROM {table} WHERE {key} IN :ids").bindparams(
+        bindparam('ids', expanding=True)
+    )
+    connection.execute(statement, {'ids': job_ids})
+
+
+def index_documents(connection, documents):
+    """(Re)indexes (id, title, company, tags) documents, replacing existing entries."""
+    documents = list(documents)
+    if not documents:
+        return
+    table, key = index_table(dialect_name(connection))
+    remove_documents(connection, [doc[0] for doc in documents])
+    connection.execute(
+        text(f"INSERT INTO {table} ({key}, title, company, tags) VALUES (:id, :title, :company, :tags)"),
+        [{'id': i, 'title': t, 'company': c, 'tags': g} for i, t, c, g in documents],
+    )
+
+
+def sync_jobs(connection, changed_ids=(), deleted_ids=()):
+    """
+    Re-reads the given jobs from the database and updates their index entries.
+    For writes made through Core statements, which the ORM hook cannot see.
+    """
+    from model.job import Job
+    from model.tag import split_tag_names, tag_names_column
+
+    try:
+        index_table(dialect_name(connection))
+    except SearchUnavailable:
+        return
+    remove_documents(connection, deleted_ids)
+    changed_ids = list(changed_ids)
+    if changed_ids:
+        rows = connection.execute(
+            select(Job.id, Job.title, Job.company, tag_names_column(Job.id))
+            .where(Job.id.in_(changed_ids))
+        )
+        index_documents(connection, [
+            (job_id, title, company, ' '.join(split_tag_names(tag_names)))
+            for job_id, title, company, tag_names in rows
+        ])
+
+
+def rebuild_search_index(batch_size=1000):
+    """Re-indexes every job from scratch, in id-ordered batches."""
+    from model.job import Job
+
+    connection = db.session.connection()
+    table, _ = index_table(dialect_name(connection))
+    connection.execute(text(f"DELETE FROM {table}"))
+    indexed = 0
+    last_id = 0
+    while True:
+        jobs = Job.query.filter(Job.id > last_id).order_by(Job.id).limit(batch_size).all()
+        if not jobs:
+            break
+        index_documents(connection, [job_document(job) for job in jobs])
+        indexed += len(jobs)
+        last_id = jobs[-1].id
+    db.session.commit()
+    return indexed
+
+
+def _sync_after_flush(session, flush_context):
+    """Keeps the search index in step with ORM writes, inside the same transaction."""
+    from model.job import Job
+
+    changed = [obj for obj in list(session.new) + list(session.dirty) if isinstance(obj, Job)]
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, Job)]
+    if not changed and not deleted:
+        return
+    connection = session.connection()
+    try:
+        index_table(dialect_name(connection))
+    except SearchUnavailable:
+        return
+    remove_documents(connection, deleted)
+    index_documents(connection, [job_document(job) for job in changed])
+
+
+def init_search(app):
+    """
+    Hooks ORM writes into the search index. The index itself is created and
+    populated by migration 0004_search_index (`flask db upgrade`).
+    """
+    if not event.contains(db.session, 'after_flush', _sync_after_flush):
+        event.listen(db.session, 'after_flush', _sync_after_flush)
+
+
+# --- Querying ---
+
+def ranked_matches(q):
+    """
+    Returns a selectable of (job_id, score) for jobs matching every term of `q`
+    (prefix matching on the last characters typed). Lower scores rank higher.
+    """
+    terms = tokenize_query(q)
+    if not terms:
+        raise ValueError("Query 'q' must contain at least one word.")
+    dialect = dialect_name()
+
+    if dialect == 'sqlite':
+        weights = ', '.join(str(w) for w in FIELD_WEIGHTS)
+        statement = text(
+            f"SELECT rowid AS job_id, bm25(jobs_fts, {weights}) AS score "
+            "FROM jobs_fts WHERE jobs_fts MATCH :q"
+        ).bindparams(q=' '.join(f'"{term}"*' for term in terms))
+    elif dialect == 'postgresql':
+        statement = text(
+            "SELECT job_id, -ts_rank(document, to_tsquery('simple', :q)) AS score "
+            "FROM job_search WHERE document @@ to_tsquery('simple', :q)"
+        ).bindparams(q=' & '.join(f'{term}:*' for term in terms))
+    elif dialect == 'mysql':
+        statement = text(
+            "SELECT job_id, -MATCH(title, company, tags) AGAINST (:q IN BOOLEAN MODE) AS score "
+            "FROM job_search WHERE MATCH(title, company, tags) AGAINST (:q IN BOOLEAN MODE)"
+        ).bindparams(q=' '.join(f'+{term}*' for term in terms))
+    else:
+        raise SearchUnavailable(f"Full-text search is not supported on '{dialect}'.")
+
+    return statement.columns(job_id=db.Integer, score=db.Float).subquery('matches')
@@ -0,0 +1,48 @@
+import json
+from datetime import date, datetime
+
+from flask import Response, current_app
+
+try:
+    import orjson
+except ImportError:  # optional, only a faster drop-in for the stdlib encoder
+    orjson = None
+
+# JSON encoders for hot read paths (list responses). They take plain dicts,
+# lists, strings, numbers and dates, and return UTF-8 bytes. Picked by
+# JOBS_JSON_ENCODER: 'auto' (orjson when installed, else stdlib), 'orjson'
+# or 'json'. Unlike jsonify, keys keep their insertion order.
+
+
+def _default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def stdlib_dumps(payload):
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=_default).encode('utf-8')
+
+
+def orjson_dumps(payload):
+    return orjson.dumps(payload)
+
+
+ENCODERS = {'json': stdlib_dumps}
+if orjson is not None:
+    ENCODERS['orjson'] = orjson_dumps
+
+
+def get_encoder(name='auto'):
+    """Returns the dumps(payload) -> bytes function registered as `name`."""
+    if name == 'auto':
+        return ENCODERS.get('orjson', stdlib_dumps)
+    if name not in ENCODERS:
+        raise RuntimeError(f"JSON encoder '{name}' is not available (installed: {', '.join(ENCODERS)}).")
+    return ENCODERS[name]
+
+
+def json_response(payload, status=200):
+    """Like jsonify(payload), status, through the configured fast encoder."""
+    dumps = get_encoder(current_app.config.get('JOBS_JSON_ENCODER', 'auto'))
+    return Response(dumps(payload), mimetype='application/json'), status
@@ -0,0 +1,194 @@
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam, delete, event, func, insert, literal, select, union_all, update
+from db import db
+from model.job import Job
+from model.sync import JobTombstone, SyncCounter
+
+# Change tracking for delta sync (GET /jobs/changes and its SSE stream).
+#
+# Every write stamps the jobs it touches with updated_at and a fresh value of
+# one monotonic change sequence (jobs.change_seq); a delete leaves a
+# job_tombstones row carrying its own sequence value. A client's sync token
+# is the last sequence value it has seen, so "what changed since" is a range
+# scan over the change_seq indexes of both tables.
+#
+# Sequence values are handed out by incrementing the 'jobs' row of
+# sync_counters inside the writing transaction. The row stays locked until
+# that transaction ends, so values become visible in the order they were
+# issued and a reader can never skip past a change that commits later.
+# The same writes bump the job's version, which If-Match checks against.
+# ORM writes are covered by the flush hooks below; code that writes jobs
+# through Core statements must call touch_jobs()/tombstone_jobs() (bulk.py
+# does, and the scraper ingests through it).
+
+jobs = Job.__table__
+tombstones = JobTombstone.__table__
+counters = SyncCounter.__table__
+
+SEQUENCE = 'jobs'
+PRUNED = 'jobs_pruned'
+
+
+class TokenExpired(Exception):
+    """Raised for a sync token older than the oldest tombstone still kept."""
+
+
+def next_change_seqs(connection, count):
+    """Reserves `count` consecutive sequence values and returns them as a range."""
+    if count <= 0:
+        return range(0)
+    statement = update(counters).where(counters.c.name == SEQUENCE).values(value=counters.c.value + count)
+    if connection.dialect.update_returning:
+        last = connection.execute(statement.returning(counters.c.value)).scalar()
+    else:
+        last = connection.execute(statement).rowcount and counter_value(connection, SEQUENCE)
+    if not last:
+        connection.execute(insert(counters), [{'name': SEQUENCE, 'value': count}])
+        last = count
+    return range(last - count + 1, last + 1)
+
+
+def counter_value(connection, name):
+    return connection.execute(select(counters.c.value).where(counters.c.name == name)).scalar() or 0
+
+
+def current_token(connection):
+    """The latest committed sequence value: a sync token that includes every change so far."""
+    return counter_value(connection, SEQUENCE)
+
+
+def touch_jobs(connection, job_ids):
+    """Marks the given (inserted or changed) jobs as changed now."""
+    job_ids = sorted(set(job_ids))
+    if not job_ids:
+        return
+    now = datetime.utcnow()
+    connection.execute(
+        update(jobs).where(jobs.c.id == bindparam('job_id'))
+        .values(change_seq=bindparam('seq'), updated_at=bindparam('now'), version=jobs.c.version + 1),
+        [{'job_id': job_id, 'seq': seq, 'now': now}
+         for job_id, seq in zip(job_ids, next_change_seqs(connection, len(job_ids)))],
+    )
+    # An id can come back (SQLite reuses the highest one); the live row supersedes its tombstone
+    connection.execute(delete(tombstones).where(tombstones.c.job_id.in_(job_ids)))
+
+
+def tombstone_jobs(connection, job_ids, seqs=None):
+    """
+    Records the given jobs as deleted; call in the transaction that deletes
+    them. `seqs` are sequence values already reserved for them, if any.
+    """
+    job_ids = list(dict.fromkeys(job_ids))
+    if not job_ids:
+        return
+    seqs = seqs or next_change_seqs(connection, len(job_ids))
+    connection.execute(delete(tombstones).where(tombstones.c.job_id.in_(job_ids)))
+    now = datetime.utcnow()
+    connection.execute(insert(tombstones), [
+        {'job_id': job_id, 'change_seq': seq, 'deleted_at': now} for job_id, seq in zip(job_ids, seqs)
+    ])
+
+
+def reset_sync_state(connection, expire_tokens=True):
+    """
+    Restarts the sequence after jobs were written without it (bench loads,
+    the migration backfill): every job gets change_seq = id and tombstones
+    are dropped. With `expire_tokens`, tokens issued before get 410, since
+    rows may have vanished without a tombstone.
+    """
+    connection.execute(update(jobs).values(change_seq=jobs.c.id, updated_at=func.coalesce(jobs.c.updated_at, datetime.utcnow())))
+    connection.execute(delete(tombstones))
+    last = max(connection.execute(select(func.max(jobs.c.id))).scalar() or 0, current_token(connection))
+    connection.execute(delete(counters))
+    connection.execute(insert(counters), [
+        {'name': SEQUENCE, 'value': last}, {'name': PRUNED, 'value': last if expire_tokens else 0},
+    ])
+
+
+def prune_tombstones(connection, older_than_days):
+    """
+    Drops tombstones older than `older_than_days`; clients holding a token
+    from before the newest pruned one must refetch the list. Returns the
+    number of tombstones removed.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    pruned_through = connection.execute(
+        select(func.max(tombstones.c.change_seq)).where(tombstones.c.deleted_at < cutoff)
+    ).scalar()
+    if pruned_through is None:
+        return 0
+    removed = connection.execute(delete(tombstones).where(tombstones.c.change_seq <= pruned_through)).rowcount
+    pruned_through = max(pruned_through, counter_value(connection, PRUNED))
+    connection.execute(delete(counters).where(counters.c.name == PRUNED))
+    connection.execute(insert(counters), [{'name': PRUNED, 'value': pruned_through}])
+    return removed
+
+
+def parse_token(token):
+    """Sync token string -> sequence value. Raises ValueError if it is malformed."""
+    try:
+        value = int(token)
+    except (TypeError, ValueError):
+        raise ValueError("Malformed sync token.")
+    if value < 0:
+        raise ValueError("Malformed sync token.")
+    return value
+
+
+def changes_since(connection, since, limit):
+    """
+    The first `limit` changes after sequence value `since`, oldest first, as
+    [(job_id, change_seq, deleted)], plus whether more follow. Each job
+    appears once, with its latest change. Raises TokenExpired if tombstones
+    the client needs have been pruned.
+    """
+    if since < counter_value(connection, PRUNED):
+        raise TokenExpired("Sync token has expired; refetch the list and start from a new token.")
+    live = (
+        select(jobs.c.id.label('job_id'), jobs.c.change_seq, literal(False).label('deleted'))
+        .where(jobs.c.change_seq > since).order_by(jobs.c.change_seq).limit(limit + 1).subquery()
+    )
+    gone = (
+        select(tombstones.c.job_id, tombstones.c.change_seq, literal(True).label('deleted'))
+        .where(tombstones.c.change_seq > since).order_by(tombstones.c.change_seq).limit(limit + 1).subquery()
+    )
+    merged = union_all(select(live), select(gone)).subquery()
+    rows = connection.execute(select(merged).order_by(merged.c.change_seq).limit(limit + 1)).all()
+    return [(job_id, seq, bool(deleted)) for job_id, seq, deleted in rows[:limit]], len(rows) > limit
+
+
+# --- ORM hooks ---
+
+def _stamp_before_flush(session, flush_context, instances):
+    """Gives inserted, changed and deleted jobs their sequence values."""
+    changed = [obj for obj in session.new if isinstance(obj, Job)]
+    changed += [obj for obj in session.dirty if isinstance(obj, Job) and session.is_modified(obj)]
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, Job) and obj.id is not None]
+    if not changed and not deleted:
+        return
+    seqs = iter(next_change_seqs(session.connection(), len(changed) + len(deleted)))
+    now = datetime.utcnow()
+    for obj in changed:
+        obj.change_seq = next(seqs)
+        obj.updated_at = now
+        if obj.id is not None:
+            obj.version = (obj.version or 0) + 1
+    session.info['sync_deleted'] = [(job_id, next(seqs)) for job_id in deleted]
+
+
+def _tombstone_after_flush(session, flush_context):
+    """Writes tombstones for deleted jobs and clears those of reused ids."""
+    deleted = session.info.pop('sync_deleted', [])
+    connection = session.connection()
+    if deleted:
+        tombstone_jobs(connection, [job_id for job_id, _ in deleted], [seq for _, seq in deleted])
+    inserted = [obj.id for obj in session.new if isinstance(obj, Job)]
+    if inserted:
+        connection.execute(delete(tombstones).where(tombstones.c.job_id.in_(inserted)))
+
+
+def init_sync(app):
+    """Hooks ORM writes into the change sequence (columns and tables from migration 0008)."""
+    if not event.contains(db.session, 'before_flush', _stamp_before_flush):
+        event.listen(db.session, 'before_flush', _stamp_before_flush)
+        event.listen(db.session, 'after_flush', _tombstone_after_flush)
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+# The backend modules import each other as top-level modules (from db import db)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+from db import db  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The app on a fresh SQLite database migrated to head; N+1 patterns raise."""
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'jobs.db'}")
+    monkeypatch.setattr(Config, 'JOBS_N_PLUS_ONE_RAISE', True)
+    monkeypatch.setattr(Config, 'JOBS_ARCHIVE_INTERVAL_SECONDS', 0)
+    app = create_app()
+    app.config['TESTING'] = True
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_job(client):
+    """Creates a job through POST /jobs/ and returns its JSON; fields override the defaults."""
+    def make(**fields):
+        data = {'title': 'Actuary', 'company': 'Acme', 'location': 'London, UK', 'posting_date': '2026-01-01'}
+        data.update(fields)
+        response = client.post('/jobs/', json=data)
+        assert response.status_code == 201, response.get_data(as_text=True)
+        return response.get_json()
+    return make
@@ -0,0 +1,66 @@
+import pytest
+
+from archive import archive_expired
+
+
+@pytest.fixture
+def aged(make_job):
+    """Two expired postings and a current one; returns their ids by title."""
+    jobs = [
+        make_job(title='Old Pricing Actuary', location='Leeds, UK', tags=['Life'], posting_date='2020-01-01'),
+        make_job(title='Old Reserving Actuary', location='Remote', tags=['Pensions'], posting_date='2020-06-01'),
+        make_job(title='Current Pricing Actuary', tags=['Life'], posting_date='2999-01-01'),
+    ]
+    return {job['title']: job['id'] for job in jobs}
+
+
+def test_archived_jobs_leave_the_live_reads(app, client, aged):
+    with app.app_context():
+        assert archive_expired(days=365, pause=0) == 2
+
+    assert [job['title'] for job in client.get('/jobs/').get_json()] == ['Current Pricing Actuary']
+    assert client.get(f"/jobs/{aged['Old Pricing Actuary']}").status_code == 404
+    facets = client.get('/jobs/facets').get_json()
+    assert facets['total'] == 1
+    assert facets['facets']['tag'] == [{'value': 'Life', 'count': 1}]
+    assert facets['facets']['location'] == [{'value': 'London, UK', 'count': 1}]
+    found = client.get('/jobs/search?q=pricing').get_json()['jobs']
+    assert [job['title'] for job in found] == ['Current Pricing Actuary']
+    assert client.get('/jobs/search?q=reserving').get_json()['jobs'] == []
+
+
+def test_archived_jobs_come_back_with_include_archived(app, client, aged):
+    live = client.get(f"/jobs/{aged['Old Pricing Actuary']}").get_json()
+    with app.app_context():
+        archive_expired(days=365, pause=0)
+
+    history = client.get('/jobs/?include_archived=true&sort=posting_date_asc').get_json()
+    assert [job['title'] for job in history] == ['Old Pricing Actuary', 'Old Reserving Actuary',
+                                                 'Current Pricing Actuary']
+    assert history[0]['tags'] == ['Life'] and history[0]['posting_date'] == '2020-01-01'
+    # Filters apply to the archived rows too
+    filtered = client.get('/jobs/?include_archived=true&tag=Pensions&fields=id').get_json()
+    assert filtered == [{'id': aged['Old Reserving Actuary']}]
+
+    archived = client.get(f"/jobs/{aged['Old Pricing Actuary']}?include_archived=true")
+    assert archived.status_code == 200
+    assert {k: archived.get_json()[k] for k in ('title', 'location', 'tags')} == \
+        {k: live[k] for k in ('title', 'location', 'tags')}
+
+
+def test_archiving_runs_in_batches(app, aged):
+    seen = []
+    with app.app_context():
+        assert archive_expired(days=365, batch_size=1, pause=0, max_batches=1, progress=seen.append) == 1
+        assert archive_expired(days=365, batch_size=1, pause=0, progress=seen.append) == 1
+        assert archive_expired(days=365, pause=0) == 0
+    assert seen == [1, 1]
+
+
+def test_archive_command(app, aged):
+    runner = app.test_cli_runner()
+    dry_run = runner.invoke(args=['jobs', 'archive', '--days', '365', '--dry-run'])
+    assert dry_run.exit_code == 0 and '2 jobs are older than 365 days' in dry_run.output
+    result = runner.invoke(args=['jobs', 'archive', '--days', '365', '--pause', '0'])
+    assert result.exit_code == 0, result.output
+    assert 'Archived 2 jobs' in result.output
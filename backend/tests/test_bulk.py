@@ -0,0 +1,59 @@
+def test_bulk_creates_updates_and_deletes_in_one_request(client, make_job):
+    kept = make_job(title='Kept')
+    dropped = make_job(title='Dropped')
+
+    response = client.post('/jobs/bulk', json={
+        'upsert': [
+            {'title': 'New', 'company': 'Acme', 'location': 'Remote', 'tags': ['Life']},
+            {'id': kept['id'], 'title': 'Kept, edited'},
+        ],
+        'delete': [dropped['id']],
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert len(body['created']) == 1
+    assert body['updated'] == [kept['id']]
+    assert body['deleted'] == [dropped['id']]
+    assert body['errors'] == []
+    assert sorted(job['title'] for job in client.get('/jobs/').get_json()) == ['Kept, edited', 'New']
+
+
+def test_bulk_reports_invalid_items_and_applies_the_rest(client, make_job):
+    response = client.post('/jobs/bulk', json={
+        'upsert': [
+            {'title': 'Valid', 'company': 'Acme', 'location': 'Remote'},
+            {'title': '', 'company': 'Acme', 'location': 'Remote'},
+            {'title': 'Bad date', 'company': 'Acme', 'location': 'Remote', 'posting_date': '2024-13-01'},
+            {'title': 'Not a string', 'company': 'Acme', 'location': 'Remote', 'posting_date': 20240105},
+            {'id': 999, 'title': 'Missing'},
+        ],
+        'delete': ['x'],
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert len(body['created']) == 1
+    assert [(e['op'], e.get('index', e.get('id'))) for e in body['errors']] == [
+        ('upsert', 1), ('upsert', 2), ('upsert', 3), ('delete', 0), ('update/delete', 999)]
+
+
+def test_bulk_accepts_unpadded_dates_like_single_creates(client):
+    response = client.post('/jobs/bulk', json={
+        'upsert': [{'title': 'Unpadded', 'company': 'Acme', 'location': 'Remote', 'posting_date': '2024-1-5'}],
+    })
+    assert response.status_code == 200
+    assert response.get_json()['errors'] == []
+    assert client.get('/jobs/').get_json()[0]['posting_date'] == '2024-01-05'
+
+
+def test_bulk_repeats_an_existing_posting_as_unchanged(client, make_job):
+    job = make_job(title='Actuary', company='Acme', location='London, UK', posting_date='2026-01-01')
+    response = client.post('/jobs/bulk', json={'upsert': [
+        {'title': 'Actuary', 'company': 'Acme', 'location': 'London, UK', 'posting_date': '2026-01-01'},
+    ]})
+    assert response.get_json()['unchanged'] == [job['id']]
+
+
+def test_bulk_limits_the_request_size(app, client):
+    app.config['JOBS_BULK_MAX_ITEMS'] = 2
+    assert client.post('/jobs/bulk', json={'delete': [1, 2, 3]}).status_code == 413
+    assert client.post('/jobs/bulk', json={'upsert': {}}).status_code == 400
@@ -0,0 +1,46 @@
+from sqlalchemy import update
+
+from cache import response_cache
+from db import db
+from model.job import Job
+from sync import touch_jobs
+
+
+def test_unchanged_job_answers_304(client, make_job):
+    job = make_job()
+    first = client.get(f"/jobs/{job['id']}")
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    again = client.get(f"/jobs/{job['id']}", headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.get_data() == b''
+
+
+def test_list_etag_changes_after_a_write(client, make_job):
+    make_job(title='First')
+    etag = client.get('/jobs/').headers['ETag']
+    assert client.get('/jobs/', headers={'If-None-Match': etag}).status_code == 304
+
+    make_job(title='Second')
+    response = client.get('/jobs/', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2
+
+
+def test_local_cache_sees_writes_from_other_processes(app, client, make_job):
+    job = make_job(title='Before')
+    assert client.get(f"/jobs/{job['id']}").get_json()['title'] == 'Before'
+    assert client.get('/jobs/').get_json()[0]['title'] == 'Before'
+
+    # What `flask jobs import` does in its own process: a committed write
+    # through the change sequence, with no invalidate() call reaching us
+    with app.app_context():
+        connection = db.session.connection()
+        connection.execute(update(Job.__table__).where(Job.id == job['id']).values(title='After'))
+        touch_jobs(connection, [job['id']])
+        db.session.commit()
+
+    response_cache.checked_at = 0.0  # as if JOBS_CACHE_MAX_LAG had passed
+    assert client.get(f"/jobs/{job['id']}").get_json()['title'] == 'After'
+    assert client.get('/jobs/').get_json()[0]['title'] == 'After'
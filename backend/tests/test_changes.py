@@ -0,0 +1,67 @@
+from archive import archive_expired
+
+
+def current_token(client):
+    return client.get('/jobs/changes').get_json()['next_token']
+
+
+def test_changes_list_edits_and_tombstones(client, make_job):
+    kept = make_job(title='Kept')
+    dropped = make_job(title='Dropped')
+    since = current_token(client)
+
+    client.put(f"/jobs/{kept['id']}", json={'title': 'Kept, edited'})
+    added = make_job(title='Added')  # before the delete: SQLite may hand a deleted id out again
+    client.delete(f"/jobs/{dropped['id']}")
+
+    delta = client.get(f'/jobs/changes?since={since}&fields=id,title').get_json()
+    assert delta['jobs'] == [{'id': kept['id'], 'title': 'Kept, edited'}, {'id': added['id'], 'title': 'Added'}]
+    assert delta['removed'] == [dropped['id']]
+    assert delta['has_more'] is False
+
+    # Nothing after the returned token
+    again = client.get(f"/jobs/changes?since={delta['next_token']}").get_json()
+    assert (again['jobs'], again['removed']) == ([], [])
+
+
+def test_changes_page_in_sequence_order(client, make_job):
+    since = current_token(client)
+    ids = [make_job(title=f'Job {n}')['id'] for n in range(3)]
+    client.delete(f'/jobs/{ids[0]}')
+
+    seen, removed, token = [], [], since
+    while True:
+        page = client.get(f'/jobs/changes?since={token}&limit=1').get_json()
+        seen += [job['id'] for job in page['jobs']]
+        removed += page['removed']
+        token = page['next_token']
+        if not page['has_more']:
+            break
+    # The deleted job's creation was superseded by its tombstone
+    assert seen == ids[1:]
+    assert removed == [ids[0]]
+
+
+def test_jobs_leaving_a_filter_are_listed_as_removed(client, make_job):
+    job = make_job(location='Remote')
+    since = current_token(client)
+    client.put(f"/jobs/{job['id']}", json={'location': 'London, UK'})
+
+    delta = client.get(f'/jobs/changes?since={since}&location=remote').get_json()
+    assert (delta['jobs'], delta['removed']) == ([], [job['id']])
+
+
+def test_archived_jobs_leave_tombstones(app, client, make_job):
+    old = make_job(title='Old', posting_date='2020-01-01')
+    make_job(title='Current', posting_date='2999-01-01')
+    since = current_token(client)
+
+    with app.app_context():
+        assert archive_expired(days=365, pause=0) == 1
+
+    delta = client.get(f'/jobs/changes?since={since}').get_json()
+    assert (delta['jobs'], delta['removed']) == ([], [old['id']])
+
+
+def test_bad_tokens_are_rejected(client):
+    assert client.get('/jobs/changes?since=abc').status_code == 400
@@ -0,0 +1,79 @@
+import json
+from datetime import date
+
+import pytest
+
+import Scraper.scrape
+
+LINKS = [f'https://example.com/actuarial-jobs/{n}' for n in range(4)]
+
+
+def scraped_job(link):
+    return {'title': f'Actuary {link[-1]}', 'company': 'Acme', 'location': 'London, UK',
+            'posting_date': date(2026, 1, 1), 'job_type': 'Full-time', 'tags': [], 'link': link}
+
+
+@pytest.fixture
+def scraper(app, tmp_path, monkeypatch):
+    """Stands in for the browser: discovery returns LINKS, workers turn links into jobs."""
+    state = {'fetched': [], 'fail_after': None, 'discoveries': 0}
+
+    def discover_links(driver, limit, delay, start_url=None):
+        state['discoveries'] += 1
+        return list(LINKS)
+
+    def iter_scraped_jobs(links, pool, limiter, **kwargs):
+        for link in links:
+            if state['fail_after'] is not None and len(state['fetched']) >= state['fail_after']:
+                raise RuntimeError('browser crashed')
+            state['fetched'].append(link)
+            yield scraped_job(link)
+
+    monkeypatch.setattr(Scraper.scrape.DriverPool, 'get', lambda self: None)
+    monkeypatch.setattr(Scraper.scrape, 'discover_links', discover_links)
+    monkeypatch.setattr(Scraper.scrape, 'iter_scraped_jobs', iter_scraped_jobs)
+    state['checkpoint'] = tmp_path / '.scrape_checkpoint.json'
+    return state
+
+
+def run(scraper):
+    return Scraper.scrape.run_incremental_scrape(limit=10, checkpoint_path=str(scraper['checkpoint']), delay=0)
+
+
+def stored_links(client):
+    return sorted(job['source_url'] for job in client.get('/jobs/').get_json())
+
+
+def test_known_links_are_not_scraped_again(client, scraper):
+    run(scraper)
+    assert scraper['fetched'] == LINKS
+    assert not scraper['checkpoint'].exists()  # removed once the run completes
+
+    scraper['fetched'].clear()
+    run(scraper)
+    assert scraper['fetched'] == []
+    assert stored_links(client) == LINKS
+
+
+def test_an_interrupted_run_resumes_from_its_checkpoint(client, scraper):
+    scraper['fail_after'] = 1
+    with pytest.raises(RuntimeError):
+        run(scraper)
+    assert stored_links(client) == []  # the crash lost the uncommitted batch...
+    assert json.loads(scraper['checkpoint'].read_text())['links'] == LINKS  # ...but not the discovered links
+
+    scraper['fail_after'] = None
+    run(scraper)
+    assert scraper['discoveries'] == 1  # resumed without crawling the listing again
+    assert stored_links(client) == LINKS
+    assert not scraper['checkpoint'].exists()
+
+
+def test_resume_skips_links_done_or_already_stored(client, scraper):
+    # links 0 and 1 were committed by the interrupted run; link 3 was stored by another one since
+    scraper['checkpoint'].write_text(json.dumps({'links': LINKS, 'done': LINKS[:2]}))
+    assert client.post('/jobs/', json={'title': 'Stored', 'company': 'Acme', 'location': 'Leeds, UK',
+                                       'source_url': LINKS[3]}).status_code == 201
+    run(scraper)
+    assert scraper['fetched'] == [LINKS[2]]
+    assert scraper['discoveries'] == 0
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+
+from coalesce import Overloaded, SingleFlight, single_flight
+
+
+class Blocked:
+    """A build that waits until released; counts its calls."""
+
+    def __init__(self, result='built'):
+        self.result = result
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(5)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class Outcome(list):
+    """Receives one thread's result or exception; `thread` is the thread."""
+
+
+def start(flights, key, build):
+    """Runs flights.run(key, build) in a thread; the returned list receives its result or exception."""
+    outcome = Outcome()
+
+    def target():
+        try:
+            outcome.append(flights.run(key, build))
+        except Exception as e:
+            outcome.append(e)
+
+    outcome.thread = threading.Thread(target=target)
+    outcome.thread.start()
+    return outcome
+
+
+def wait_for_waiting(flights, count):
+    deadline = time.monotonic() + 5
+    while flights._waiting < count:
+        assert time.monotonic() < deadline, 'followers never joined the flight'
+        time.sleep(0.001)
+
+
+def finish(*outcomes):
+    for outcome in outcomes:
+        outcome.thread.join(5)
+    return [outcome[0] for outcome in outcomes]
+
+
+def test_identical_requests_share_one_build():
+    flights = SingleFlight()
+    build = Blocked()
+    leader = start(flights, 'jobs', build)
+    assert build.started.wait(5)
+    followers = [start(flights, 'jobs', build) for _ in range(5)]
+    wait_for_waiting(flights, 5)
+
+    build.release.set()
+    assert finish(leader, *followers) == ['built'] * 6
+    assert build.calls == 1
+    assert flights._flights == {} and flights._waiting == 0
+
+
+def test_writes_start_new_flights():
+    flights = SingleFlight()
+    before = Blocked('before the write')
+    leader = start(flights, 'jobs', before)
+    assert before.started.wait(5)
+
+    flights.bump_epoch()
+    # Not coalesced into the older flight: it builds its own, fresher result
+    assert flights.run('jobs', lambda: 'after the write') == 'after the write'
+    before.release.set()
+    assert finish(leader) == ['before the write']
+
+
+def test_flights_past_the_limits_are_shed():
+    flights = SingleFlight(max_inflight=1, max_waiting=1)
+    build = Blocked()
+    leader = start(flights, 'a', build)
+    assert build.started.wait(5)
+
+    with pytest.raises(Overloaded):
+        flights.run('b', lambda: 'other key')  # a second distinct key
+    follower = start(flights, 'a', build)
+    wait_for_waiting(flights, 1)
+    with pytest.raises(Overloaded) as shed:
+        flights.run('a', build)  # a second waiter
+    assert shed.value.retry_after == 1
+
+    build.release.set()
+    assert finish(leader, follower) == ['built', 'built']
+
+
+def test_followers_give_up_after_the_timeout():
+    flights = SingleFlight(timeout=0.05)
+    build = Blocked()
+    leader = start(flights, 'jobs', build)
+    assert build.started.wait(5)
+
+    with pytest.raises(Overloaded):
+        flights.run('jobs', build)
+    assert flights._waiting == 0
+    build.release.set()
+    assert finish(leader) == ['built']
+
+
+def test_followers_get_their_own_copy_of_a_failure():
+    flights = SingleFlight()
+    failure = ValueError('query failed')
+    build = Blocked(failure)
+    leader = start(flights, 'jobs', build)
+    assert build.started.wait(5)
+    followers = [start(flights, 'jobs', build) for _ in range(3)]
+    wait_for_waiting(flights, 3)
+
+    build.release.set()
+    errors = finish(leader, *followers)
+    assert errors[0] is failure
+    for error in errors[1:]:
+        assert type(error) is ValueError and error.args == ('query failed',)
+        assert error is not failure and error.__cause__ is failure
+    assert len({id(error) for error in errors}) == 4
+
+
+def test_shed_requests_are_answered_with_429(client, make_job, monkeypatch):
+    make_job()
+    monkeypatch.setattr(single_flight, 'max_inflight', 0)
+    response = client.get('/jobs/')
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '1'
+    assert 'http_shed_requests_total{endpoint="/jobs/"} 1' in client.get('/metrics').get_data(as_text=True)
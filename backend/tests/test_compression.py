@@ -0,0 +1,99 @@
+import gzip
+import json
+import zlib
+
+import pytest
+
+from compression import ENCODINGS, GZIP_WBITS, negotiate
+
+GZIP = {'Accept-Encoding': 'gzip'}
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip', 'gzip'),
+    ('gzip;q=0.5, identity', 'gzip'),
+    ('GZIP ; Q=1', 'gzip'),
+    ('*', ENCODINGS[0]),
+    ('gzip;q=0', None),
+    ('*;q=0.5, gzip;q=0', 'br' if 'br' in ENCODINGS else None),
+    ('identity', None),
+    ('', None),
+    ('deflate, compress', None),
+    ('gzip;q=bogus', None),
+])
+def test_negotiation_follows_accept_encoding(header, expected):
+    assert negotiate(header) == expected
+
+
+@pytest.fixture
+def listing(make_job):
+    """Enough jobs for the list body to pass JOBS_COMPRESS_MIN_SIZE."""
+    for n in range(20):
+        make_job(title=f'Actuary {n}', tags=['Life', 'Pensions'])
+
+
+def test_lists_are_compressed_for_clients_that_accept_it(client, listing):
+    plain = client.get('/jobs/')
+    packed = client.get('/jobs/', headers=GZIP)
+
+    assert 'Content-Encoding' not in plain.headers
+    assert packed.headers['Content-Encoding'] == 'gzip'
+    for response in (plain, packed):
+        assert 'Accept-Encoding' in response.vary
+    assert gzip.decompress(packed.get_data()) == plain.get_data()
+    assert len(packed.get_data()) < len(plain.get_data())
+
+
+def test_each_encoding_has_its_own_etag(client, listing):
+    plain = client.get('/jobs/')
+    packed = client.get('/jobs/', headers=GZIP)
+    plain_etag, packed_etag = plain.get_etag()[0], packed.get_etag()[0]
+    assert packed_etag == f'{plain_etag}-gzip'
+
+    def revalidate(etag, headers=()):
+        return client.get('/jobs/', headers={'If-None-Match': f'"{etag}"', **dict(headers)}).status_code
+
+    assert revalidate(plain_etag) == 304
+    assert revalidate(packed_etag, GZIP) == 304
+    # A cached copy in the other encoding is not the representation asked for
+    assert revalidate(plain_etag, GZIP) == 200
+    assert revalidate(packed_etag) == 200
+
+
+def test_job_etags_carry_the_encoding(app, client, make_job):
+    app.config['JOBS_COMPRESS_MIN_SIZE'] = 0
+    url = f"/jobs/{make_job()['id']}"
+    response = client.get(url, headers=GZIP)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.get_etag() == ('v1-gzip', False)
+    assert client.get(url, headers={'If-None-Match': '"v1-gzip"', **GZIP}).status_code == 304
+
+
+def test_small_and_disabled_responses_stay_plain(app, client, make_job):
+    job = make_job()
+    small = client.get(f"/jobs/{job['id']}", headers=GZIP)
+    assert 'Content-Encoding' not in small.headers and 'Accept-Encoding' in small.vary
+
+    app.config['JOBS_COMPRESSION'] = False
+    app.config['JOBS_COMPRESS_MIN_SIZE'] = 0
+    assert 'Content-Encoding' not in client.get('/jobs/?fields=id', headers=GZIP).headers
+
+
+def test_exports_stream_gzip_chunk_by_chunk(client, listing):
+    plain = client.get('/jobs/export').get_data()
+    response = client.get('/jobs/export', headers=GZIP, buffered=False)
+    assert response.is_streamed
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.vary
+
+    # Every chunk decodes on arrival: rows are not held back until the end
+    decoder = zlib.decompressobj(GZIP_WBITS)
+    lines, pieces = [], 0
+    for chunk in response.iter_encoded():
+        text = decoder.decompress(chunk).decode('utf-8')
+        assert text == '' or text.endswith('\n')
+        lines += text.splitlines()
+        pieces += bool(text)
+    response.close()
+    assert len(lines) == 20 and pieces > 1
+    assert [json.loads(line) for line in lines] == [json.loads(line) for line in plain.decode('utf-8').splitlines()]
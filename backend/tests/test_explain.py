@@ -0,0 +1,18 @@
+from sqlalchemy import text
+
+from db import db
+from explain_check import run_explain_check
+
+
+def test_every_list_query_shape_is_index_backed(app):
+    result = app.test_cli_runner().invoke(args=['jobs', 'explain-check'])
+    assert result.exit_code == 0, result.output
+    assert 'index-backed' in result.output
+
+
+def test_a_missing_index_is_reported(app):
+    with app.app_context():
+        db.session.execute(text('DROP INDEX ix_jobs_job_type_posting_date_id'))
+        failures = run_explain_check()
+        db.session.rollback()
+    assert any('job_type' in label and 'posting_date' in label for label, _, _ in failures), failures
@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+
+
+def test_ndjson_export_streams_the_filtered_list(app, client, make_job):
+    for n in range(5):
+        make_job(title=f'Actuary {n}', tags=['Life'] if n % 2 else ['Pensions', 'Life'],
+                 posting_date=f'2026-01-0{n + 1}')
+    app.config['JOBS_EXPORT_BATCH_SIZE'] = 2  # several fetches from the cursor
+
+    response = client.get('/jobs/export?tag=pensions&sort=posting_date_asc', buffered=False)
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=jobs.ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    listed = client.get('/jobs/?tag=pensions&sort=posting_date_asc').get_json()
+    assert [row['id'] for row in rows] == [job['id'] for job in listed]
+    assert [(row['title'], row['posting_date'], row['tags']) for row in rows] == [
+        ('Actuary 0', '2026-01-01', ['Life', 'Pensions']),
+        ('Actuary 2', '2026-01-03', ['Life', 'Pensions']),
+        ('Actuary 4', '2026-01-05', ['Life', 'Pensions']),
+    ]
+
+
+def test_csv_export_has_a_header_and_joined_tags(client, make_job):
+    make_job(title='Pricing Actuary', tags=['Life', 'Pensions'])
+    make_job(title='Reserving Analyst, Senior')
+
+    response = client.get('/jobs/export?format=csv&sort=title_asc')
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [(row['title'], row['tags']) for row in rows] == [
+        ('Pricing Actuary', 'Life, Pensions'),
+        ('Reserving Analyst, Senior', ''),
+    ]
+
+
+def test_empty_and_unknown_exports(client):
+    assert client.get('/jobs/export').get_data() == b''
+    assert client.get('/jobs/export?format=xml').status_code == 400
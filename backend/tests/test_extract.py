@@ -0,0 +1,71 @@
+from datetime import date
+
+from Scraper.extract import extract_job, extract_links
+
+DETAIL_PAGE = '''<html><head>
+  <title>Pricing Actuary | Jobs</title>
+  <style>.contract-banner {{ display: none }}</style>
+  <script>window.analytics = {{ page: "contract", segment: "intern" }};</script>
+</head><body>
+  <h1 class="job-title">Pricing Actuary</h1>
+  <a href="/actuarial-employers/acme">Acme Re</a>
+  <span class="location">London, UK</span>
+  <time>2026-01-05</time>
+  <a class="tag" href="/tags/life"><span>Life</span></a>
+  <span class="badge">Pricing</span>
+  <span class="badge">Life</span>
+  <p>{description}</p>
+  <noscript>Enable JavaScript to see contract and internship roles.</noscript>
+  <script>trackPartTime("part-time");</script>
+</body></html>'''
+
+
+def page(description='Join our pricing team.'):
+    return DETAIL_PAGE.format(description=description)
+
+
+def test_extracts_fields_from_a_detail_page():
+    job = extract_job(page(), 'https://example.com/actuarial-jobs/pricing')
+    assert job == {
+        'title': 'Pricing Actuary',
+        'company': 'Acme Re',
+        'location': 'London, UK',
+        'posting_date': date(2026, 1, 5),
+        'job_type': 'Full-time',  # scripts, styles and <noscript> text don't count
+        'tags': ['Life', 'Pricing'],
+        'link': 'https://example.com/actuarial-jobs/pricing',
+    }
+
+
+def test_job_type_comes_from_the_visible_text():
+    assert extract_job(page('A 12-month contract role.'), 'u')['job_type'] == 'Contract'
+    assert extract_job(page('Our summer internship programme.'), 'u')['job_type'] == 'Internship'
+    assert extract_job(page('Part-time, three days a week.'), 'u')['job_type'] == 'Part-time'
+    # "intern" inside another word is not an internship
+    assert extract_job(page('Work with internal and international teams.'), 'u')['job_type'] == 'Full-time'
+
+
+def test_falls_back_to_the_title_tag_and_small_text():
+    html = '''<html><head><title>Reserving Analyst</title></head><body>
+      <small>Updated daily</small><small>Leeds, UK</small>
+      <span class="tag">Contract</span>
+    </body></html>'''
+    job = extract_job(html, 'u')
+    assert job['title'] == 'Reserving Analyst'
+    assert job['location'] == 'Leeds, UK'
+    assert job['job_type'] == 'Contract'  # from the tags
+    assert job['company'] == ''
+
+
+def test_extracts_unique_absolute_links():
+    html = '''<html><body>
+      <a href="/actuarial-jobs/pricing">Pricing</a>
+      <a href="actuarial-jobs/reserving">Reserving</a>
+      <a href="/actuarial-jobs/pricing">Pricing again</a>
+      <a href="/about">About</a>
+    </body></html>'''
+    assert extract_links(html, 'https://example.com/list/') == [
+        'https://example.com/actuarial-jobs/pricing',
+        'https://example.com/list/actuarial-jobs/reserving',
+    ]
+    assert extract_links(html, 'https://example.com/list/', limit=1) == ['https://example.com/actuarial-jobs/pricing']
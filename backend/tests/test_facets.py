@@ -0,0 +1,92 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from archive import archive_expired
+from bulk import upsert_jobs
+from db import db
+from facets import rebuild_facet_counts
+from model.facet import FacetCount
+
+
+def stored_counts(app):
+    """Every facet_counts row as (facet, value, count); labels keep the first-seen spelling, so they aren't compared."""
+    with app.app_context():
+        rows = db.session.execute(select(FacetCount.facet, FacetCount.value, FacetCount.count)).all()
+    return sorted(tuple(row) for row in rows)
+
+
+@pytest.fixture
+def assert_exact(app):
+    """Checks the running counts against a recount from scratch."""
+    def check():
+        running = stored_counts(app)
+        with app.app_context():
+            rebuild_facet_counts(db.session.connection())
+            db.session.commit()
+        assert running == stored_counts(app)
+        return running
+    return check
+
+
+def test_counts_follow_creates_updates_and_deletes(client, make_job, assert_exact):
+    first = make_job(title='First', location='London, UK', tags=['Life'])
+    second = make_job(title='Second', location='LONDON, uk', tags=['Life', 'P&C'], job_type='Contract')
+    make_job(title='Third', location='Remote', tags=['Pensions'])
+    counts = assert_exact()
+    assert ('location', 'london, uk', 2) in counts and ('tag', 'life', 2) in counts
+
+    client.put(f"/jobs/{first['id']}", json={'job_type': 'Part-time'})
+    assert_exact()
+    client.put(f"/jobs/{first['id']}", json={'location': 'Zurich, Switzerland'})
+    assert_exact()
+    client.put(f"/jobs/{second['id']}", json={'tags': ['Pensions', 'Pricing']})
+    counts = assert_exact()
+    assert [row[1:] for row in counts if row[0] == 'tag'] == [('life', 1), ('pensions', 2), ('pricing', 1)]
+
+    client.delete(f"/jobs/{second['id']}")
+    counts = assert_exact()
+    assert ('total', '', 2) in counts
+
+
+def test_counts_follow_bulk_writes(client, make_job, assert_exact):
+    kept = make_job(title='Kept', tags=['Life'])
+    dropped = make_job(title='Dropped', location='Remote')
+    response = client.post('/jobs/bulk', json={
+        'upsert': [
+            {'title': 'Added', 'company': 'Acme', 'location': 'Leeds, UK', 'tags': ['Life']},
+            {'id': kept['id'], 'location': 'Leeds, UK', 'tags': ['Pricing'], 'job_type': 'Contract'},
+        ],
+        'delete': [dropped['id']],
+    })
+    assert response.status_code == 200, response.get_data(as_text=True)
+    counts = assert_exact()
+    assert ('location', 'leeds, uk', 2) in counts
+
+
+def test_counts_follow_scraper_upserts(app, make_job, assert_exact):
+    make_job(title='Pricing Actuary', company='Acme', location='London, UK', tags=['Life'], job_type='Full-time')
+
+    def row(title, location, job_type, tags):
+        return ({'title': title, 'company': 'Acme', 'location': location, 'posting_date': date(2026, 1, 2),
+                 'job_type': job_type, 'source_url': None}, tags)
+
+    with app.app_context():
+        result = upsert_jobs(db.session.connection(), [
+            row('Pricing Actuary', 'London, UK', 'Contract', ['Pensions']),  # re-scraped, changed
+            row('Reserving Actuary', 'Remote', 'Full-time', ['Life']),
+            row('Capital Actuary', 'Remote', None, []),
+        ], {})
+        db.session.commit()
+    assert len(result['updated']) == 1 and len(result['inserted']) == 2
+    assert_exact()
+
+
+def test_counts_follow_archiving(app, make_job, assert_exact):
+    make_job(title='Old', location='Remote', tags=['Life'], posting_date='2020-01-01')
+    make_job(title='Current', location='Remote', tags=['Life'], posting_date='2999-01-01')
+    with app.app_context():
+        assert archive_expired(days=365, pause=0) == 1
+    counts = assert_exact()
+    assert ('location', 'remote', 1) in counts and ('tag', 'life', 1) in counts
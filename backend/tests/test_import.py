@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from importer import run_import, state_path_for
+
+
+class Interrupted(Exception):
+    pass
+
+
+def write_feed(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        for n in range(count):
+            f.write(json.dumps({'title': f'Actuary {n}', 'company': 'Acme', 'location': 'London, UK',
+                                'posting_date': '2026-01-01', 'tags': ['Life']}) + '\n')
+
+
+def stop_after_first_batch(counts, elapsed):
+    raise Interrupted()
+
+
+def test_interrupted_import_resumes_after_the_last_commit(app, client, tmp_path):
+    feed = str(tmp_path / 'feed.ndjson')
+    write_feed(feed, 5)
+
+    with app.app_context():
+        with pytest.raises(Interrupted):
+            run_import(feed, batch_size=2, progress=stop_after_first_batch)
+    assert os.path.exists(state_path_for(feed))
+    assert len(client.get('/jobs/').get_json()) == 2
+
+    with app.app_context():
+        counts = run_import(feed, batch_size=2)
+    assert counts['resumed_at'] == 2
+    assert counts['records'] == 5
+    assert counts['inserted'] == 5  # carried over from the interrupted run
+    assert not os.path.exists(state_path_for(feed))
+    assert sorted(job['title'] for job in client.get('/jobs/').get_json()) == [f'Actuary {n}' for n in range(5)]
+
+
+def test_reimporting_a_feed_skips_unchanged_postings(app, tmp_path):
+    feed = str(tmp_path / 'feed.ndjson')
+    write_feed(feed, 3)
+    with app.app_context():
+        run_import(feed)
+        counts = run_import(feed)
+    assert (counts['inserted'], counts['skipped']) == (0, 3)
+
+
+def test_csv_import_reports_invalid_records(app, client, tmp_path):
+    feed = tmp_path / 'feed.csv'
+    feed.write_text('title,company,location,posting_date,tags\n'
+                    'Pricing Actuary,Acme,"London, UK",2026-01-02,Life|Pensions\n'
+                    ',Acme,London,2026-01-02,\n')
+    invalid = []
+    with app.app_context():
+        counts = run_import(str(feed), errors=lambda record, messages: invalid.append(record))
+    assert (counts['inserted'], counts['invalid']) == (1, 1)
+    assert invalid == [2]
+    assert client.get('/jobs/').get_json()[0]['title'] == 'Pricing Actuary'
+
+
+def test_import_parses_dates_like_the_api(app, client, tmp_path):
+    feed = tmp_path / 'feed.ndjson'
+    feed.write_text(
+        json.dumps({'title': 'Unpadded', 'company': 'Acme', 'location': 'Remote', 'posting_date': '2024-1-5'}) + '\n'
+        + json.dumps({'title': 'Impossible', 'company': 'Acme', 'location': 'Remote', 'posting_date': '2024-02-30'})
+        + '\n'
+    )
+    invalid = []
+    with app.app_context():
+        counts = run_import(str(feed), errors=lambda record, messages: invalid.append(record))
+    assert (counts['inserted'], counts['invalid']) == (1, 1)
+    assert invalid == [2]
+    assert client.get('/jobs/').get_json()[0]['posting_date'] == '2024-01-05'
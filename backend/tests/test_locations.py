@@ -0,0 +1,54 @@
+import pytest
+
+from locations import ParsedLocation, city_name, country_code, parse_location
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('London, UK', ('London', 'ENG', 'GB', False)),
+    ('London, ON', ('London', 'ON', 'CA', False)),  # the region picks the Canadian London
+    ('Perth, WA', ('Perth', 'WA', 'AU', False)),  # ...and the Australian Perth
+    ('Perth, Scotland', ('Perth', 'SCT', 'GB', False)),
+    ('Paris', ('Paris', None, 'FR', False)),
+    ('Paris, TX', ('Paris', 'TX', 'US', False)),
+    ('Hartford, CT 06103', ('Hartford', 'CT', 'US', False)),
+    ('London EC2M 4AA, UK', ('London', 'ENG', 'GB', False)),
+    ('Greater London Area', ('London', 'ENG', 'GB', False)),
+    ('Smallville, KS', ('Smallville', 'KS', 'US', False)),  # unknown city next to a known region
+    ('Zürich, Switzerland', ('Zurich', None, 'CH', False)),
+    ('NYC', ('New York', 'NY', 'US', False)),
+    ('Hybrid - London', ('London', 'ENG', 'GB', False)),
+    ('Boston, MA (Remote)', ('Boston', 'MA', 'US', True)),
+    ('Remote - US', (None, None, 'US', True)),
+    ('Remote', (None, None, None, True)),
+    ('Atlantis', (None, None, None, False)),
+    ('', (None, None, None, False)),
+])
+def test_parse_location(text, expected):
+    assert parse_location(text) == ParsedLocation(*expected)
+
+
+def test_country_and_city_lookups():
+    assert country_code('uk') == country_code('United Kingdom') == 'GB'
+    assert country_code('Narnia') is None
+    assert city_name('nyc') == 'New York'
+    assert city_name(' Atlantis ') == 'Atlantis'
+
+
+def test_jobs_are_filtered_on_parsed_locations(client, make_job):
+    london_on = make_job(title='Canada', location='London, ON')
+    make_job(title='England', location='London, UK')
+    make_job(title='Australia', location='Perth, WA')
+    make_job(title='Anywhere', location='Remote - US')
+
+    def titles(query):
+        return sorted(job['title'] for job in client.get(f'/jobs/?{query}').get_json())
+
+    assert titles('city=London') == ['Canada', 'England']
+    assert titles('city=London&country=CA') == ['Canada']
+    assert titles('country=Australia') == ['Australia']
+    assert titles('remote=true') == ['Anywhere']
+    assert titles('country=US') == ['Anywhere']
+
+    # The columns follow location changes
+    client.put(f"/jobs/{london_on['id']}", json={'location': 'Perth, Scotland'})
+    assert titles('country=GB') == ['Canada', 'England']
@@ -0,0 +1,104 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from bulk import upsert_jobs
+from db import db
+from model.job import Job
+from near_duplicates import fingerprint, find_near_duplicates, similarity
+
+# The module docstring's example: abbreviations and company suffixes differ
+ORIGINAL = ('Senior Pricing Actuary', 'ACME Insurance Company', 'London, UK')
+VARIANT = ('Sr. Pricing Actuary', 'Acme Insurance Co.', 'London, UK')
+
+
+def entry(title, company, location, tags=(), posting_date=date(2026, 1, 1)):
+    return ({'title': title, 'company': company, 'location': location, 'posting_date': posting_date,
+             'job_type': None, 'source_url': None}, list(tags))
+
+
+def test_abbreviations_and_company_suffixes_are_ignored():
+    assert similarity(fingerprint(*ORIGINAL, ['Life']), fingerprint(*VARIANT, ['life'])) == 1.0
+
+
+@pytest.mark.parametrize('other', [
+    ('Junior Pricing Actuary', 'Acme Insurance Co.', 'London, UK'),  # another seniority
+    ('Pricing Actuary', 'Acme Insurance Co.', 'London, UK'),
+    ('Sr. Pricing Actuary', 'Acme Insurance Co.', 'Leeds, UK'),  # another place
+    ('Sr. Pricing Actuary', 'Globex Re', 'London, UK'),  # another company
+])
+def test_different_roles_never_match(other):
+    assert similarity(fingerprint(*ORIGINAL, []), fingerprint(*other, [])) == 0.0
+
+
+@pytest.fixture
+def original(make_job):
+    title, company, location = ORIGINAL
+    return make_job(title=title, company=company, location=location, posting_date='2026-01-01')['id']
+
+
+def upsert(app, entries, mode):
+    with app.app_context():
+        result = upsert_jobs(db.session.connection(), entries, {}, near_duplicate_mode=mode)
+        db.session.commit()
+    return result
+
+
+def duplicate_of(app):
+    """{id: duplicate_of} of every stored job."""
+    with app.app_context():
+        return dict(db.session.execute(select(Job.id, Job.duplicate_of)).all())
+
+
+def test_matches_against_stored_jobs_and_earlier_entries(app, original):
+    other = ('Junior Pricing Actuary', 'Acme Insurance Co.', 'London, UK')
+    with app.app_context():
+        matches = find_near_duplicates(db.session.connection(), [
+            ('variant', *entry(*VARIANT)),
+            ('junior', *entry(*other)),
+            ('junior again', *entry('Jr Pricing Actuary', 'Acme Insurance', 'London, UK')),
+        ], threshold=0.8)
+    # The junior role is new; its abbreviated repeat matches it, not the stored senior job
+    assert matches == {'variant': ('job', original), 'junior again': ('entry', 'junior')}
+
+
+def test_flag_mode_inserts_and_points_at_the_original(app, original):
+    result = upsert(app, [entry(*VARIANT)], 'flag')
+    [variant] = result['inserted']
+    assert result['near_duplicates'] == [original]
+    assert duplicate_of(app) == {original: None, variant: original}
+
+    # A match on a flagged duplicate resolves to its original
+    [third] = upsert(app, [entry('Senior Pricing Actuary', 'Acme Insurance Ltd', 'London, UK')], 'flag')['inserted']
+    assert duplicate_of(app)[third] == original
+
+
+def test_merge_mode_folds_postings_into_the_original(app, client, original):
+    result = upsert(app, [entry(*VARIANT, tags=['Pricing'], posting_date=date(2026, 2, 1))], 'merge')
+    assert result == {'inserted': [], 'updated': [original], 'skipped': [], 'near_duplicates': [original]}
+    job = client.get(f'/jobs/{original}').get_json()
+    assert (job['title'], job['posting_date'], job['tags']) == (ORIGINAL[0], '2026-02-01', ['Pricing'])
+
+
+def test_skip_mode_drops_postings(app, original):
+    result = upsert(app, [entry(*VARIANT)], 'skip')
+    assert result == {'inserted': [], 'updated': [], 'skipped': [original], 'near_duplicates': [original]}
+    assert duplicate_of(app) == {original: None}
+
+
+def test_off_mode_inserts_without_checking(app, original):
+    result = upsert(app, [entry(*VARIANT)], 'off')
+    [variant] = result['inserted']
+    assert result['near_duplicates'] == []
+    assert duplicate_of(app) == {original: None, variant: None}
+
+
+def test_other_seniorities_are_separate_postings(app, original):
+    result = upsert(app, [entry('Junior Pricing Actuary', 'Acme Insurance Co.', 'London, UK')], 'merge')
+    assert len(result['inserted']) == 1 and result['near_duplicates'] == []
+
+
+def test_unknown_modes_are_rejected(app):
+    with app.app_context(), pytest.raises(ValueError):
+        upsert_jobs(db.session.connection(), [entry(*VARIANT)], {}, near_duplicate_mode='drop')
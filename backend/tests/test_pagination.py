@@ -0,0 +1,49 @@
+def page_through(client, query):
+    """Follows next_cursor from the first page to the last; returns the ids in order and the page count."""
+    ids, pages, cursor = [], 0, None
+    while True:
+        url = f'/jobs/?{query}' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        body = response.get_json()
+        ids += [job['id'] for job in body['jobs']]
+        pages += 1
+        cursor = body['next_cursor']
+        if cursor is None:
+            return ids, pages
+
+
+def test_cursor_pages_cover_every_job_once(client, make_job):
+    # Shared posting dates, so the id tie-breaker decides page boundaries
+    made = [make_job(title=f'Job {n}', posting_date=f'2026-01-0{1 + n % 3}') for n in range(7)]
+
+    ids, pages = page_through(client, 'limit=2')
+    expected = sorted(made, key=lambda job: (job['posting_date'], job['id']), reverse=True)
+    assert ids == [job['id'] for job in expected]
+    assert pages == 4
+
+
+def test_cursor_follows_title_sort(client, make_job):
+    for title in ['Delta', 'alpha', 'Charlie', 'bravo', 'Echo']:
+        make_job(title=title)
+
+    ids, _ = page_through(client, 'sort=title_asc&limit=2&fields=id,title')
+    titles = {job['id']: job['title'] for job in client.get('/jobs/').get_json()}
+    assert [titles[i] for i in ids] == sorted(titles.values())
+
+
+def test_unpaged_list_is_a_plain_array(client, make_job):
+    make_job()
+    body = client.get('/jobs/').get_json()
+    assert isinstance(body, list) and len(body) == 1
+
+
+def test_bad_cursors_are_rejected(client, make_job):
+    make_job(title='First')
+    make_job(title='Second')
+    cursor = client.get('/jobs/?limit=1').get_json()['next_cursor']
+
+    assert client.get('/jobs/?cursor=not-a-cursor').status_code == 400
+    # A cursor only continues the sort order it was issued for
+    assert client.get(f'/jobs/?sort=title_asc&cursor={cursor}').status_code == 400
+    assert client.get('/jobs/?limit=0').status_code == 400
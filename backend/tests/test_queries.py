@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+import Scraper.scrape
+from cache import response_cache
+from db import db
+from metrics import NPlusOneError, track_queries
+from model.job import Job
+
+
+def scraped(count, offset=0):
+    return [{'title': f'Actuary {n}', 'company': 'Acme', 'location': 'London, UK', 'posting_date': date(2026, 1, 1),
+             'job_type': 'Full-time', 'tags': ['Life', f'Tag {n % 3}'], 'link': f'https://example.com/jobs/{n}'}
+            for n in range(offset, offset + count)]
+
+
+def test_per_row_lookups_are_reported_as_n_plus_one(app, make_job):
+    ids = [make_job(title=f'Job {n}')['id'] for n in range(12)]
+    with app.app_context():
+        with pytest.raises(NPlusOneError):
+            with track_queries('per-row lookups'):
+                for job_id in ids:
+                    db.session.execute(select(Job.title).where(Job.id == job_id)).all()
+        with track_queries('one set-based query') as tracker:
+            db.session.execute(select(Job.title).where(Job.id.in_(ids))).all()
+    assert tracker.count == 1
+
+
+@pytest.mark.parametrize('url', ['/jobs/', '/jobs/?limit=50&fields=id,title,tags', '/jobs/search?q=actuary',
+                                 '/jobs/facets', '/jobs/export?format=ndjson'])
+def test_reads_cost_the_same_for_any_number_of_rows(app, client, url, monkeypatch):
+    monkeypatch.setattr(response_cache, 'backend', None)  # count the queries, not cache hits
+
+    def statements():
+        with track_queries(url) as tracker:
+            response = client.get(url)
+            response.get_data()
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return tracker.count
+
+    with app.app_context():
+        Scraper.scrape.save_jobs_to_db(scraped(2), app=app)
+    few = statements()
+    with app.app_context():
+        Scraper.scrape.save_jobs_to_db(scraped(20, offset=2), app=app)
+    assert statements() == few
+
+
+def test_ingest_statements_do_not_grow_per_job(app):
+    def ingest(jobs):
+        with track_queries('save_jobs_to_db') as tracker:
+            Scraper.scrape.save_jobs_to_db(jobs, app=app)
+        return tracker.count
+
+    with app.app_context():
+        few = ingest(scraped(2))
+        many = ingest(scraped(40, offset=2))
+    assert many <= few + 2
+
+
+def test_metrics_count_statements_per_endpoint(client, make_job):
+    make_job()
+    client.get('/jobs/')
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'db_statements_total{endpoint="/jobs/",operation="SELECT"}' in body
@@ -0,0 +1,82 @@
+import pytest
+
+from cache import response_cache
+from read_model import JobReadModel, init_read_model
+
+QUERIES = [
+    '',
+    'limit=2',
+    'sort=title_asc',
+    'sort=title_desc&limit=3',
+    'sort=posting_date_asc&limit=2',
+    'job_type=Contract',
+    'location=zürich',
+    'location=ZÜRICH',
+    'location=lond',
+    'location=%25',
+    'location_exact=london,%20uk',
+    'location_exact=Zürich,%20CH',
+    'country=GB',
+    'city=London',
+    'remote=true',
+    'remote=false&sort=title_asc',
+    'tag=life',
+    'tag=life&tag=pensions',
+    'tag=life&tag=pensions&tag_mode=all',
+    'tag=Life&location=london&sort=title_asc&limit=1',
+    'fields=id,title,tags',
+]
+
+
+@pytest.fixture
+def catalog(client, make_job, monkeypatch):
+    monkeypatch.setattr(response_cache, 'backend', None)  # every request runs its query
+    make_job(title='Pricing Actuary', location='London, UK', tags=['Life'], posting_date='2026-01-03')
+    make_job(title='reserving analyst', location='LONDON, uk', tags=['Life', 'Pensions'], posting_date='2026-01-03')
+    make_job(title='Zeta Actuary', location='Zürich, CH', job_type='Contract', posting_date='2026-01-01')
+    make_job(title='Alpha Actuary', location='ZÜRICH, CH', tags=['Pensions'], posting_date='2026-01-02')
+    make_job(title='Remote Actuary', location='Remote', job_type='Contract', posting_date='2026-01-05')
+    make_job(title='Discount 100% Actuary', location='Leeds, UK', posting_date='2026-01-04')
+
+
+def all_pages(client, query):
+    """Every page of a list request, following next_cursor when paged."""
+    pages, url = [], f'/jobs/?{query}'
+    while True:
+        response = client.get(url)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        body = response.get_json()
+        pages.append(body)
+        if not isinstance(body, dict) or not body['next_cursor']:
+            return pages
+        url = f"/jobs/?{query}&cursor={body['next_cursor']}"
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_read_model_matches_sql(app, client, catalog, monkeypatch, query):
+    served = []
+    list_rows = JobReadModel.list_rows
+
+    def spy(self, *args, **kwargs):
+        rows = list_rows(self, *args, **kwargs)
+        served.append(rows is not None)
+        return rows
+
+    monkeypatch.setattr(JobReadModel, 'list_rows', spy)
+    expected = all_pages(client, query)
+    assert served == []
+
+    app.config['JOBS_READ_MODEL'] = True
+    init_read_model(app)
+    assert all_pages(client, query) == expected
+    assert served and all(served)  # answered by the read model, not the SQL fallback
+
+
+def test_read_model_follows_writes(app, client, catalog):
+    app.config['JOBS_READ_MODEL'] = True
+    init_read_model(app)
+    before = client.get('/jobs/?location=london').get_json()
+    job = client.post('/jobs/', json={'title': 'New', 'company': 'Acme', 'location': 'London, UK'}).get_json()
+    client.delete(f"/jobs/{before[0]['id']}")
+    after = client.get('/jobs/?location=london').get_json()
+    assert {j['id'] for j in after} == {j['id'] for j in before[1:]} | {job['id']}
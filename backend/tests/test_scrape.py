@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+import Scraper.scrape
+from config import Config
+
+LISTING = '''<html><body><ul id="jobs-list">
+  <li><a href="actuarial-jobs/pricing.html">Pricing Actuary</a></li>
+  <li><a href="actuarial-jobs/reserving.html">Reserving Analyst</a></li>
+</ul></body></html>'''
+
+JOB_PAGE = '''<html><body>
+  <h1>{title}</h1>
+  <a href="/actuarial-employers/acme">Acme Re</a>
+  <span class="location">{location}</span>
+  <time>2026-01-05</time>
+  <span class="tag">Life</span>
+</body></html>'''
+
+
+@pytest.fixture
+def stand_in(tmp_path, monkeypatch):
+    """A listing page and two job pages on disk, configured as the 'local' scrape source."""
+    pages = tmp_path / 'site'
+    (pages / 'actuarial-jobs').mkdir(parents=True)
+    (pages / 'index.html').write_text(LISTING)
+    (pages / 'actuarial-jobs' / 'pricing.html').write_text(JOB_PAGE.format(title='Pricing Actuary',
+                                                                           location='Zurich, Switzerland'))
+    (pages / 'actuarial-jobs' / 'reserving.html').write_text(JOB_PAGE.format(title='Reserving Analyst',
+                                                                             location='London, UK'))
+    monkeypatch.setattr(Config, 'JOBS_SCRAPE_SOURCES', f"local={(pages / 'index.html').as_uri()}")
+    monkeypatch.setattr(Scraper.scrape, 'CHECKPOINT_PATH', str(tmp_path / '.scrape_checkpoint.json'))
+    return pages
+
+
+def wait_for_run(client, run_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        run = client.get(f'/scrape/{run_id}').get_json()
+        if run['status'] not in ('queued', 'running', 'cancelling'):
+            return run
+        time.sleep(0.05)
+    raise AssertionError(f'scrape run {run_id} did not finish')
+
+
+def test_static_scrape_saves_the_stand_in_pages(stand_in, client):
+    response = client.post('/scrape/', json={'source': 'local', 'fetcher': 'static', 'delay': 0})
+    assert response.status_code == 202, response.get_data(as_text=True)
+
+    run = wait_for_run(client, response.get_json()['id'])
+    assert run['status'] == 'completed', run
+    assert run['pages_fetched'] == 2
+
+    jobs = {job['title']: job for job in client.get('/jobs/').get_json()}
+    assert sorted(jobs) == ['Pricing Actuary', 'Reserving Analyst']
+    assert jobs['Pricing Actuary']['company'] == 'Acme Re'
+    assert jobs['Pricing Actuary']['location'] == 'Zurich, Switzerland'
+    assert jobs['Pricing Actuary']['posting_date'] == '2026-01-05'
+    assert jobs['Pricing Actuary']['tags'] == ['Life']
+    assert jobs['Reserving Analyst']['source_url'] == (stand_in / 'actuarial-jobs' / 'reserving.html').as_uri()
+
+
+def test_second_static_scrape_skips_known_links(stand_in, client):
+    first = client.post('/scrape/', json={'source': 'local', 'fetcher': 'static', 'delay': 0}).get_json()
+    wait_for_run(client, first['id'])
+
+    second = client.post('/scrape/', json={'source': 'local', 'fetcher': 'static', 'delay': 0}).get_json()
+    run = wait_for_run(client, second['id'])
+    assert run['status'] == 'completed', run
+    assert run['pages_fetched'] == 0
+    assert len(client.get('/jobs/').get_json()) == 2
+
+
+def test_workers_share_per_host_limits_and_skip_failing_pages(stand_in, monkeypatch):
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+    fetch_html = Scraper.scrape.fetch_html
+
+    def slow_fetch(url, timeout=20):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        try:
+            time.sleep(0.05)
+            return fetch_html(url, timeout)
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    monkeypatch.setattr(Scraper.scrape, 'fetch_html', slow_fetch)
+    pages = stand_in / 'actuarial-jobs'
+    links = [(pages / name).as_uri() for name in ('pricing.html', 'missing.html', 'reserving.html', 'pricing.html')]
+    limiter = Scraper.scrape.HostRateLimiter(max_concurrent=2, min_interval=0)
+    pool = Scraper.scrape.DriverPool()
+
+    jobs = list(Scraper.scrape.iter_scraped_jobs(links, pool, limiter, workers=4, fetcher='static'))
+    assert sorted(job['title'] for job in jobs) == ['Pricing Actuary', 'Pricing Actuary', 'Reserving Analyst']
+    assert peak[0] == 2
@@ -0,0 +1,23 @@
+def test_search_results_match_the_list_format(client, make_job):
+    make_job(title='Pricing Actuary', tags=['Life'])
+    listed = client.get('/jobs/').get_json()
+
+    response = client.get('/jobs/search?q=pricing')
+    assert response.status_code == 200
+    assert response.get_json() == {'jobs': listed, 'next_cursor': None}
+    # Same key order as GET /jobs/, no ORM-only keys such as version
+    assert list(response.get_json()['jobs'][0]) == list(listed[0])
+
+
+def test_search_pages_and_fields(client, make_job):
+    for n in range(3):
+        make_job(title=f'Pricing Actuary {n}')
+
+    first = client.get('/jobs/search?q=pricing&limit=2&fields=title').get_json()
+    assert [list(job) for job in first['jobs']] == [['title'], ['title']]
+    rest = client.get(f"/jobs/search?q=pricing&limit=2&fields=title&cursor={first['next_cursor']}").get_json()
+    titles = [job['title'] for job in first['jobs'] + rest['jobs']]
+    assert sorted(titles) == [f'Pricing Actuary {n}' for n in range(3)]
+    assert rest['next_cursor'] is None
+
+    assert client.get('/jobs/search?q=pricing&fields=salary').status_code == 400
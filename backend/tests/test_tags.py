@@ -0,0 +1,33 @@
+def titles(client, query):
+    return sorted(job['title'] for job in client.get(f'/jobs/?{query}').get_json())
+
+
+def test_tag_filters_match_any_or_all(client, make_job):
+    make_job(title='Life', tags=['Life'])
+    make_job(title='Life and Pensions', tags=['life', 'Pensions'])
+    make_job(title='Pensions', tags=['PENSIONS'])
+    make_job(title='Untagged')
+
+    assert titles(client, 'tag=Life') == ['Life', 'Life and Pensions']
+    assert titles(client, 'tag=life&tag=pensions') == ['Life', 'Life and Pensions', 'Pensions']
+    assert titles(client, 'tag=life&tag=pensions&tag_mode=any') == ['Life', 'Life and Pensions', 'Pensions']
+    assert titles(client, 'tag=life&tag=pensions&tag_mode=all') == ['Life and Pensions']
+    assert titles(client, 'tag=life&tag=Reinsurance&tag_mode=all') == []
+    assert titles(client, 'tag=&tag=%20') == ['Life', 'Life and Pensions', 'Pensions', 'Untagged']
+
+
+def test_tag_filters_are_exact(client, make_job):
+    make_job(title='Reinsurance', tags=['Reinsurance'])
+    make_job(title='R', tags=['R'])
+    assert titles(client, 'tag=R') == ['R']
+    assert titles(client, 'tag=%20reinsurance%20') == ['Reinsurance']
+
+
+def test_tags_are_stored_once_per_slug(client, make_job):
+    job = make_job(tags=['Life', ' life ', 'LIFE', 'Pensions'])
+    assert job['tags'] == ['Life', 'Pensions']
+    other = make_job(title='Other', tags=['LIFE'])
+    # The tag row is shared, so it keeps its first spelling
+    assert other['tags'] == ['Life']
+    client.put(f"/jobs/{job['id']}", json={'tags': ['Pensions']})
+    assert titles(client, 'tag=life') == ['Other']
@@ -0,0 +1,76 @@
+from datetime import date
+
+from sqlalchemy import select
+
+from bulk import upsert_jobs
+from db import db
+from model.job import Job
+
+
+def entry(title, company='Acme', location='London, UK', posting_date=date(2026, 1, 1), tags=(), url=None,
+          job_type=None):
+    return ({'title': title, 'company': company, 'location': location, 'posting_date': posting_date,
+             'job_type': job_type, 'source_url': url}, list(tags))
+
+
+def upsert(app, entries):
+    """upsert_jobs() in its own transaction; returns the id lists' lengths and the result."""
+    with app.app_context():
+        result = upsert_jobs(db.session.connection(), entries, {}, near_duplicate_mode='off')
+        db.session.commit()
+    counts = {name: len(result[name]) for name in ('inserted', 'updated', 'skipped')}
+    return counts, result
+
+
+def stored(app):
+    """{title: (posting_date, job_type, source_url)} of every stored job."""
+    with app.app_context():
+        rows = db.session.execute(select(Job.title, Job.posting_date, Job.job_type, Job.source_url)).all()
+    return {title: tuple(rest) for title, *rest in rows}
+
+
+def test_counts_inserted_updated_and_skipped(app):
+    batch = [entry('Pricing Actuary', tags=['Life']), entry('Reserving Analyst', job_type='Full-time')]
+    counts, first = upsert(app, batch)
+    assert counts == {'inserted': 2, 'updated': 0, 'skipped': 0}
+
+    # Re-scraped unchanged: nothing is written
+    counts, again = upsert(app, batch)
+    assert counts == {'inserted': 0, 'updated': 0, 'skipped': 2}
+    assert sorted(again['skipped']) == sorted(first['inserted'])
+
+    counts, _ = upsert(app, [
+        entry('Pricing Actuary', tags=['Life', 'Pricing']),  # new tag
+        entry('Reserving Analyst', job_type=None),  # missing job_type keeps the stored one
+        entry('Capital Actuary', posting_date=date(2026, 1, 2)),
+    ])
+    assert counts == {'inserted': 1, 'updated': 1, 'skipped': 1}
+    assert stored(app)['Reserving Analyst'][1] == 'Full-time'
+
+
+def test_entries_with_the_same_dedupe_key_collapse(app):
+    counts, result = upsert(app, [
+        entry('Pricing Actuary', posting_date=date(2026, 1, 1)),
+        entry('  PRICING   actuary ', company='ACME', location='london, uk', posting_date=date(2026, 1, 3)),
+    ])
+    # One posting; the later entry wins
+    assert counts == {'inserted': 1, 'updated': 0, 'skipped': 0}
+    assert list(stored(app).values()) == [(date(2026, 1, 3), None, None)]
+
+    counts, _ = upsert(app, [entry('pricing actuary', posting_date=date(2026, 1, 5))])
+    assert counts == {'inserted': 0, 'updated': 1, 'skipped': 0}
+    assert len(stored(app)) == 1
+
+
+def test_a_source_url_stays_with_one_posting(app):
+    url = 'https://example.com/jobs/1'
+    counts, _ = upsert(app, [entry('Pricing Actuary', url=url), entry('Reserving Analyst', url=url)])
+    assert counts == {'inserted': 2, 'updated': 0, 'skipped': 0}
+    assert stored(app)['Pricing Actuary'][2] == url
+    assert stored(app)['Reserving Analyst'][2] is None
+
+    # A stored owner keeps its URL against later postings
+    counts, _ = upsert(app, [entry('Capital Actuary', url=url), entry('Pricing Actuary', url=url)])
+    assert counts == {'inserted': 1, 'updated': 0, 'skipped': 1}
+    assert stored(app)['Capital Actuary'][2] is None
+    assert stored(app)['Pricing Actuary'][2] == url
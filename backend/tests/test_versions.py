@@ -0,0 +1,94 @@
+from cache import response_cache
+from db import db
+from facets import rebuild_facet_counts
+from metrics import track_queries
+
+
+def test_get_returns_a_version_etag(client, make_job):
+    job = make_job()
+    response = client.get(f"/jobs/{job['id']}")
+    assert response.headers['ETag'] == '"v1"'
+    assert client.get(f"/jobs/{job['id']}", headers={'If-None-Match': '"v1"'}).status_code == 304
+
+
+def test_if_match_guards_updates(client, make_job):
+    job = make_job()
+    url = f"/jobs/{job['id']}"
+
+    updated = client.put(url, json={'title': 'Senior Actuary'}, headers={'If-Match': '"v1"'})
+    assert updated.status_code == 200
+    assert updated.headers['ETag'] == '"v2"'
+    assert updated.get_json()['title'] == 'Senior Actuary'
+
+    # A second writer still holding v1 loses
+    stale = client.put(url, json={'title': 'Chief Actuary'}, headers={'If-Match': '"v1"'})
+    assert stale.status_code == 412
+    assert client.get(url).get_json()['title'] == 'Senior Actuary'
+
+    # Without If-Match the write is unconditional
+    assert client.put(url, json={'title': 'Chief Actuary'}).headers['ETag'] == '"v3"'
+
+
+def test_if_match_guards_deletes(client, make_job):
+    job = make_job()
+    url = f"/jobs/{job['id']}"
+    assert client.delete(url, headers={'If-Match': '"v7"'}).status_code == 412
+    assert client.delete(url, headers={'If-Match': '"v1"'}).status_code == 204
+    assert client.get(url).status_code == 404
+    assert client.delete(url).status_code == 404
+    assert client.put(url, json={'title': 'Gone'}).status_code == 404
+
+
+def test_if_match_accepts_compressed_variant_etags(app, client, make_job):
+    app.config['JOBS_COMPRESS_MIN_SIZE'] = 0
+    url = f"/jobs/{make_job()['id']}"
+    etag = client.get(url, headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    assert etag == '"v1-gzip"'
+    assert client.put(url, json={'title': 'Senior Actuary'}, headers={'If-Match': etag}).status_code == 200
+    assert client.delete(url, headers={'If-Match': etag}).status_code == 412
+
+
+def test_keyed_writes_keep_facet_counts_exact(app, client, make_job):
+    first = make_job(title='First', location='London, UK', tags=['Life'])
+    make_job(title='Second', location='Remote', tags=['Life', 'P&C'])
+
+    client.put(f"/jobs/{first['id']}", json={'location': 'Zurich, Switzerland', 'tags': ['Pensions']})
+    client.put(f"/jobs/{first['id']}", json={'job_type': 'Contract'})
+    client.delete(f"/jobs/{first['id']}")
+    running = client.get('/jobs/facets').get_json()
+
+    with app.app_context():
+        rebuild_facet_counts(db.session.connection())
+        db.session.commit()
+    response_cache.invalidate()
+    assert client.get('/jobs/facets').get_json() == running
+
+
+def test_keyed_writes_keep_partial_updates_deduplicated(client, make_job):
+    job = make_job(title='Pricing Actuary', company='Acme')
+    make_job(title='Pricing Actuary', company='Globex')
+    # Renaming the company onto the other posting's identity is refused like a duplicate create
+    response = client.put(f"/jobs/{job['id']}", json={'company': 'Globex'})
+    assert response.status_code == 400
+
+
+def test_single_job_writes_stay_within_a_statement_budget(client, make_job):
+    job = make_job(tags=['Life'])
+    url = f"/jobs/{job['id']}"
+    with track_queries('PUT /jobs/<id>') as put:
+        assert client.put(url, json={'title': 'Senior Actuary', 'tags': ['Life', 'Pensions']}).status_code == 200
+    with track_queries('DELETE /jobs/<id>') as delete:
+        assert client.delete(url).status_code == 204
+    assert put.count <= 15
+    assert delete.count <= 10
+
+
+def test_updates_validate_dates_like_creates(client, make_job):
+    job = make_job(posting_date='2024-1-5')
+    assert job['posting_date'] == '2024-01-05'
+    url = f"/jobs/{job['id']}"
+
+    updated = client.put(url, json={'posting_date': '2024-1-6'})
+    assert updated.status_code == 200
+    assert updated.get_json()['posting_date'] == '2024-01-06'
+    assert client.put(url, json={'posting_date': '2024-02-30'}).status_code == 400